@@ -1,63 +1,62 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+import sys
+import os
 from pathlib import Path
 
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from wban_opt.results_store import ResultsStore
+from wban_opt.aggregate import summarize_runs, summarize_histories
+from wban_opt.plotting import plot_convergence_bands, plot_energy_boxplot
+
 def main():
-    csv_path = Path("results/csv/runs.csv")
-    if not csv_path.exists():
-        print("No results found. Run scripts/run_experiments.py first.")
+    parser = argparse.ArgumentParser(description="WBAN placement plots")
+    parser.add_argument("--store", default="results/runs.sqlite",
+                        help="magazyn wyników (ten sam co --store w run_experiments.py)")
+    args = parser.parse_args()
+
+    store_path = Path(args.store)
+    if not store_path.exists():
+        print(f"No results found in {store_path}. Run scripts/run_experiments.py first.")
+        return
+
+    # Czyta także częściowe wyniki (przerwany przebieg); agregacja porcjami, bez wczytywania wszystkich rekordów
+    with ResultsStore(store_path) as store:
+        summaries = summarize_runs(store)
+        convergence = summarize_histories(store)
+    if not summaries:
+        print("Results store is empty.")
         return
-        
-    df = pd.read_csv(csv_path)
     plots_dir = Path("results/plots")
     plots_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Przykładowy wykres: Boxplot energii (tylko dla rozwiązań feasible)
-    # Filtrujemy tylko te, gdzie P=0 (lub bardzo małe)
-    df_ok = df[ (df['ga_feas'] == True) & (df['pso_feas'] == True) ]
-    
-    if df_ok.empty:
+
+    # Boxplot energii rozwiązań feasible per scenariusz (pierwszy wariant GW), bez baseline
+    first_gw = sorted(summaries)[0][1]
+    scenarios = sorted({s for s, gw, _ in summaries if gw == first_gw})
+    algos = list(dict.fromkeys(a for _, gw, a in sorted(summaries) if gw == first_gw and a != "base"))
+    stats = {}
+    for algo in algos:
+        boxes = []
+        for scenario in scenarios:
+            summary = summaries.get((scenario, first_gw, algo))
+            boxes.append(summary.energy.box_stats(scenario) if summary and summary.energy.n else None)
+        if any(b is not None for b in boxes):
+            stats[algo] = boxes
+
+    if not stats:
         print("No feasible solutions to plot energy comparison.")
     else:
-        # Pivot do boxplota
-        # Chcemy porównać GA vs PSO per scenariusz
-        # Uproszczenie: bierzemy pierwszy wariant GW
-        first_gw = df_ok['gw'].unique()[0]
-        sub = df_ok[df_ok['gw'] == first_gw]
-        
-        scenarios = sub['scenario'].unique()
-        data_ga = []
-        data_pso = []
-        labels = []
-        
-        for s in scenarios:
-            d_s = sub[sub['scenario'] == s]
-            data_ga.append(d_s['ga_E'].values)
-            data_pso.append(d_s['pso_E'].values)
-            labels.append(s)
-            
-        # Rysowanie
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Przesunięcia
-        pos_ga = [x - 0.2 for x in range(len(labels))]
-        pos_pso = [x + 0.2 for x in range(len(labels))]
-        
-        bp1 = ax.boxplot(data_ga, positions=pos_ga, widths=0.3, patch_artist=True)
-        bp2 = ax.boxplot(data_pso, positions=pos_pso, widths=0.3, patch_artist=True)
-        
-        # Kolory
-        for patch in bp1['boxes']: patch.set_facecolor('lightblue')
-        for patch in bp2['boxes']: patch.set_facecolor('lightgreen')
-            
-        ax.set_xticks(range(len(labels)))
-        ax.set_xticklabels(labels)
-        ax.set_title(f"Energy Comparison (GW={first_gw})")
-        ax.set_ylabel("Energy [J]")
-        ax.legend([bp1["boxes"][0], bp2["boxes"][0]], ['GA', 'PSO'])
-        
         out_file = plots_dir / "energy_boxplot.png"
-        plt.savefig(out_file)
+        plot_energy_boxplot(stats, scenarios, f"Energy Comparison (GW={first_gw})", out_file)
+        print(f"Plot saved: {out_file}")
+
+    # Krzywe zbieżności per scenariusz i wariant GW (mediana P² i pasmo min-max po runach)
+    curves = {}
+    for (scenario, gw, algo), c in convergence.items():
+        curves.setdefault((scenario, gw), {})[algo] = (c.median.value(), c.lo, c.hi)
+    for (scenario, gw), bands in sorted(curves.items()):
+        out_file = plots_dir / f"convergence_{scenario}_{gw}.png"
+        plot_convergence_bands(bands, f"Convergence ({scenario}, GW={gw})", out_file)
         print(f"Plot saved: {out_file}")
 
 if __name__ == "__main__":
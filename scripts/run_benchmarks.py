@@ -0,0 +1,82 @@
+import sys
+import os
+import json
+import argparse
+import time
+
+# Dodaj src do ścieżki (dla pewności)
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from wban_opt.config import load_scenarios, make_energy_params
+from wban_opt.bench import run_suite, write_report, compare_reports, DEFAULT_POOL_SIZES
+from wban_opt.scaling import scaling_scenarios, run_scaling, scaling_exponents, SCALING_METRICS, DEFAULT_M
+
+def run_scaling_sweep(args, common: dict):
+    """Siatka log M x N x K na syntetycznej mapie ciała, stały budżet ewaluacji, wykładniki log-log."""
+    body = common['body_map']
+    M_values = [M for M in DEFAULT_M if not args.quick or M <= 400]
+    records = run_scaling(
+        make_energy_params(common['energy']), scaling_scenarios(M_values),
+        width_m=float(body['width_m']), height_m=float(body['height_m']),
+        max_evals=args.max_evals, pop_size=int(common['optimization']['pop_size']),
+    )
+    exponents = {metric: scaling_exponents(records, metric) for metric in SCALING_METRICS}
+
+    out = args.out or f"results/bench/scaling_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    path = write_report(records, out, max_evals=args.max_evals, exponents=exponents)
+    print(f"Scaling report saved to {path}")
+    print("\n=== Scaling exponents (metric ~ M^a N^b K^c) ===")
+    for metric, per_algo in exponents.items():
+        for algo, e in per_algo.items():
+            print(f"  {metric:<15} {algo:<5} M^{e['M']:+.2f} N^{e['N']:+.2f} K^{e['K']:+.2f}  "
+                  f"R2={e['r2']:.2f} (n={e['n']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="WBAN objective / optimizer benchmarks")
+    parser.add_argument("--out", default=None, help="plik JSON z wynikami (domyślnie results/bench/bench_<czas>.json)")
+    parser.add_argument("--quick", action="store_true", help="tylko małe pule (M <= 200)")
+    parser.add_argument("--no-solvers", action="store_true", help="pomiń pełne przebiegi solve_ga / solve_pso")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--compare", default=None, help="poprzedni raport JSON do wykrywania regresji")
+    parser.add_argument("--scaling", action="store_true",
+                        help="krzywe skalowania: siatka log M x N x K, stały budżet ewaluacji (--max-evals)")
+    parser.add_argument("--max-evals", type=int, default=3000)
+    args = parser.parse_args()
+
+    config = load_scenarios("data/scenarios.yaml")
+    common = config['common']
+    if args.scaling:
+        run_scaling_sweep(args, common)
+        return
+    body = common['body_map']
+    pool_sizes = [M for M in DEFAULT_POOL_SIZES if not args.quick or M <= 200]
+
+    records = run_suite(
+        make_energy_params(common['energy']),
+        pool_sizes=pool_sizes,
+        width_m=float(body['width_m']), height_m=float(body['height_m']),
+        epochs=args.epochs,
+        pop_size=int(common['optimization']['pop_size']),
+        solvers=not args.no_solvers,
+    )
+
+    out = args.out or f"results/bench/bench_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    path = write_report(records, out)
+    print(f"Benchmark report saved to {path}")
+
+    for rec in records:
+        print(f"  {rec['case']:<28} M={rec['M']:<6} N={rec['N']:<4} K={rec['K']:<3} "
+              f"{rec['evals_per_sec']:>12.0f} evals/s  peak={rec['peak_mem_bytes'] / 1e6:.1f} MB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        with open(path) as f:
+            new = json.load(f)
+        regressions = compare_reports(old, new)
+        print("\n=== Regressions ===" if regressions else "\nNo regressions.")
+        for line in regressions:
+            print("  " + line)
+
+if __name__ == "__main__":
+    main()
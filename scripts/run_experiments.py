@@ -1,154 +1,234 @@
 import sys
 import os
+import argparse
 import numpy as np
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
 
 # Dodaj src do ścieżki (dla pewności)
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 
-from wban_opt.config import load_points, load_gw_positions, load_scenarios
-from wban_opt.geometry import points_to_numpy
-from wban_opt.energy_model import EnergyParams
+from wban_opt.config import load_gw_positions, load_scenarios, make_energy_params, gw_array
+from wban_opt.geometry import grid_pool
+from wban_opt.point_pool import PointPool, load_point_pool, cache_dir_for
 from wban_opt.objective import ObjectiveContext, energy_and_penalty_from_x
-from wban_opt.mealpy_runner import solve_ga, solve_pso
-from wban_opt.metrics import feasible_rate
+from wban_opt.algorithms import algorithm_specs, supports_objective, supports_warm_start, run_algorithm
+from wban_opt.warm_start import initial_population, scenario_waves
+from wban_opt.lifetime import simulate_lifetime_from_x
+from wban_opt.profiling import profile_stages
+from wban_opt.aggregate import summarize_runs, summary_frame
+from wban_opt.results_store import ResultsStore, KEY_COLUMNS, to_wide
 
 # ---- HELPER: Generowanie dummy danych jeśli brak ----
 def ensure_data_exists():
     data_dir = Path("data")
     data_dir.mkdir(exist_ok=True)
-    
+
     points_path = data_dir / "points_body.csv"
     if not points_path.exists():
         print("WARNING: 'points_body.csv' not found. Generating dummy grid...")
+        # Siatka 5x10 na obszarze 0.6x1.8
+        grid = grid_pool(50, 0.6, 1.8)
         with open(points_path, 'w') as f:
             f.write("id,name,x,y,region\n")
-            cnt = 0
-            # Siatka 5x10 na obszarze 0.6x1.8
-            for ix in range(5):
-                for iy in range(10):
-                    x = ix * (0.6/4)
-                    y = iy * (1.8/9)
-                    f.write(f"{cnt},P_{cnt},{x:.2f},{y:.2f},torso\n")
-                    cnt += 1
-        print(f"Generated {cnt} dummy points.")
+            for cnt, (x, y) in enumerate(grid):
+                f.write(f"{cnt},P_{cnt},{x:.2f},{y:.2f},torso\n")
+        print(f"Generated {len(grid)} dummy points.")
 
-def main():
-    ensure_data_exists()
-    
-    # 1. Setup
-    print("Loading configuration...")
-    points = load_points("data/points_body.csv")
-    points_pool_np = points_to_numpy(points)
-    gw_positions = load_gw_positions("data/gw_positions.json")
-    config = load_scenarios("data/scenarios.yaml")
-    
+def build_jobs(config: dict, n_points: int) -> list[dict]:
+    """
+    Rozwija siatkę scenariusz x wariant GW x run x algorytm na niezależne zadania.
+    Każde zadanie niesie własny seed, więc wynik nie zależy od procesu ani kolejności wykonania.
+    """
     common = config['common']
-    ep_cfg = common['energy']
-    energy_params = EnergyParams(
-        E_elec=float(ep_cfg['E_elec']),
-        E_fs=float(ep_cfg['E_fs']),
-        E_mp=float(ep_cfg['E_mp']),
-        E_agg=float(ep_cfg['E_agg']),
-        packet_bits=int(ep_cfg['packet_bits']),
-        beta_agg=float(ep_cfg['beta_agg'])
-    )
-    
-    # 2. Results container
-    results = []
-    
-    # 3. Main Loop
+    n_runs = common['optimization']['n_runs']
+    base_seed = common['optimization']['seed0']
+    # Algorytmy z rejestru (common.algorithms); np. LS liczy delty sumy energii -> tylko dla "energy"
+    objective = common['optimization'].get('objective', 'energy')
+    algorithms = [name for name, spec in algorithm_specs(common).items() if supports_objective(spec, objective)]
+
+    jobs = []
     for scen in config['scenarios']:
         s_name = scen['name']
         N = scen['N']
         K = scen['K']
         M_limit = scen['M']
         D = N + K
-        
+
         # Filtruj punkty (pierwsze M)
-        if M_limit > len(points_pool_np):
-            raise ValueError(f"Scenario {s_name} requires {M_limit} points, but only {len(points_pool_np)} available.")
-        
-        current_points_pool = points_pool_np[:M_limit]
-        
+        if M_limit > n_points:
+            raise ValueError(f"Scenario {s_name} requires {M_limit} points, but only {n_points} available.")
+
         if D > M_limit:
             print(f"SKIPPING {s_name}: D={D} > M={M_limit} (Impossible unique placement)")
             continue
-            
-        print(f"--- Running Scenario: {s_name} (N={N}, K={K}, M={M_limit}) ---")
-        
+
         for gw_name in scen['gw_variants']:
-            gw_xy = np.array([gw_positions[gw_name]])
-            
-            # Context
-            ctx = ObjectiveContext(
-                points_pool=current_points_pool,
-                N=N, K=K, gw_xy=gw_xy,
-                energy_params=energy_params,
-                d_max_sn_ch=float(common['constraints']['d_max_sn_ch']),
-                penalty_weight=float(common['constraints']['penalty_range'])
-            )
-            
-            n_runs = common['optimization']['n_runs']
-            base_seed = common['optimization']['seed0']
-            
             for r in range(n_runs):
-                current_seed = base_seed + r
-                
-                # --- BASELINE (Random) ---
-                np.random.seed(current_seed)
-                x_rnd = np.random.rand(D)
-                e_base, p_base, f_base = energy_and_penalty_from_x(x_rnd, ctx)
-                
-                # --- GA ---
-                # Uwaga: w Mealpy seed wpływa na inicjalizację
-                sol_ga, fit_ga_mealpy = solve_ga(
-                    ctx, 
-                    epochs=common['optimization']['epochs'], 
-                    pop_size=common['optimization']['pop_size'],
-                    seed=current_seed
-                )
-                e_ga, p_ga, f_ga_bool = energy_and_penalty_from_x(sol_ga, ctx)
-                
-                # --- PSO ---
-                sol_pso, fit_pso_mealpy = solve_pso(
-                    ctx, 
-                    epochs=common['optimization']['epochs'], 
-                    pop_size=common['optimization']['pop_size'],
-                    seed=current_seed
-                )
-                e_pso, p_pso, f_pso_bool = energy_and_penalty_from_x(sol_pso, ctx)
-                
-                # Record
-                row = {
-                    "scenario": s_name,
-                    "gw": gw_name,
-                    "run": r,
-                    "seed": current_seed,
-                    "N": N, "K": K, "M": M_limit,
-                    
-                    "base_E": e_base, "base_P": p_base, "base_feas": f_base,
-                    
-                    "ga_E": e_ga, "ga_P": p_ga, "ga_feas": f_ga_bool,
-                    "ga_fitness_mealpy": fit_ga_mealpy,
-                    
-                    "pso_E": e_pso, "pso_P": p_pso, "pso_feas": f_pso_bool,
-                    "pso_fitness_mealpy": fit_pso_mealpy
-                }
-                results.append(row)
-                
-                print(f"   Run {r}: GA_E={e_ga:.4f} (OK={f_ga_bool}), PSO_E={e_pso:.4f} (OK={f_pso_bool})")
-
-    # 4. Save
+                for algo in algorithms:
+                    jobs.append({
+                        "scenario": s_name, "gw": gw_name, "run": r,
+                        "seed": base_seed + r, "algorithm": algo,
+                        "N": N, "K": K, "M": M_limit,
+                    })
+    return jobs
+
+# ---- Stan procesu roboczego (ustawiany raz na proces, nie kopiowany per zadanie) ----
+_WORKER = {}
+
+def _init_worker(pool, gw_positions: dict, common: dict):
+    # Ścieżka cache puli -> mapowanie pliku (procesy współdzielą strony, bez kopii per worker)
+    if isinstance(pool, (str, Path)):
+        pool = PointPool.open(pool, mmap=True)
+    _WORKER["points_pool"] = pool.xy
+    _WORKER["point_region"] = pool.region
+    _WORKER["gw_positions"] = gw_positions
+    _WORKER["common"] = common
+    _WORKER["energy_params"] = make_energy_params(common['energy'])
+    _WORKER["algorithms"] = algorithm_specs(common)
+    _WORKER["contexts"] = {}
+
+def _get_context(job: dict) -> ObjectiveContext:
+    key = (job["M"], job["N"], job["K"], job["gw"])
+    ctx = _WORKER["contexts"].get(key)
+    if ctx is None:
+        common = _WORKER["common"]
+        ctx = ObjectiveContext(
+            points_pool=_WORKER["points_pool"][:job["M"]],
+            N=job["N"], K=job["K"], gw_xy=gw_array(_WORKER["gw_positions"], job["gw"]),
+            energy_params=_WORKER["energy_params"],
+            d_max_sn_ch=float(common['constraints']['d_max_sn_ch']),
+            penalty_weight=float(common['constraints']['penalty_range']),
+            routing=common.get('routing', 'direct'),
+            objective=common['optimization'].get('objective', 'energy'),
+            feasibility=bool(common['optimization'].get('feasibility', False)),
+            backend=common['optimization'].get('backend', 'auto'),
+            point_region=_WORKER["point_region"][:job["M"]]
+        )
+        _WORKER["contexts"][key] = ctx
+    return ctx
+
+def run_job(job: dict) -> dict:
+    """Wykonuje jedno zadanie siatki i zwraca rekord wyniku."""
+    job = dict(job)
+    warm = job.pop("_warm", None)
+    ctx = _get_context(job)
+    opt = _WORKER["common"]['optimization']
+    spec = _WORKER["algorithms"][job["algorithm"]]
+    current_seed = job["seed"]
+    extra = {}
+
+    # Warm start: część populacji startowej z elit pokrewnych scenariuszy (indeksy wspólnej puli)
+    init = None
+    if warm:
+        fraction = float((opt.get('warm_start') or {}).get('fraction', 0.5))
+        n_max = int(fraction * int(spec.get('pop_size', opt['pop_size'])))
+        init = initial_population(warm, job["N"], job["K"], job["M"], n_max, np.random.default_rng(current_seed))
+        extra["warm_start"] = len(init)
+
+    # Profilowanie etapów tylko na życzenie (bez niego hooki w funkcji celu nic nie kosztują)
+    profiler = profile_stages() if opt.get('profile', False) else nullcontext()
+    with profiler as prof:
+        x, fitness_mealpy = run_algorithm(spec, ctx, opt, current_seed, extra, init)
+    if prof is not None:
+        extra.update(prof.summary())
+
+    # Ocena końcowa z repair zasianym seedem zadania
+    E, P, feas = energy_and_penalty_from_x(x, ctx, rng=np.random.default_rng(current_seed))
+
+    # Czas życia końcowego rozmieszczenia (symulacja rundowa z E_init)
+    lt_cfg = _WORKER["common"].get('lifetime')
+    if lt_cfg:
+        lt = simulate_lifetime_from_x(x, ctx, rng=np.random.default_rng(current_seed),
+                                      max_rounds=int(lt_cfg.get('max_rounds', 100_000)),
+                                      rotation=bool(lt_cfg.get('rotation', False)),
+                                      rotate_every=int(lt_cfg.get('rotate_every', 100)))
+        extra.update({"fnd": int(lt.fnd[0]), "hnd": int(lt.hnd[0]), "lifetime_censored": bool(lt.censored[0])})
+    return {**job, "E": E, "P": P, "feas": feas, "fitness_mealpy": fitness_mealpy, **extra}
+
+def main():
+    parser = argparse.ArgumentParser(description="WBAN placement experiments")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="liczba procesów roboczych (1 = wykonanie szeregowe)")
+    parser.add_argument("--profile", action="store_true",
+                        help="czasy etapów funkcji celu (prof_*) zapisywane w rekordach wyników")
+    parser.add_argument("--store", default="results/runs.sqlite",
+                        help="magazyn wyników; zadania już w nim zapisane są pomijane")
+    args = parser.parse_args()
+
+    ensure_data_exists()
+
+    # 1. Setup
+    print("Loading configuration...")
+    points_csv = "data/points_body.csv"
+    # Cache .npy obok CSV (przebudowywany po zmianie pliku), mapowany zamiast parsowania przy każdym starcie
+    pool = load_point_pool(points_csv)
+    gw_positions = load_gw_positions("data/gw_positions.json")
+    config = load_scenarios("data/scenarios.yaml")
+    common = config['common']
+    if args.profile:
+        common['optimization']['profile'] = True
+
+    store = ResultsStore(args.store)
+    done = store.completed_keys()
+    all_jobs = build_jobs(config, len(pool))
+    jobs = [job for job in all_jobs if tuple(job[k] for k in KEY_COLUMNS) not in done]
+    if len(jobs) < len(all_jobs):
+        print(f"Resuming: {len(all_jobs) - len(jobs)} of {len(all_jobs)} jobs already in {args.store}")
+
+    n_workers = max(1, min(args.workers, len(jobs)))
+    print(f"--- Running {len(jobs)} jobs on {n_workers} worker(s) ---")
+
+    # Scenariusze z warm_start_from startują po swoich źródłach (fale), z ich elit zapisanych w magazynie
+    specs = algorithm_specs(common)
+    sources = {s['name']: s.get('warm_start_from') or [] for s in config['scenarios']}
+    warm_enabled = bool((common['optimization'].get('warm_start') or {}).get('enabled', False))
+    waves = [[job for job in jobs if job["scenario"] in wave] for wave in scenario_waves(config['scenarios'])]
+
+    def with_warm(job: dict) -> dict:
+        if not (warm_enabled and sources[job["scenario"]] and supports_warm_start(specs[job["algorithm"]])):
+            return job
+        # Elity tego samego algorytmu - porównanie między algorytmami pozostaje rozdzielne
+        return {**job, "_warm": store.read_elites(sources[job["scenario"]], job["run"], job["algorithm"])}
+
+    # 2. Results collector: każdy rekord trafia do magazynu od razu po ukończeniu
+    def on_result(rec: dict):
+        # Archiwum przed rekordem runs: wznowienie pomija tylko zadania zapisane w całości
+        pareto = rec.pop("_pareto", None)
+        if pareto is not None:
+            store.append_pareto(rec, **pareto)
+        store.append(rec)
+        print(f"   {rec['scenario']}/{rec['gw']} run {rec['run']} {rec['algorithm'].upper()}: "
+              f"E={rec['E']:.4f} (OK={rec['feas']})")
+
+    # 3. Main Loop
+    if n_workers == 1:
+        _init_worker(pool, gw_positions, common)
+        for wave in waves:
+            for job in wave:
+                on_result(run_job(with_warm(job)))
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(str(cache_dir_for(points_csv)), gw_positions, common)) as executor:
+            for wave in waves:
+                futures = [executor.submit(run_job, with_warm(job)) for job in wave]
+                for fut in as_completed(futures):
+                    on_result(fut.result())
+
+    # 4. Export (migawka runs.csv z magazynu, w dawnym formacie szerokim)
     out_dir = Path("results/csv")
     out_dir.mkdir(parents=True, exist_ok=True)
-    df = pd.DataFrame(results)
+    df = to_wide(store.read_df(blobs=False))
     df.to_csv(out_dir / "runs.csv", index=False)
-    
-    print("\n=== Summary ===")
-    print(df.groupby(['scenario', 'gw'])[['ga_feas', 'pso_feas']].mean())
-    print(f"Results saved to {out_dir / 'runs.csv'}")
+    # Podsumowanie per (scenario, gw, algorithm) liczone porcjami (średnia, kwartyle P², feasible rate)
+    summary = summary_frame(summarize_runs(store))
+    store.close()
+    summary.to_csv(out_dir / "summary.csv", index=False)
+
+    print("\n=== Summary (feasible rate) ===")
+    print(summary.set_index(["scenario", "gw", "algorithm"])["feasible_rate"].unstack("algorithm"))
+    print(f"Results stored in {args.store}, exported to {out_dir / 'runs.csv'} and {out_dir / 'summary.csv'}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
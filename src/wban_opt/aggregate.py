@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from .metrics import feasible_rate
+
+# Kwartyle śledzone szkicem (pudełko wykresu: Q1, mediana, Q3)
+QUANTILES = (0.25, 0.5, 0.75)
+
+class P2Quantile:
+    """
+    Szkic P² (Jain, Chlamtac 1985): kwantyl strumienia bez przechowywania próby, 5 markerów na strumień.
+    p i wartości są rozgłaszane na kształt strumieni - np. kilka kwantyli tej samej serii
+    albo jeden kwantyl per epoka historii. Do 5 obserwacji wynik jest dokładny (jak np.quantile).
+    """
+
+    def __init__(self, p, shape: tuple = ()):
+        p = np.asarray(p, dtype=float)
+        self.shape = np.broadcast_shapes(p.shape, shape)
+        self.p = np.broadcast_to(p, self.shape).copy()
+        self.count = 0
+        self.q = np.zeros(self.shape + (5,))
+        self.n = np.broadcast_to(np.arange(1.0, 6.0), self.shape + (5,)).copy()
+        pp = self.p[..., None]
+        self.want = 1.0 + np.concatenate([0 * pp, 2 * pp, 4 * pp, 2 + 2 * pp, 4 + 0 * pp], axis=-1)
+        self.step = np.concatenate([0 * pp, pp / 2, pp, (1 + pp) / 2, 1 + 0 * pp], axis=-1)
+
+    def update(self, x):
+        x = np.broadcast_to(np.asarray(x, dtype=float), self.shape)
+        q, n = self.q, self.n
+        if self.count < 5:
+            q[..., self.count] = x
+            self.count += 1
+            if self.count == 5:
+                q.sort(axis=-1)
+            return
+        self.count += 1
+
+        # Komórka k (0..3) między markerami; skrajne markery to min / max
+        k = np.sum(q[..., 1:4] <= x[..., None], axis=-1)
+        q[..., 0] = np.minimum(q[..., 0], x)
+        q[..., 4] = np.maximum(q[..., 4], x)
+        n += np.arange(5) > k[..., None]
+        self.want += self.step
+
+        for i in (1, 2, 3):
+            d = self.want[..., i] - n[..., i]
+            move = (((d >= 1) & (n[..., i + 1] - n[..., i] > 1))
+                    | ((d <= -1) & (n[..., i - 1] - n[..., i] < -1)))
+            if not move.any():
+                continue
+            s = np.where(move, np.sign(d), 0.0)
+            qm, qi, qp = q[..., i - 1], q[..., i], q[..., i + 1]
+            nm, ni, np_ = n[..., i - 1], n[..., i], n[..., i + 1]
+            # Interpolacja paraboliczna, a gdy wychodzi poza sąsiednie markery - liniowa
+            par = qi + s / (np_ - nm) * ((ni - nm + s) * (qp - qi) / (np_ - ni) + (np_ - ni - s) * (qi - qm) / (ni - nm))
+            lin = qi + s * (np.where(s > 0, qp, qm) - qi) / np.where(s > 0, np_ - ni, nm - ni)
+            q[..., i] = np.where(move, np.where((qm < par) & (par < qp), par, lin), qi)
+            n[..., i] += s
+
+    def value(self) -> np.ndarray:
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        if self.count >= 5:
+            return self.q[..., 2].copy()
+        # Mało obserwacji -> kwantyl dokładny z interpolacją liniową
+        v = np.sort(self.q[..., :self.count], axis=-1)
+        pos = self.p * (self.count - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, self.count - 1)
+        v_lo = np.take_along_axis(v, lo[..., None], axis=-1)[..., 0]
+        v_hi = np.take_along_axis(v, hi[..., None], axis=-1)[..., 0]
+        return v_lo + (pos - lo) * (v_hi - v_lo)
+
+class RunningStats:
+    """Liczność, średnia i wariancja (Welford / Chan), min, max i kwartyle (P²) strumienia wartości."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = P2Quantile(QUANTILES)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+        n_b, mean_b = values.size, values.mean()
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self._m2 += np.sum((values - mean_b) ** 2) + delta ** 2 * self.n * n_b / n
+        self.mean += delta * n_b / n
+        self.n = n
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        for v in values:
+            self.sketch.update(v)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self._m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def quantiles(self) -> np.ndarray:
+        return self.sketch.value()
+
+    def box_stats(self, label: str = "") -> dict:
+        """Statystyki pudełka dla Axes.bxp (wąsy: min-max)."""
+        q1, med, q3 = self.quantiles()
+        return {"label": label, "mean": self.mean, "med": med, "q1": q1, "q3": q3,
+                "whislo": self.min, "whishi": self.max, "fliers": []}
+
+@dataclass
+class GroupSummary:
+    """Podsumowanie rekordów jednej grupy (scenario, gw, algorithm); statystyki E tylko z rozwiązań feasible."""
+    n_runs: int = 0
+    n_feasible: float = 0.0
+    energy: RunningStats = field(default_factory=RunningStats)
+
+    @property
+    def feasible_rate(self) -> float:
+        return self.n_feasible / self.n_runs if self.n_runs else 0.0
+
+def summarize_runs(store, by: tuple = ("scenario", "gw", "algorithm"),
+                   chunksize: int = 10_000) -> dict[tuple, GroupSummary]:
+    """Agregacja magazynu porcjami: pamięć zależy od liczby grup, nie od liczby rekordów."""
+    summaries = {}
+    for chunk in store.iter_df([*by, "E", "feas"], chunksize):
+        for key, g in chunk.groupby(list(by), sort=False):
+            s = summaries.setdefault(key, GroupSummary())
+            s.n_runs += len(g)
+            s.n_feasible += feasible_rate(g["feas"]) * len(g)
+            s.energy.update(g.loc[g["feas"], "E"].to_numpy())
+    return summaries
+
+def summary_frame(summaries: dict[tuple, GroupSummary],
+                  by: tuple = ("scenario", "gw", "algorithm")) -> pd.DataFrame:
+    """Tabela podsumowań: jeden wiersz na grupę (E_* z rozwiązań feasible)."""
+    rows = []
+    for key, s in sorted(summaries.items()):
+        q1, med, q3 = s.energy.quantiles()
+        rows.append({**dict(zip(by, key)), "n_runs": s.n_runs, "feasible_rate": s.feasible_rate,
+                     "E_mean": s.energy.mean if s.energy.n else np.nan, "E_std": s.energy.std,
+                     "E_min": s.energy.min if s.energy.n else np.nan, "E_q25": q1, "E_median": med,
+                     "E_q75": q3, "E_max": s.energy.max if s.energy.n else np.nan})
+    return pd.DataFrame(rows, columns=[*by, "n_runs", "feasible_rate", "E_mean", "E_std", "E_min",
+                                       "E_q25", "E_median", "E_q75", "E_max"])
+
+@dataclass
+class ConvergenceSummary:
+    """Statystyki best fitness per epoka po runach: mediana (P²), min, max."""
+    median: P2Quantile
+    lo: np.ndarray
+    hi: np.ndarray
+    n_runs: int = 0
+
+    def update(self, history: np.ndarray):
+        # Przebieg zatrzymany wcześniej -> przedłużenie ostatnią wartością (best się już nie zmienia)
+        h = np.pad(history, (0, len(self.lo) - len(history)), mode='edge')
+        self.median.update(h)
+        np.minimum(self.lo, h, out=self.lo)
+        np.maximum(self.hi, h, out=self.hi)
+        self.n_runs += 1
+
+def summarize_histories(store) -> dict[tuple, ConvergenceSummary]:
+    """Krzywe zbieżności per (scenario, gw, algorithm), historie czytane po jednej."""
+    lengths = store.history_lengths()
+    summaries = {}
+    for (scenario, gw, _, algo), h in store.iter_histories():
+        if not len(h):
+            continue
+        n = lengths[(scenario, gw, algo)]
+        s = summaries.get((scenario, gw, algo))
+        if s is None:
+            s = summaries[(scenario, gw, algo)] = ConvergenceSummary(
+                P2Quantile(0.5, (n,)), np.full(n, np.inf), np.full(n, -np.inf))
+        s.update(h)
+    return summaries
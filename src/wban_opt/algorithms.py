@@ -0,0 +1,135 @@
+import numpy as np
+from .objective import ObjectiveContext
+from .mealpy_runner import solve_mealpy
+from .local_search import solve_ls, indices_to_x
+from .nsga2 import solve_nsga2
+from .portfolio import solve_portfolio
+from .islands import solve_islands, ISLAND_KEYS
+from .cache import FitnessCache
+
+# Rejestr solverów: nazwa -> funkcja(ctx, spec, opt, seed, extra, init) -> (x, fitness)
+# spec: wpis z common.algorithms, opt: common.optimization, extra: dodatkowe pola rekordu,
+# init: opcjonalna populacja startowa (P0, D) w [0, 1] (warm start)
+SOLVERS = {}
+# Solvery działające tylko dla funkcji celu "energy" (pomijane w siatce przy innych)
+ENERGY_ONLY = set()
+# Solvery korzystające z init (pozostałe go ignorują, więc nie warto go dla nich budować)
+WARM_START = set()
+
+# Zestaw używany, gdy scenarios.yaml nie ma common.algorithms (dawna lista ALGORITHMS)
+DEFAULT_ALGORITHMS = [
+    {"name": "base"},
+    {"name": "ga", "optimizer": "GA.BaseGA"},
+    {"name": "pso", "optimizer": "PSO.OriginalPSO"},
+    {"name": "ls"},
+    {"name": "nsga2"},
+]
+
+def register(name: str, energy_only: bool = False, warm_start: bool = False):
+    def wrap(fn):
+        SOLVERS[name] = fn
+        if energy_only:
+            ENERGY_ONLY.add(name)
+        if warm_start:
+            WARM_START.add(name)
+        return fn
+    return wrap
+
+def algorithm_specs(common: dict) -> dict[str, dict]:
+    """
+    Wpisy common.algorithms -> {nazwa: spec}. Wpis z kluczem optimizer to solver "mealpy",
+    pozostałe wskazują solver natywny polem solver (domyślnie = name).
+    """
+    specs = {}
+    for entry in common.get('algorithms') or DEFAULT_ALGORITHMS:
+        spec = dict(entry)
+        if "optimizer" in spec:
+            spec.setdefault("name", spec["optimizer"].split(".")[-1].lower())
+            spec.setdefault("solver", "mealpy")
+        else:
+            spec.setdefault("name", spec.get("solver"))
+            spec.setdefault("solver", spec["name"])
+        if spec["solver"] not in SOLVERS:
+            raise ValueError(f"Nieznany solver {spec['solver']!r} (dostępne: {sorted(SOLVERS)})")
+        if spec["name"] in specs:
+            raise ValueError(f"Powtórzona nazwa algorytmu: {spec['name']!r}")
+        specs[spec["name"]] = spec
+    return specs
+
+def supports_objective(spec: dict, objective: str) -> bool:
+    return objective == "energy" or spec["solver"] not in ENERGY_ONLY
+
+def supports_warm_start(spec: dict) -> bool:
+    return spec["solver"] in WARM_START
+
+def run_algorithm(spec: dict, ctx: ObjectiveContext, opt: dict, seed: int, extra: dict, init: np.ndarray = None):
+    """Uruchamia algorytm wg spec; zwraca (x, fitness_mealpy), dodatkowe pola dopisuje do extra."""
+    return SOLVERS[spec["solver"]](ctx, spec, opt, seed, extra, init)
+
+def _budget(spec: dict, opt: dict) -> tuple[int, int]:
+    """(epochs, pop_size): z wpisu algorytmu, a domyślnie z common.optimization."""
+    return int(spec.get("epochs", opt['epochs'])), int(spec.get("pop_size", opt['pop_size']))
+
+@register("base")
+def _run_base(ctx, spec, opt, seed, extra, init=None):
+    # --- BASELINE (Random) ---
+    np.random.seed(seed)
+    return np.random.rand(ctx.get_D()), np.nan
+
+@register("mealpy", warm_start=True)
+def _run_mealpy(ctx, spec, opt, seed, extra, init=None):
+    # Uwaga: w Mealpy seed wpływa na inicjalizację
+    epochs, pop_size = _budget(spec, opt)
+    # Cache per run (statystyki trafień trafiają do rekordu)
+    cache_size = int(opt.get('cache_size', 0))
+    cache = FitnessCache(cache_size) if cache_size > 0 else None
+    # Wcześniejsze zakończenie (opcjonalne) + historia zbieżności zapisywana jako BLOB
+    info = {}
+    x, fitness = solve_mealpy(ctx, spec["optimizer"], epochs, pop_size, seed=seed, cache=cache,
+                              stop=spec.get("stop", opt.get('stop')), info=info, params=spec.get("params"),
+                              init=init, surrogate=spec.get("surrogate", opt.get('surrogate')))
+    # Ślad surrogate (prawdziwe oceny -> best) tylko do analizy w bench, w rekordzie same liczniki
+    info.pop("surrogate_trace", None)
+    extra.update(info)
+    if cache is not None:
+        extra.update(cache.stats())
+    return x, fitness
+
+@register("ls", energy_only=True)
+def _run_ls(ctx, spec, opt, seed, extra, init=None):
+    # --- Native local search (ten sam budżet ewaluacji co GA/PSO) ---
+    epochs, pop_size = _budget(spec, opt)
+    max_evals = int(spec.get("max_evals", opt.get('ls_max_evals', epochs * pop_size)))
+    extra["max_evals"] = max_evals
+    return solve_ls(ctx, max_evals=max_evals, seed=seed, **spec.get("params", {}))
+
+@register("nsga2")
+def _run_nsga2(ctx, spec, opt, seed, extra, init=None):
+    # --- Wielokryterialny NSGA-II: archiwum Pareto zapisywane osobno, w runs reprezentant ---
+    epochs, pop_size = _budget(spec, opt)
+    archive = solve_nsga2(ctx, epochs=epochs, pop_size=pop_size, seed=seed, **spec.get("params", {}))
+    best = archive.best()  # najmniejsze naruszenie zasięgu, potem najmniejsza suma energii
+    extra["pareto_size"] = len(archive)
+    extra["_pareto"] = {"F": archive.F, "CV": archive.CV,
+                        "sn_idx": archive.items[:, :ctx.N], "ch_idx": archive.items[:, ctx.N:]}
+    x = indices_to_x(archive.items[best], ctx.points_pool.shape[0])
+    return x, archive.F[best, 0] + ctx.penalty_weight * archive.CV[best]
+
+@register("portfolio", warm_start=True)
+def _run_portfolio(ctx, spec, opt, seed, extra, init=None):
+    # --- Kilka optymalizatorów Mealpy na wspólnym budżecie czasu ---
+    epochs, pop_size = _budget(spec, opt)
+    members = {m.get("name", m["optimizer"].split(".")[-1].lower()): m for m in spec["members"]}
+    return solve_portfolio(ctx, members, budget_s=float(spec["budget_s"]), epochs=epochs, pop_size=pop_size,
+                           seed=seed, rounds=int(spec.get("rounds", 4)), info=extra, init=init)
+
+@register("islands", warm_start=True)
+def _run_islands(ctx, spec, opt, seed, extra, init=None):
+    # --- Model wyspowy: populacje Mealpy w osobnych procesach z migracją elit ---
+    epochs, pop_size = _budget(spec, opt)
+    info = {}
+    x, fitness = solve_islands(ctx, spec.get("optimizer", "GA.BaseGA"), epochs, pop_size, seed=seed,
+                               params=spec.get("params"), init=init, info=info,
+                               **{k: spec[k] for k in ISLAND_KEYS if k in spec})
+    extra.update(info)
+    return x, fitness
@@ -1,14 +1,129 @@
 import numpy as np
-from .geometry import pairwise_dist
+from scipy.spatial import cKDTree
+from .geometry import pairwise_dist, PoolIndex
+
+# Od tej liczby CH przypisanie idzie przez KD-tree zamiast gęstej macierzy (N, K)
+KDTREE_MIN_K = 64
+# Liczba kandydatów z drzewa dla assign_sensors_to_ch
+KDTREE_CANDIDATES = 8
+# Względny margines: kandydaci z drzewa są pewni, jeśli najlepszy CH jest wyraźnie bliżej niż k-ty sąsiad
+_TIE_RTOL = 1e-9
+
+def _pick_nearest(exact: np.ndarray, slots: np.ndarray, K: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wybór spośród kandydatów jak argmin po pełnej macierzy: najmniejsza dokładna odległość,
+    przy remisie najniższy slot CH. exact: (n, k) z inf dla nie-CH, slots: (n, k).
+    """
+    best = exact.min(axis=1)
+    slot = np.where(exact == best[:, None], slots, K).min(axis=1)
+    return slot, best
 
 def assign_sensors_to_ch(sn_xy: np.ndarray, ch_xy: np.ndarray) -> np.ndarray:
     """
     Przypisuje każdy sensor do najbliższego CH.
     Zwraca: wektor indeksów (długość N) wskazujący index w ch_xy (0..K-1).
+    Dla K >= KDTREE_MIN_K używa cKDTree (wynik, łącznie z remisami, taki sam jak argmin po cdist).
     """
     if ch_xy.shape[0] == 0:
         raise ValueError("Brak CH do przypisania!")
-    
-    dists = pairwise_dist(sn_xy, ch_xy)  # Shape (N, K)
-    assignment = np.argmin(dists, axis=1)
-    return assignment
\ No newline at end of file
+
+    K = ch_xy.shape[0]
+    if K < KDTREE_MIN_K:
+        dists = pairwise_dist(sn_xy, ch_xy)  # Shape (N, K)
+        assignment = np.argmin(dists, axis=1)
+        return assignment
+
+    k = min(K, KDTREE_CANDIDATES)
+    d_tree, cand = cKDTree(ch_xy).query(sn_xy, k=k)
+    d_tree, cand = d_tree.reshape(-1, k), cand.reshape(-1, k)
+    # Dokładne odległości tym samym wzorem co cdist, żeby remisy rozstrzygały się identycznie
+    exact = np.sqrt(np.sum((sn_xy[:, None, :] - ch_xy[cand]) ** 2, axis=-1))
+    assignment, best = _pick_nearest(exact, cand, K)
+
+    # Wiersze, w których poza kandydatami może być CH o tej samej odległości -> gęsto
+    unsure = np.flatnonzero(best >= d_tree[:, -1] * (1.0 - _TIE_RTOL)) if k < K else np.empty(0, dtype=int)
+    if unsure.size:
+        assignment[unsure] = np.argmin(pairwise_dist(sn_xy[unsure], ch_xy), axis=1)
+    return assignment
+
+def _pool_candidates(sn: np.ndarray, ch: np.ndarray, dist_pool, pool_index: PoolIndex, k: int):
+    """
+    Kandydaci z drzewa nad całą pulą: k najbliższych punktów puli każdego sensora,
+    z których zostają te będące CH w danym wierszu. sn: (R, N), ch: (R, K).
+    """
+    R, N = sn.shape
+    K = ch.shape[1]
+    # Slot CH dla każdego punktu puli (per wiersz), -1 = nie CH
+    slot_of = np.full((R, len(pool_index)), -1, dtype=np.int64)
+    np.put_along_axis(slot_of, ch, np.broadcast_to(np.arange(K), ch.shape), axis=1)
+
+    d_tree, cand = pool_index.query_idx(sn.ravel(), k)
+    slots = slot_of[np.repeat(np.arange(R), N)[:, None], cand]
+    exact = np.where(slots >= 0, dist_pool[sn.ravel()[:, None], cand], np.inf)
+    return exact, slots, d_tree[:, -1]
+
+def _ch_tree_candidates(sn: np.ndarray, ch: np.ndarray, dist_pool, points: np.ndarray, k: int):
+    """Kandydaci z drzewa nad CH danego wiersza (budowane per wiersz, O(K log K))."""
+    exact, slots, d_k = [], [], []
+    for sn_r, ch_r in zip(sn, ch):
+        d, c = cKDTree(points[ch_r]).query(points[sn_r], k=k)
+        d, c = d.reshape(-1, k), c.reshape(-1, k)
+        exact.append(dist_pool[sn_r[:, None], ch_r[c]])
+        slots.append(c)
+        d_k.append(d[:, -1])
+    return np.concatenate(exact), np.concatenate(slots), np.concatenate(d_k)
+
+def _assign_with_pool_index(sn_idx: np.ndarray, ch_idx: np.ndarray, dist_pool,
+                            pool_index: PoolIndex) -> np.ndarray:
+    """
+    Najbliższy CH przez KD-tree. Gdy CH gęsto pokrywają pulę, wystarcza kilka sąsiadów
+    z prebudowanego drzewa puli; w przeciwnym razie drzewo nad CH budowane jest per wiersz.
+    Odległości kandydatów czytane są z dist_pool, więc remisy wychodzą jak przy argmin;
+    wiersze, w których spoza kandydatów mógłby wygrać inny CH, liczone są gęsto.
+    """
+    M = len(pool_index)
+    K = ch_idx.shape[-1]
+    lead, N = sn_idx.shape[:-1], sn_idx.shape[-1]
+    sn = sn_idx.reshape(-1, N)
+    ch = ch_idx.reshape(-1, K)
+
+    # Średnio ~4 CH wśród k sąsiadów w puli (+1: sam sensor jest swoim najbliższym sąsiadem)
+    k_pool = int(np.ceil(4 * M / K)) + 1
+    if k_pool <= 2 * KDTREE_CANDIDATES:
+        k, n_all = min(M, k_pool), M
+        exact, slots, d_k = _pool_candidates(sn, ch, dist_pool, pool_index, k)
+    else:
+        k, n_all = min(K, KDTREE_CANDIDATES), K
+        exact, slots, d_k = _ch_tree_candidates(sn, ch, dist_pool, pool_index.points, k)
+    assignment, best = _pick_nearest(exact, slots, K)
+
+    if k < n_all:
+        unsure = np.flatnonzero(best >= d_k * (1.0 - _TIE_RTOL))
+        if unsure.size:
+            rows = unsure // N
+            dists = dist_pool[sn.ravel()[unsure, None], ch[rows]]
+            assignment[unsure] = np.argmin(dists, axis=1)
+    return assignment.reshape(lead + (N,))
+
+def assign_sensors_to_ch_idx(sn_idx: np.ndarray, ch_idx: np.ndarray, dist_pool,
+                             pool_index: PoolIndex = None) -> np.ndarray:
+    """
+    Jak assign_sensors_to_ch, ale na indeksach puli i prekomputowanej macierzy odległości (M, M).
+    sn_idx: (..., N), ch_idx: (..., K) -> wektor indeksów (..., N) w ch_idx (0..K-1).
+    pool_index: opcjonalny PoolIndex nad całą pulą; przy K >= KDTREE_MIN_K przypisanie idzie
+    przez KD-tree zamiast gęstej macierzy (..., N, K).
+    Remis odległości -> CH o najniższym indeksie puli (nie slocie), więc przypisanie nie zależy
+    od kolejności CH w wierszu (patrz FitnessCache, kluczowany posortowanymi indeksami).
+    """
+    if ch_idx.shape[-1] == 0:
+        raise ValueError("Brak CH do przypisania!")
+
+    # Przypisanie na CH posortowanych po indeksie puli (remis -> najniższy slot), potem powrót do slotów wejścia
+    order = np.argsort(ch_idx, axis=-1)
+    ch_sorted = np.take_along_axis(ch_idx, order, axis=-1)
+    if pool_index is not None and ch_idx.shape[-1] >= KDTREE_MIN_K:
+        assignment = _assign_with_pool_index(sn_idx, ch_sorted, dist_pool, pool_index)
+    else:
+        dists = dist_pool[sn_idx[..., :, None], ch_sorted[..., None, :]]  # Shape (..., N, K)
+        assignment = np.argmin(dists, axis=-1)
+    return np.take_along_axis(order, assignment, axis=-1)
@@ -0,0 +1,264 @@
+import json
+import time
+import platform
+import tracemalloc
+import numpy as np
+from pathlib import Path
+
+from .energy_model import EnergyParams
+from .geometry import grid_pool
+from .objective import ObjectiveContext, energy_and_penalty_from_x, energy_and_penalty_batch
+from .repair import decode_to_indices, repair_unique, repair_unique_batch
+from .assignment import assign_sensors_to_ch, assign_sensors_to_ch_idx
+from .mealpy_runner import solve_ga, solve_pso
+from .warm_start import initial_population
+from .surrogate import evals_to_reach
+
+# Domyślna siatka rozmiarów: od scenariuszy z YAML (M=20) do dużych pul
+DEFAULT_POOL_SIZES = (20, 50, 200, 1000, 10000)
+DEFAULT_NK = ((8, 1), (30, 4), (100, 10), (500, 50), (2000, 200))
+
+def make_bench_context(M: int, N: int, K: int, energy_params: EnergyParams,
+                       width_m: float = 0.6, height_m: float = 1.8,
+                       d_max_sn_ch: float = 0.7, penalty_weight: float = 1e6) -> ObjectiveContext:
+    """Kontekst na syntetycznej siatce (ta sama co w ensure_data_exists), GW w środku mapy."""
+    return ObjectiveContext(
+        points_pool=grid_pool(M, width_m, height_m),
+        N=N, K=K, gw_xy=np.array([[width_m / 2, height_m / 2]]),
+        energy_params=energy_params,
+        d_max_sn_ch=d_max_sn_ch,
+        penalty_weight=penalty_weight
+    )
+
+def time_call(fn, min_time: float = 0.2, max_calls: int = 100_000) -> tuple[float, int]:
+    """Powtarza fn() aż łączny czas przekroczy min_time. Zwraca (czas na wywołanie [s], liczba wywołań)."""
+    fn()  # rozgrzewka
+    n, total = 0, 0.0
+    batch = 1
+    while total < min_time and n < max_calls:
+        t0 = time.perf_counter()
+        for _ in range(batch):
+            fn()
+        total += time.perf_counter() - t0
+        n += batch
+        batch *= 2
+    return total / n, n
+
+def peak_memory(fn) -> int:
+    """Szczytowa alokacja (bajty) podczas jednego wywołania fn(), wg tracemalloc (obejmuje NumPy)."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def _record(name: str, ctx: ObjectiveContext, fn, evals_per_call: int, min_time: float, **extra) -> dict:
+    per_call, n_calls = time_call(fn, min_time)
+    return {
+        "case": name,
+        "M": int(ctx.points_pool.shape[0]), "N": ctx.N, "K": ctx.K,
+        "wall_s_per_call": per_call,
+        "evals_per_sec": evals_per_call / per_call,
+        "peak_mem_bytes": peak_memory(fn),
+        "n_calls": n_calls,
+        **extra,
+    }
+
+def bench_kernels(ctx: ObjectiveContext, pop_size: int = 30, seed: int = 0, min_time: float = 0.2) -> list[dict]:
+    """Funkcja celu (skalarna i wsadowa), repair i przypisanie dla jednego rozmiaru."""
+    rng = np.random.default_rng(seed)
+    M, D = ctx.points_pool.shape[0], ctx.get_D()
+    X = rng.random((pop_size, D))
+    x = X[0]
+    raw = decode_to_indices(X, M)
+    idx = rng.permutation(M)[:D]
+    sn_idx, ch_idx = idx[:ctx.N], idx[ctx.N:]
+    sn_xy, ch_xy = ctx.points_pool[sn_idx], ctx.points_pool[ch_idx]
+
+    return [
+        _record("energy_and_penalty_from_x", ctx, lambda: energy_and_penalty_from_x(x, ctx), 1, min_time),
+        _record("energy_and_penalty_batch", ctx, lambda: energy_and_penalty_batch(X, ctx), pop_size, min_time,
+                pop_size=pop_size, backend=ctx.kernel_backend),
+        _record("repair_unique", ctx, lambda: repair_unique(raw[0], M, strategy=ctx.repair_strategy), 1, min_time,
+                strategy=ctx.repair_strategy),
+        _record("repair_unique_batch", ctx, lambda: repair_unique_batch(raw, M, strategy=ctx.repair_strategy),
+                pop_size, min_time, strategy=ctx.repair_strategy, pop_size=pop_size),
+        _record("assign_sensors_to_ch", ctx, lambda: assign_sensors_to_ch(sn_xy, ch_xy), 1, min_time),
+        _record("assign_sensors_to_ch_idx", ctx,
+                lambda: assign_sensors_to_ch_idx(sn_idx, ch_idx, ctx.dist_pool, ctx.pool_index), 1, min_time),
+    ]
+
+def bench_solvers(ctx: ObjectiveContext, epochs: int = 10, pop_size: int = 30, seed: int = 0) -> list[dict]:
+    """Pełne przebiegi solve_ga / solve_pso: czas na epokę i przepustowość ewaluacji."""
+    records = []
+    for name, solver in (("solve_ga", solve_ga), ("solve_pso", solve_pso)):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        _, fitness = solver(ctx, epochs=epochs, pop_size=pop_size, seed=seed)
+        wall = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Populacja startowa + jedno pokolenie na epokę
+        n_evals = pop_size * (epochs + 1)
+        records.append({
+            "case": name,
+            "M": int(ctx.points_pool.shape[0]), "N": ctx.N, "K": ctx.K,
+            "epochs": epochs, "pop_size": pop_size,
+            "wall_s": wall,
+            "wall_s_per_epoch": wall / epochs,
+            "evals_per_sec": n_evals / wall,
+            "peak_mem_bytes": peak,
+            "fitness": float(fitness),
+        })
+    return records
+
+def _epochs_to_reach(history: np.ndarray, target: float) -> int:
+    """Pierwsza epoka (1..), w której best fitness <= target; len(history)+1, jeśli nie osiągnięto."""
+    hit = np.flatnonzero(history <= target)
+    return int(hit[0]) + 1 if hit.size else len(history) + 1
+
+def bench_warm_start(energy_params: EnergyParams, width_m: float = 0.6, height_m: float = 1.8,
+                     epochs: int = 30, pop_size: int = 30, seed: int = 0, fraction: float = 0.5) -> list[dict]:
+    """
+    Warm start jak w run_experiments: elity GA ze scenariusza źródłowego jako część populacji startowej
+    docelowego. Pary jak w scenarios.yaml: S2a -> S2b (inna bramka) i S3 -> S4 (większa pula i N, K).
+    Porównanie ze startem losowym: epoki do energii, którą start losowy osiąga na końcu.
+    """
+    gw_a, gw_b = np.array([[width_m / 2, height_m / 2]]), np.array([[width_m / 2, 0.1 * height_m]])
+    pairs = (("S2a->S2b", (20, 12, 2, gw_a), (20, 12, 2, gw_b)),
+             ("S3->S4", (24, 20, 3, gw_a), (50, 30, 4, gw_a)))
+    # Jedna pula, scenariusze biorą jej początek (jak points_pool[:M] w run_experiments)
+    pool = grid_pool(50, width_m, height_m)
+    records = []
+    for name, src, tgt in pairs:
+        ctx_src, ctx = (ObjectiveContext(points_pool=pool[:M], N=N, K=K, gw_xy=gw,
+                                         energy_params=energy_params, d_max_sn_ch=0.7, penalty_weight=1e6)
+                        for M, N, K, gw in (src, tgt))
+        info_src = {}
+        solve_ga(ctx_src, epochs=epochs, pop_size=pop_size, seed=seed, info=info_src)
+        init = initial_population([(ctx_src.N, info_src["elite"])], ctx.N, ctx.K, ctx.points_pool.shape[0],
+                                  int(fraction * pop_size), np.random.default_rng(seed))
+
+        runs = {}
+        for mode, X0 in (("cold", None), ("warm", init)):
+            info = {}
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            _, fitness = solve_ga(ctx, epochs=epochs, pop_size=pop_size, seed=seed, info=info, init=X0)
+            wall = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            runs[mode] = (wall, peak, float(fitness), info["history"])
+        target = runs["cold"][2]
+        for mode, (wall, peak, fitness, history) in runs.items():
+            records.append({
+                "case": f"warm_start_{mode}", "transfer": name,
+                "M": int(ctx.points_pool.shape[0]), "N": ctx.N, "K": ctx.K,
+                "epochs": epochs, "pop_size": pop_size, "n_init": 0 if mode == "cold" else len(init),
+                "wall_s": wall,
+                "evals_per_sec": pop_size * (epochs + 1) / wall,
+                "peak_mem_bytes": peak,
+                "fitness": fitness,
+                "initial_best": float(history[0]),
+                "epochs_to_cold_best": _epochs_to_reach(history, target),
+            })
+    return records
+
+def bench_surrogate(energy_params: EnergyParams, width_m: float = 0.6, height_m: float = 1.8,
+                    epochs: int = 30, pop_size: int = 30, seed: int = 0, ratio: float = 0.5,
+                    M: int = 50, N: int = 30, K: int = 4) -> list[dict]:
+    """
+    Preselekcja k-NN (surrogate) w GA i PSO przy tej samej jakości końcowej: zwykły przebieg (epochs)
+    wyznacza cel - swój końcowy fitness; przebieg z preselekcją dostaje epochs / ratio epok,
+    czyli podobny budżet prawdziwych ocen. Rekord: prawdziwe oceny do osiągnięcia celu (None, jeśli nie)
+    i oszczędność 1 - oceny_surrogate / oceny_zwykłe.
+    """
+    pool = grid_pool(M, width_m, height_m)
+    ctx = ObjectiveContext(points_pool=pool, N=N, K=K, gw_xy=np.array([[width_m / 2, height_m / 2]]),
+                           energy_params=energy_params, d_max_sn_ch=0.7, penalty_weight=1e6, routing="relay")
+    records = []
+    for name, solver in (("ga", solve_ga), ("pso", solve_pso)):
+        runs = {}
+        for mode, n_epochs, surrogate in (("plain", epochs, None),
+                                          ("screened", max(1, int(epochs / ratio)), {"ratio": ratio})):
+            info = {}
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            _, fitness = solver(ctx, epochs=n_epochs, pop_size=pop_size, seed=seed, info=info, surrogate=surrogate)
+            wall = time.perf_counter() - t0
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            runs[mode] = (wall, peak, n_epochs, float(fitness), info)
+        target = runs["plain"][3]
+        # Zwykły przebieg: populacja startowa + pop_size ocen na epokę
+        n_plain = pop_size * (_epochs_to_reach(runs["plain"][4]["history"], target) + 1)
+        n_screened = evals_to_reach(runs["screened"][4]["surrogate_trace"].tolist(), target)
+        for mode, (wall, peak, n_epochs, fitness, info) in runs.items():
+            n_true = info.get("n_true_evals", info["n_evals"])
+            records.append({
+                "case": f"surrogate_{mode}_{name}", "M": M, "N": N, "K": K,
+                "epochs": n_epochs, "pop_size": pop_size, "ratio": ratio if mode == "screened" else 1.0,
+                "wall_s": wall,
+                "evals_per_sec": n_true / wall,
+                "peak_mem_bytes": peak,
+                "fitness": fitness,
+                "n_true_evals": int(n_true),
+                "evals_to_plain_best": n_plain if mode == "plain" else (None if n_screened is None else int(n_screened)),
+                "true_eval_savings": (0.0 if mode == "plain" else
+                                      None if n_screened is None else 1.0 - n_screened / n_plain),
+            })
+    return records
+
+def run_suite(energy_params: EnergyParams, pool_sizes=DEFAULT_POOL_SIZES, nk=DEFAULT_NK,
+              width_m: float = 0.6, height_m: float = 1.8, epochs: int = 10, pop_size: int = 30,
+              min_time: float = 0.2, solvers: bool = True, log=print) -> list[dict]:
+    records = []
+    if solvers:
+        log("[bench] warm start")
+        records += bench_warm_start(energy_params, width_m, height_m, epochs=max(epochs, 2), pop_size=pop_size)
+        log("[bench] surrogate")
+        records += bench_surrogate(energy_params, width_m, height_m, epochs=max(epochs, 2), pop_size=pop_size)
+    for M in pool_sizes:
+        for N, K in nk:
+            if N + K > M:
+                continue
+            ctx = make_bench_context(M, N, K, energy_params, width_m, height_m)
+            log(f"[bench] M={M} N={N} K={K}")
+            records += bench_kernels(ctx, pop_size=pop_size, min_time=min_time)
+            if solvers:
+                records += bench_solvers(ctx, epochs=epochs, pop_size=pop_size)
+    return records
+
+def write_report(records: list[dict], path: str, **extra) -> Path:
+    """Zapis JSON: metadane środowiska + lista rekordów (jeden na przypadek i rozmiar) + opcjonalne pola extra."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "records": records,
+        **extra,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1)
+    return path
+
+def compare_reports(old: dict, new: dict, threshold: float = 0.2) -> list[str]:
+    """Przypadki, w których evals_per_sec spadło o więcej niż threshold (np. 0.2 = 20%)."""
+    key = lambda r: (r["case"], r["M"], r["N"], r["K"])
+    old_by_key = {key(r): r for r in old["records"]}
+    regressions = []
+    for rec in new["records"]:
+        prev = old_by_key.get(key(rec))
+        if prev is None:
+            continue
+        ratio = rec["evals_per_sec"] / prev["evals_per_sec"]
+        if ratio < 1.0 - threshold:
+            regressions.append(f"{rec['case']} M={rec['M']} N={rec['N']} K={rec['K']}: "
+                               f"{prev['evals_per_sec']:.0f} -> {rec['evals_per_sec']:.0f} evals/s ({ratio:.2f}x)")
+    return regressions
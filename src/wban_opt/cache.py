@@ -0,0 +1,73 @@
+import numpy as np
+from collections import OrderedDict
+
+class FitnessCache:
+    """
+    LRU cache (Energy, Penalty) z ograniczoną liczbą wpisów.
+    Klucz to kanoniczne rozmieszczenie PO repair: posortowane indeksy SN + posortowane indeksy CH.
+    Wartość zależy tylko od rozmieszczenia, więc cache jest poprawny niezależnie od tego,
+    czy repair jest losowy, czy deterministyczny (losowość zostaje przed kluczem).
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError("maxsize musi być > 0")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def evaluate(self, sn_idx: np.ndarray, ch_idx: np.ndarray, eval_fn) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca (Energy, Penalty) dla (P, N) / (P, K) indeksów (lub pojedynczych wektorów).
+        Chybienia są liczone jednym wywołaniem eval_fn(sn, ch) na wierszach w kolejności wejścia
+        (pierwsze wystąpienie klucza), więc chybienie daje dokładnie to samo co ocena bez cache.
+        Przypisanie rozstrzyga remisy po indeksie puli, więc trafienie innej permutacji tego samego
+        rozmieszczenia różni się co najwyżej kolejnością sumowania (zaokrąglenia).
+        """
+        single = sn_idx.ndim == 1
+        sn_in, ch_in = np.atleast_2d(sn_idx), np.atleast_2d(ch_idx)
+        canon = np.concatenate([np.sort(sn_in, axis=1), np.sort(ch_in, axis=1)], axis=1)
+
+        n_rows = canon.shape[0]
+        E = np.empty(n_rows)
+        P = np.empty(n_rows)
+        keys = [row.tobytes() for row in canon]
+
+        pending = {}  # klucz -> wiersze (duplikaty w jednym pokoleniu liczone raz)
+        for i, key in enumerate(keys):
+            val = self._data.get(key)
+            if val is not None:
+                self._data.move_to_end(key)
+                E[i], P[i] = val
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+                self.misses += 1
+
+        if pending:
+            first = [rows[0] for rows in pending.values()]
+            E_new, P_new = eval_fn(sn_in[first], ch_in[first])
+            for (key, rows), e, p in zip(pending.items(), E_new, P_new):
+                E[rows], P[rows] = e, p
+                self._data[key] = (e, p)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        if single:
+            return E[0], P[0]
+        return E, P
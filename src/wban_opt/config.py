@@ -1,8 +1,10 @@
 import pandas as pd
+import numpy as np
 import json
 import yaml
 from dataclasses import dataclass
 from pathlib import Path
+from .energy_model import EnergyParams
 
 @dataclass
 class Point:
@@ -19,22 +21,33 @@ def load_points(path: str) -> list[Point]:
     if not required.issubset(df.columns):
         raise ValueError(f"CSV missing columns: {required - set(df.columns)}")
     
-    points = []
-    for _, row in df.iterrows():
-        points.append(Point(
-            id=int(row['id']),
-            name=str(row['name']),
-            x=float(row['x']),
-            y=float(row['y']),
-            region=str(row['region'])
-        ))
-    return points
+    # Kolumny naraz zamiast iterrows (duże pule: patrz point_pool.load_point_pool)
+    cols = zip(df['id'].to_numpy(dtype=np.int64).tolist(), df['name'].astype(str).tolist(),
+               df['x'].to_numpy(dtype=float).tolist(), df['y'].to_numpy(dtype=float).tolist(),
+               df['region'].astype(str).tolist())
+    return [Point(id=i, name=n, x=x, y=y, region=r) for i, n, x, y, r in cols]
 
 def load_gw_positions(path: str) -> dict[str, tuple[float, float]]:
     with open(path, 'r') as f:
         data = json.load(f)
     return {k: tuple(v) for k, v in data.items()}
 
+def gw_array(gw_positions: dict, variant: str) -> np.ndarray:
+    """Wariant bramek -> (G, 2). Kilka bramek łączy się plusem, np. "GW1+GW2"."""
+    return np.array([gw_positions[name] for name in variant.split("+")], dtype=float)
+
 def load_scenarios(path: str) -> dict:
     with open(path, 'r') as f:
-        return yaml.safe_load(f)
\ No newline at end of file
+        return yaml.safe_load(f)
+
+def make_energy_params(ep_cfg: dict) -> EnergyParams:
+    """Buduje EnergyParams z sekcji common.energy pliku scenarios.yaml."""
+    return EnergyParams(
+        E_elec=float(ep_cfg['E_elec']),
+        E_fs=float(ep_cfg['E_fs']),
+        E_mp=float(ep_cfg['E_mp']),
+        E_agg=float(ep_cfg['E_agg']),
+        packet_bits=int(ep_cfg['packet_bits']),
+        beta_agg=float(ep_cfg['beta_agg']),
+        E_init=float(ep_cfg.get('E_init', 0.5))
+    )
\ No newline at end of file
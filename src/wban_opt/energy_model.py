@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from dataclasses import dataclass
 
 @dataclass(frozen=True)
@@ -9,6 +10,7 @@ class EnergyParams:
     E_agg: float
     packet_bits: int
     beta_agg: float  # Współczynnik kompresji
+    E_init: float = 0.5  # Początkowa energia węzła [J] (symulacja czasu życia)
     
     @property
     def d0(self) -> float:
@@ -21,6 +23,15 @@ def calc_E_tx(k: int, d: float, p: EnergyParams) -> float:
     else:
         return k * p.E_elec + k * p.E_mp * (d**4)
 
+def calc_E_tx_array(k, d, p: EnergyParams) -> np.ndarray:
+    """
+    Wektorowa wersja calc_E_tx (model free-space / multipath z progiem d0).
+    k, d: skalary lub tablice o zgodnych kształtach (broadcast).
+    """
+    d = np.asarray(d, dtype=float)
+    amp = np.where(d < p.d0, k * p.E_fs * (d**2), k * p.E_mp * (d**4))
+    return k * p.E_elec + amp
+
 def calc_E_rx(k: int, p: EnergyParams) -> float:
     """Energia odbioru k bitów."""
     return k * p.E_elec
@@ -0,0 +1,183 @@
+import numpy as np
+from dataclasses import dataclass, field
+from scipy import sparse
+from scipy.spatial import cKDTree, ConvexHull, QhullError
+from .geometry import pairwise_dist
+from .repair import repair_unique_batch, RepairWorkspace
+
+def range_neighbors(points: np.ndarray, d_max: float) -> sparse.csr_matrix:
+    """Rzadka macierz (M, M) bool: j w zasięgu d_max od i (dist <= d_max, łącznie z samym i)."""
+    M = points.shape[0]
+    pairs = cKDTree(points).query_pairs(d_max, output_type='ndarray')
+    rows = np.concatenate([pairs[:, 0], pairs[:, 1], np.arange(M)])
+    cols = np.concatenate([pairs[:, 1], pairs[:, 0], np.arange(M)])
+    return sparse.csr_matrix((np.ones(rows.size, dtype=bool), (rows, cols)), shape=(M, M))
+
+def region_coverage(neighbors: sparse.csr_matrix, region: np.ndarray) -> np.ndarray:
+    """(M, R) bool: CH w punkcie i ma w zasięgu choć jeden punkt regionu r."""
+    M, R = len(region), int(region.max()) + 1 if len(region) else 0
+    onehot = sparse.csr_matrix((np.ones(M, dtype=np.int32), (np.arange(M), region)), shape=(M, R))
+    return (neighbors.astype(np.int32) @ onehot).toarray() > 0
+
+def dominating_ch(neighbors: sparse.csr_matrix, cost: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Dla każdego punktu: pozycja CH, na którą się go rzutuje (siebie, gdy nic jej nie zastępuje).
+    b zastępuje a, gdy b leży w zasięgu a, każdy inny punkt w zasięgu a jest co najmniej tak samo blisko b
+    jak a (SN nigdy nie płaci więcej za transmisję; sam punkt a zostaje obsłużony z b), a uplink z b
+    nie jest droższy. Dodatkowo (cost, -zasięg, indeks) b jest leksykograficznie mniejszy, więc relacja
+    jest acykliczna. Punkt leżący wewnątrz otoczki wypukłej swoich sąsiadów nie ma zastępcy.
+    To warunek na pojedynczy CH - przy kilku CH rzut może je skleić (patrz FeasibilityTables.repair).
+    """
+    M = neighbors.shape[0]
+    deg = np.diff(neighbors.indptr)
+    ch_map = np.arange(M)
+    subs = {}
+    for a in range(M):
+        nb = neighbors.indices[neighbors.indptr[a]:neighbors.indptr[a + 1]]
+        nb = nb[nb != a]
+        better = (cost[nb] < cost[a]) | ((cost[nb] == cost[a]) & ((deg[nb] > deg[a]) | ((deg[nb] == deg[a]) & (nb < a))))
+        cand = nb[better]
+        if cand.size == 0:
+            continue
+        hull = points[nb]
+        if len(nb) >= 3:
+            try:
+                h = ConvexHull(hull)
+            except QhullError:  # punkty współliniowe
+                h = None
+            if h is not None:
+                if np.all(h.equations[:, :2] @ points[a] + h.equations[:, 2] < -1e-12):
+                    continue
+                hull = hull[h.vertices]
+        # Wszyscy sąsiedzi po stronie b symetralnej odcinka a-b (min po wierzchołkach otoczki)
+        d = points[cand] - points[a]
+        mid = (points[cand] + points[a]) / 2
+        ok = (hull @ d.T).min(axis=0) >= np.sum(mid * d, axis=1) - 1e-12
+        if ok.any():
+            b = cand[ok]
+            subs[a] = b[np.lexsort((b, -deg[b], cost[b]))]
+    # Tylko jeden krok (zastępowanie nie jest przechodnie): najlepszy zastępca, który sam go nie ma;
+    # gdy takiego brak, punkt zostaje kandydatem
+    for a, b in subs.items():
+        b = b[[x not in subs for x in b]]
+        if b.size:
+            ch_map[a] = b[0]
+    return ch_map
+
+@dataclass(frozen=True)
+class FeasibilityTables:
+    """
+    Wstępnie policzone ograniczenie zasięgu SN -> CH dla puli punktów jednego kontekstu.
+    neighbors (M, M) rzadka bool - punkty w zasięgu d_max, serves (M, R) - regiony obsługiwane przez CH w punkcie,
+    ch_candidates (C,) - pozycje CH bez zastępcy (rosnąco), ch_map (M,) - punkt -> jego zastępca (dominating_ch).
+    Kandydaci zawężają losowanie i ruchy CH w local search; repair rzutuje geny CH tylko wtedy,
+    gdy nie powoduje to kolizji, więc każde rozmieszczenie pozostaje osiągalne.
+    repair ma sygnaturę repair_unique_batch i zastępuje je w _decode_and_repair.
+    """
+    N: int
+    points: np.ndarray
+    region: np.ndarray
+    neighbors: sparse.csr_matrix = field(repr=False)
+    serves: np.ndarray = field(repr=False)
+    ch_candidates: np.ndarray = field(repr=False)
+    ch_map: np.ndarray = field(repr=False)
+
+    @classmethod
+    def build(cls, points: np.ndarray, N: int, K: int, d_max: float, uplink_cost: np.ndarray,
+              region: np.ndarray = None) -> "FeasibilityTables":
+        """
+        uplink_cost (M,): koszt na bit CH -> bramka (kryterium zastępowania); None -> bez przycinania
+        (np. routing="relay", gdzie koszt uplinku zależy od pozostałych CH).
+        region (M,) kody regionów (None -> jeden region). Zostaje co najmniej K kandydatów CH.
+        """
+        M = points.shape[0]
+        region = np.zeros(M, dtype=np.int32) if region is None else np.asarray(region)
+        neighbors = range_neighbors(points, d_max)
+        ch_map = np.arange(M) if uplink_cost is None else dominating_ch(neighbors, uplink_cost, points)
+        ch_candidates = np.flatnonzero(ch_map == np.arange(M))
+        if len(ch_candidates) < K:
+            # Za mało kandydatów -> przywrócenie zastąpionych o największym zasięgu
+            deg = np.diff(neighbors.indptr)
+            back = [i for i in np.lexsort((uplink_cost, -deg)) if ch_map[i] != i][:K - len(ch_candidates)]
+            ch_map[back] = back
+            ch_candidates = np.flatnonzero(ch_map == np.arange(M))
+        return cls(N=N, points=points, region=region, neighbors=neighbors,
+                   serves=region_coverage(neighbors, region), ch_candidates=ch_candidates, ch_map=ch_map)
+
+    def covered(self, ch_idx: np.ndarray) -> np.ndarray:
+        """(P, M) bool: punkty w zasięgu choć jednego CH wiersza, ch_idx (P, K)."""
+        P, K = ch_idx.shape
+        group = sparse.csr_matrix((np.ones(P * K, dtype=np.int32), (np.repeat(np.arange(P), K), np.arange(P * K))),
+                                  shape=(P, P * K))
+        return (group @ self.neighbors[ch_idx.ravel()].astype(np.int32)).toarray() > 0
+
+    def repair_range(self, idx: np.ndarray) -> np.ndarray:
+        """
+        SN poza zasięgiem wszystkich CH przenoszone na najbliższy wolny punkt w zasięgu,
+        najpierw w tym samym regionie. Brak takiego punktu -> SN zostaje (kara jak dotąd).
+        idx (P, N+K) bez powtórzeń -> nowa tablica.
+        """
+        N = self.N
+        idx = idx.copy()
+        sn = idx[:, :N]
+        covered = self.covered(idx[:, N:])
+        bad = ~np.take_along_axis(covered, sn, axis=1)
+        if not bad.any():
+            return idx
+
+        used = np.zeros_like(covered)
+        np.put_along_axis(used, idx, True, axis=1)
+        for j in np.flatnonzero(bad.any(axis=0)):
+            rows = np.flatnonzero(bad[:, j])
+            s = sn[rows, j]
+            allowed = covered[rows] & ~used[rows]
+            same = allowed & (self.region[None, :] == self.region[s][:, None])
+            allowed = np.where(same.any(axis=1)[:, None], same, allowed)
+            ok = allowed.any(axis=1)
+            rows, s, allowed = rows[ok], s[ok], allowed[ok]
+            d = np.where(allowed, pairwise_dist(self.points[s], self.points), np.inf)
+            new = np.argmin(d, axis=1)
+            used[rows, s] = False
+            used[rows, new] = True
+            sn[rows, j] = new
+        return idx
+
+    def repair(self, indices: np.ndarray, M: int, rng: np.random.Generator = None,
+               strategy: str = "hash", workspace: RepairWorkspace = None) -> np.ndarray:
+        """
+        Repair zdekodowanych indeksów (P, N+K) lub (N+K,): geny CH rzutowane na zastępców (ch_map),
+        ale gdy kilka trafia w ten sam punkt, kolejne zostają na swoich pozycjach; potem CH i SN
+        unikalne (wg strategii, CH mają pierwszeństwo) i naprawa zasięgu SN.
+        """
+        N = self.N
+        raw = np.atleast_2d(indices)
+        K = raw.shape[1] - N
+        ch = self.ch_map[raw[:, N:]]
+        order = np.argsort(ch, axis=1, kind='stable')
+        ch_sorted = np.take_along_axis(ch, order, axis=1)
+        dup = np.zeros_like(ch, dtype=bool)
+        np.put_along_axis(dup, order[:, 1:], ch_sorted[:, 1:] == ch_sorted[:, :-1], axis=1)
+        ch = np.where(dup, raw[:, N:], ch)
+        # CH pierwsze -> przy konflikcie SN z CH zmienia się SN
+        both = repair_unique_batch(np.concatenate([ch, raw[:, :N]], axis=1), M, rng, strategy, workspace)
+        idx = self.repair_range(np.concatenate([both[:, K:], both[:, :K]], axis=1))
+        return idx if np.ndim(indices) == 2 else idx[0]
+
+    def sample(self, K: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Losowe rozmieszczenie (N+K,): CH z kandydatów, kolejne najchętniej z regionem jeszcze
+        nieobsługiwanym, SN z wolnych punktów w zasięgu (gdy ich brak - z pozostałych wolnych).
+        """
+        M = self.points.shape[0]
+        ch, served = [], np.zeros(self.serves.shape[1], dtype=bool)
+        free = np.ones(M, dtype=bool)
+        for _ in range(K):
+            cand = self.ch_candidates[free[self.ch_candidates]]
+            new_region = (self.serves[cand] & ~served).any(axis=1)
+            pick = int(rng.choice(cand[new_region] if new_region.any() else cand))
+            ch.append(pick)
+            served |= self.serves[pick]
+            free[pick] = False
+        inside = self.covered(np.array([ch]))[0] & free
+        order = np.concatenate([rng.permutation(np.flatnonzero(inside)), rng.permutation(np.flatnonzero(free & ~inside))])
+        return np.concatenate([order[:self.N], ch]).astype(int)
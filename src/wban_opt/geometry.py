@@ -1,12 +1,28 @@
 import numpy as np
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
 from .config import Point
+from .point_pool import PointPool
 
-def points_to_numpy(points: list[Point]) -> np.ndarray:
-    """Konwertuje listę Point na macierz (M, 2)."""
+def points_to_numpy(points: list[Point] | PointPool) -> np.ndarray:
+    """Konwertuje listę Point na macierz (M, 2); dla PointPool zwraca jego xy bez kopiowania."""
+    if isinstance(points, PointPool):
+        return points.xy
     coords = [[p.x, p.y] for p in points]
     return np.array(coords)
 
+def grid_pool(M: int, width_m: float, height_m: float) -> np.ndarray:
+    """
+    Syntetyczna pula M punktów: regularna siatka nx x ny na prostokącie width x height
+    (proporcje siatki zgodne z proporcjami mapy ciała). Kolejność: kolumnami (x zewnętrzne).
+    """
+    nx = max(1, int(np.ceil(np.sqrt(M * width_m / height_m))))
+    ny = max(1, int(np.ceil(M / nx)))
+    xs = np.linspace(0.0, width_m, nx) if nx > 1 else np.zeros(1)
+    ys = np.linspace(0.0, height_m, ny) if ny > 1 else np.zeros(1)
+    grid = np.stack(np.meshgrid(xs, ys, indexing='ij'), axis=-1).reshape(-1, 2)
+    return grid[:M]
+
 def pairwise_dist(A: np.ndarray, B: np.ndarray) -> np.ndarray:
     """
     Oblicza macierz odległości euklidesowych.
@@ -16,4 +32,39 @@ def pairwise_dist(A: np.ndarray, B: np.ndarray) -> np.ndarray:
 
 def dist_sq(A: np.ndarray, B: np.ndarray) -> np.ndarray:
     """Kwadrat odległości (szybsze do prostych porównań)."""
-    return cdist(A, B, metric='sqeuclidean')
\ No newline at end of file
+    return cdist(A, B, metric='sqeuclidean')
+
+class PairwiseOnDemand:
+    """
+    Zamiennik macierzy (M, M) dla dużych pul, gdzie pełna tabela nie mieści się w pamięci.
+    Indeksowanie d[i, j] (z broadcastem) liczy odległości na żądanie ze współrzędnych.
+    Opcjonalny transform przelicza odległość dalej (np. na energię TX na bit).
+    """
+
+    def __init__(self, points: np.ndarray, transform=None):
+        self.points = points
+        self.transform = transform
+
+    def __getitem__(self, key):
+        i, j = key
+        diff = self.points[i] - self.points[j]
+        d = np.sqrt(np.sum(diff**2, axis=-1))
+        return d if self.transform is None else self.transform(d)
+
+class PoolIndex:
+    """
+    cKDTree nad całą pulą punktów, budowany raz i używany wielokrotnie
+    (np. do szukania najbliższego CH dla zmieniających się zbiorów CH, patrz assignment).
+    """
+
+    def __init__(self, points: np.ndarray):
+        self.points = points
+        self.tree = cKDTree(points)
+
+    def __len__(self):
+        return self.points.shape[0]
+
+    def query_idx(self, idx: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """k najbliższych punktów puli dla punktów puli idx (płasko): (odległości, indeksy), kształt (n, k)."""
+        d, j = self.tree.query(self.points[idx], k=k)
+        return d.reshape(-1, k), j.reshape(-1, k)
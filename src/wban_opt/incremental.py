@@ -0,0 +1,198 @@
+import numpy as np
+from dataclasses import dataclass
+from .objective import ObjectiveContext
+
+@dataclass(frozen=True)
+class MoveSN:
+    """Sensor i -> wolny punkt puli q."""
+    i: int
+    q: int
+
+@dataclass(frozen=True)
+class MoveCH:
+    """CH j -> wolny punkt puli q."""
+    j: int
+    q: int
+
+@dataclass(frozen=True)
+class SwapRoles:
+    """Zamiana pozycji sensora i i CH j (przydatna, gdy wolnych punktów prawie nie ma)."""
+    i: int
+    j: int
+
+@dataclass
+class _Plan:
+    """Wynik ruchu dla dotkniętych sensorów (bez modyfikacji stanu)."""
+    rows: np.ndarray      # indeksy sensorów, których wkład się zmienia
+    assign: np.ndarray    # nowe sloty CH dla rows
+    dist: np.ndarray      # nowe odległości do CH dla rows
+    e: np.ndarray         # nowe wkłady energii dla rows
+    p: np.ndarray         # nowe wkłady kary dla rows
+    sn_set: tuple = ()    # (i, punkt) dla zmienionego sensora
+    ch_set: tuple = ()    # (j, punkt) dla zmienionego CH
+    w_ch: np.ndarray = None  # nowe koszty CH per slot (ruch CH), inaczej bez zmian
+    delta: float = 0.0
+
+class IncrementalEvaluator:
+    """
+    Stan pojedynczego rozmieszczenia (indeksy puli SN / CH) z tanią oceną ruchów.
+
+    Energia rozkłada się na wkłady sensorów: sensor i przypisany do CH j kosztuje
+        bits * e_tx[sn_i, ch_j]                        (TX sensora)
+      + bits * (E_elec + E_agg + beta * uplink[ch_j])  (RX + DA + wysyłka do bramki w CH za ten pakiet)
+    gdzie uplink to koszt na bit CH -> bramka (ctx.uplink_costs; przy routing="relay" zależy od zbioru CH).
+    Stan trzyma przypisanie, odległości sensor -> CH, liczności CH i sumy częściowe;
+    delta(move) / apply_move(move) przeliczają tylko sensory, których ruch dotyczy
+    (dla ruchu CH: jego dotychczasowych członków, sensory, dla których nowa pozycja jest bliższa,
+    i członków CH, którym zmienił się koszt trasy).
+    """
+
+    def __init__(self, ctx: ObjectiveContext, sn_idx: np.ndarray, ch_idx: np.ndarray):
+        self.ctx = ctx
+        self.bits = ctx.energy_params.packet_bits
+
+        M = ctx.points_pool.shape[0]
+        self.sn = np.array(sn_idx, dtype=int)
+        self.ch = np.array(ch_idx, dtype=int)
+        self.occupied = np.zeros(M, dtype=bool)
+        self.occupied[self.sn] = True
+        self.occupied[self.ch] = True
+        self.resync()
+
+    # ---- wkłady sensorów ----
+    def _w_ch(self, ch: np.ndarray) -> np.ndarray:
+        """Koszt CH za jeden pakiet sensora (RX + DA + wysyłka zagregowanego do bramki), per slot."""
+        ep = self.ctx.energy_params
+        return self.bits * (ep.E_elec + ep.E_agg + ep.beta_agg * self.ctx.uplink_costs(ch))
+
+    def _terms(self, sn: np.ndarray, ch: np.ndarray, slots: np.ndarray, d: np.ndarray,
+               w_ch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        ctx = self.ctx
+        energy = self.bits * ctx.e_tx_pool[sn, ch[slots]] + w_ch[slots]
+        penalty = np.maximum(0.0, d - ctx.d_max_sn_ch) * ctx.penalty_weight
+        return energy, penalty
+
+    def _nearest(self, sn: np.ndarray, ch: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # argmin po CH posortowanych po indeksie puli -> remis jak w assign_sensors_to_ch_idx
+        order = np.argsort(ch)
+        dists = self.ctx.dist_pool[sn[:, None], ch[None, :]]
+        slots = order[np.argmin(dists[:, order], axis=1)]
+        return slots, dists[np.arange(len(sn)), slots]
+
+    def resync(self):
+        """Pełne przeliczenie stanu (także usuwa dryf zmiennoprzecinkowy sum)."""
+        self.assign, self.dist = self._nearest(self.sn, self.ch)
+        self.w_ch = self._w_ch(self.ch)
+        self.e_terms, self.p_terms = self._terms(self.sn, self.ch, self.assign, self.dist, self.w_ch)
+        self.counts = np.bincount(self.assign, minlength=len(self.ch))
+        self.E_total = float(self.e_terms.sum())
+        self.P_total = float(self.p_terms.sum())
+
+    # ---- wartości ----
+    @property
+    def energy(self) -> float:
+        return self.E_total
+
+    @property
+    def penalty(self) -> float:
+        return self.P_total
+
+    @property
+    def fitness(self) -> float:
+        return self.E_total + self.P_total
+
+    def free_indices(self) -> np.ndarray:
+        return np.flatnonzero(~self.occupied)
+
+    # ---- planowanie ruchów ----
+    def _plan_sn(self, i: int, q: int) -> _Plan:
+        slots, d = self._nearest(np.array([q]), self.ch)
+        e, p = self._terms(np.array([q]), self.ch, slots, d, self.w_ch)
+        return _Plan(np.array([i]), slots, d, e, p, sn_set=(i, q))
+
+    def _plan_ch(self, j: int, q: int, moved_sn: tuple = None) -> _Plan:
+        """
+        CH j -> q. moved_sn=(i, r): sensor i jednocześnie przenosi się na punkt r (zamiana ról).
+        """
+        ch_new = self.ch.copy()
+        ch_new[j] = q
+        sn = self.sn
+        if moved_sn is not None:
+            sn = sn.copy()
+            sn[moved_sn[0]] = moved_sn[1]
+
+        # Członkowie j (i przeniesiony sensor) -> pełne argmin po K slotach
+        full = self.assign == j
+        if moved_sn is not None:
+            full[moved_sn[0]] = True
+        # Pozostali zmieniają CH tylko, jeśli nowa pozycja j jest bliższa (remis -> niższy indeks puli)
+        others = np.flatnonzero(~full)
+        d_q = self.ctx.dist_pool[sn[others], q]
+        cur = self.dist[others]
+        switch = (d_q < cur) | ((d_q == cur) & (q < self.ch[self.assign[others]]))
+
+        # Przy przekazywaniu CH -> CH ruch CH zmienia koszty tras także innych slotów
+        w_new = self._w_ch(ch_new)
+        rerouted = (w_new != self.w_ch)[self.assign[others]] & ~switch
+
+        rows_full = np.flatnonzero(full)
+        rows_sw = others[switch]
+        rows_rr = others[rerouted]
+        slots_full, d_full = self._nearest(sn[rows_full], ch_new)
+
+        rows = np.concatenate([rows_full, rows_sw, rows_rr])
+        assign = np.concatenate([slots_full, np.full(rows_sw.size, j), self.assign[rows_rr]])
+        dist = np.concatenate([d_full, d_q[switch], self.dist[rows_rr]])
+        e, p = self._terms(sn[rows], ch_new, assign, dist, w_new)
+        return _Plan(rows, assign, dist, e, p, sn_set=moved_sn or (), ch_set=(j, q), w_ch=w_new)
+
+    def _plan(self, move) -> _Plan:
+        if isinstance(move, MoveSN):
+            plan = self._plan_sn(move.i, move.q)
+        elif isinstance(move, MoveCH):
+            plan = self._plan_ch(move.j, move.q)
+        elif isinstance(move, SwapRoles):
+            plan = self._plan_ch(move.j, self.sn[move.i], moved_sn=(move.i, self.ch[move.j]))
+        else:
+            raise TypeError(f"Nieznany ruch: {move!r}")
+        rows = plan.rows
+        plan.delta = float((plan.e.sum() + plan.p.sum()) - (self.e_terms[rows].sum() + self.p_terms[rows].sum()))
+        return plan
+
+    # ---- API ruchów ----
+    def delta(self, move) -> float:
+        """Zmiana fitness po wykonaniu ruchu (stan bez zmian)."""
+        return self._plan(move).delta
+
+    def apply_move(self, move) -> float:
+        """Wykonuje ruch, aktualizując tylko dotknięte sensory. Zwraca deltę fitness."""
+        plan = self._plan(move)
+        rows = plan.rows
+
+        # Zamiana ról nie zmienia zbioru zajętych punktów
+        if not isinstance(move, SwapRoles):
+            old = self.sn[plan.sn_set[0]] if plan.sn_set else self.ch[plan.ch_set[0]]
+            new = plan.sn_set[1] if plan.sn_set else plan.ch_set[1]
+            self.occupied[old] = False
+            self.occupied[new] = True
+        if plan.ch_set:
+            self.ch[plan.ch_set[0]] = plan.ch_set[1]
+            self.w_ch = plan.w_ch
+        if plan.sn_set:
+            self.sn[plan.sn_set[0]] = plan.sn_set[1]
+
+        np.subtract.at(self.counts, self.assign[rows], 1)
+        np.add.at(self.counts, plan.assign, 1)
+        self.E_total += float(plan.e.sum() - self.e_terms[rows].sum())
+        self.P_total += float(plan.p.sum() - self.p_terms[rows].sum())
+        self.assign[rows] = plan.assign
+        self.dist[rows] = plan.dist
+        self.e_terms[rows] = plan.e
+        self.p_terms[rows] = plan.p
+        return plan.delta
+
+    def delta_sn_all(self, i: int, qs: np.ndarray) -> np.ndarray:
+        """Delty MoveSN(i, q) dla wielu punktów qs naraz (wektorowo, O(len(qs) * K))."""
+        slots, d = self._nearest(qs, self.ch)
+        e_new, p_new = self._terms(qs, self.ch, slots, d, self.w_ch)
+        return (e_new + p_new) - (self.e_terms[i] + self.p_terms[i])
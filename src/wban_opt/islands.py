@@ -0,0 +1,157 @@
+import multiprocessing as mp
+import numpy as np
+
+from .objective import ObjectiveContext
+from .mealpy_runner import MealpyStepper, _elite
+
+# Topologie migracji (kto wysyła elity do kogo)
+TOPOLOGIES = ("ring", "star", "full", "none")
+# Klucze wpisu algorytmu "islands" (poza optimizer / params / epochs / pop_size)
+ISLAND_KEYS = ("n_islands", "topology", "interval", "n_migrants", "processes")
+
+def topology_targets(topology: str, n: int) -> list[list[int]]:
+    """
+    Odbiorcy migrantów każdej z n wysp: ring i -> i+1, star 0 <-> pozostałe,
+    full każda do każdej, none bez migracji.
+    """
+    if topology == "ring":
+        return [[(i + 1) % n] if n > 1 else [] for i in range(n)]
+    if topology == "star":
+        return [list(range(1, n))] + [[0] for _ in range(1, n)]
+    if topology == "full":
+        return [[j for j in range(n) if j != i] for i in range(n)]
+    if topology == "none":
+        return [[] for _ in range(n)]
+    raise ValueError(f"Nieznana topologia: {topology} (dostępne: {TOPOLOGIES})")
+
+def topology_sources(targets: list[list[int]]) -> list[list[int]]:
+    """Odwrócenie topology_targets: od kogo każda wyspa dostaje migrantów."""
+    sources = [[] for _ in targets]
+    for i, out in enumerate(targets):
+        for j in out:
+            sources[j].append(i)
+    return sources
+
+def island_seeds(seed: int, n: int) -> list[int]:
+    """Harmonogram seedów wysp wyprowadzony z seeda przebiegu (None -> losowe)."""
+    if seed is None:
+        return [None] * n
+    return [int(s) for s in np.random.SeedSequence(seed).generate_state(n)]
+
+def _migrations(run: MealpyStepper, interval: int) -> bool:
+    return interval > 0 and run.epoch % interval == 0 and not run.done
+
+def _result(i: int, run: MealpyStepper, ctx: ObjectiveContext, seed: int) -> tuple:
+    x, fitness = run.result()
+    return i, x, float(fitness), np.array(run.history, dtype=np.float64), int(run.model.nfe_counter), \
+        _elite(run.model, ctx, 5, seed)
+
+def _island_worker(i: int, ctx: ObjectiveContext, optimizer: str, epochs: int, pop_size: int, seed: int,
+                   params: dict, init: np.ndarray, targets: list[int], sources: list[int], interval: int,
+                   n_migrants: int, inboxes: list, results):
+    """
+    Jedna wyspa w osobnym procesie. Po każdej epoce migracji wysyła swoje elity do odbiorców
+    i czeka tylko na wiadomości swoich nadawców z tej samej epoki (bez globalnej bariery);
+    wiadomości z przyszłych epok są buforowane.
+    """
+    try:
+        run = MealpyStepper(ctx, optimizer, epochs, pop_size, seed=seed, params=params, init=init)
+        pending = {}
+        while not run.done:
+            run.step()
+            if not _migrations(run, interval):
+                continue
+            X, _ = run.best(n_migrants)
+            for j in targets:
+                inboxes[j].put((run.epoch, i, X))
+            while len(pending.get(run.epoch, {})) < len(sources):
+                epoch, src, Xs = inboxes[i].get()
+                pending.setdefault(epoch, {})[src] = Xs
+            got = pending.pop(run.epoch, {})
+            if got:
+                run.replace_worst(np.concatenate([got[s] for s in sorted(got)]))
+        results.put(_result(i, run, ctx, seed))
+    except Exception as e:
+        results.put((i, e))
+
+def _run_in_process(ctx, optimizer, epochs, pop_size, seeds, params, inits, targets, interval, n_migrants):
+    """Te same wyspy po kolei w bieżącym procesie (epoka po epoce); wynik identyczny jak w procesach."""
+    runs = [MealpyStepper(ctx, optimizer, epochs, pop_size, seed=s, params=params, init=x0)
+            for s, x0 in zip(seeds, inits)]
+    while not runs[0].done:
+        for run in runs:
+            run.step()
+        if not _migrations(runs[0], interval):
+            continue
+        outgoing = [run.best(n_migrants)[0] for run in runs]
+        for j, run in enumerate(runs):
+            got = [outgoing[i] for i in range(len(runs)) if j in targets[i]]
+            if got:
+                run.replace_worst(np.concatenate(got))
+    return [_result(i, run, ctx, s) for i, (run, s) in enumerate(zip(runs, seeds))]
+
+def _run_processes(ctx, optimizer, epochs, pop_size, seeds, params, inits, targets, interval, n_migrants,
+                   mp_context):
+    mpc = mp.get_context(mp_context)
+    n = len(seeds)
+    sources = topology_sources(targets)
+    inboxes = [mpc.Queue() for _ in range(n)]
+    results = mpc.Queue()
+    procs = [mpc.Process(target=_island_worker,
+                         args=(i, ctx, optimizer, epochs, pop_size, seeds[i], params, inits[i], targets[i],
+                               sources[i], interval, n_migrants, inboxes, results), daemon=True)
+             for i in range(n)]
+    for p in procs:
+        p.start()
+    out = []
+    try:
+        for _ in range(n):
+            res = results.get()
+            if isinstance(res[1], Exception):
+                raise RuntimeError(f"Wyspa {res[0]} zakończyła się błędem") from res[1]
+            out.append(res)
+    except BaseException:
+        # Sąsiedzi czekaliby na migrantów tej wyspy w nieskończoność
+        for p in procs:
+            p.terminate()
+        raise
+    for p in procs:
+        p.join()
+    return sorted(out, key=lambda r: r[0])
+
+def solve_islands(ctx: ObjectiveContext, optimizer: str, epochs: int, pop_size: int, seed: int = None,
+                  n_islands: int = 4, topology: str = "ring", interval: int = 5, n_migrants: int = 2,
+                  params: dict = None, init: np.ndarray = None, info: dict = None, processes: bool = True,
+                  mp_context: str = None):
+    """
+    Model wyspowy: n_islands populacji optymalizatora Mealpy ("MODUŁ.Klasa"), każda w osobnym procesie
+    (pop_size i epochs na wyspę). Co interval epok każda wyspa wysyła n_migrants najlepszych rozwiązań
+    do sąsiadów wg topology; migranci zastępują najgorszych agentów odbiorcy.
+    Seedy wysp z island_seeds(seed), a wymiana jest związana z numerem epoki, więc wynik nie zależy
+    od kolejności procesów: processes=False daje ten sam wynik w jednym procesie.
+    init: populacja startowa (warm start) rozdzielana między wyspy co n_islands-ty wiersz.
+    Zwraca (x, fitness) najlepszej wyspy; info dostaje history (best po wszystkich wyspach w epoce),
+    epochs_run, n_evals (suma), stop_reason, elite (najlepszej wyspy), n_islands i island_best (indeks wyspy).
+    """
+    if n_islands < 1:
+        raise ValueError(f"n_islands musi być >= 1, jest {n_islands}")
+    targets = topology_targets(topology, n_islands)
+    in_degree = max(len(s) for s in topology_sources(targets))
+    if interval > 0 and n_migrants * in_degree >= pop_size:
+        raise ValueError(f"Za dużo migrantów ({n_migrants} x {in_degree}) dla pop_size={pop_size}")
+    seeds = island_seeds(seed, n_islands)
+    inits = [None if init is None or not len(init[i::n_islands]) else init[i::n_islands] for i in range(n_islands)]
+
+    if processes and n_islands > 1:
+        out = _run_processes(ctx, optimizer, epochs, pop_size, seeds, params, inits, targets, interval,
+                             n_migrants, mp_context)
+    else:
+        out = _run_in_process(ctx, optimizer, epochs, pop_size, seeds, params, inits, targets, interval,
+                              n_migrants)
+
+    i, x, fitness, _, _, elite = min(out, key=lambda r: (r[2], r[0]))
+    if info is not None:
+        history = np.min([r[3] for r in out], axis=0)
+        info.update({"history": history, "epochs_run": len(history), "n_evals": sum(r[4] for r in out),
+                     "stop_reason": "epochs", "elite": elite, "n_islands": n_islands, "island_best": i})
+    return x, fitness
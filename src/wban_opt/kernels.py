@@ -0,0 +1,73 @@
+import numpy as np
+
+# Opcjonalny backend skompilowany (pip install wban_opt[fast]); bez numby wszystko liczy NumPy
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+# auto  - numba, jeśli zainstalowana i tabele (M, M) są zmaterializowane, inaczej numpy
+# numpy - zawsze wektorowo w NumPy (wersja referencyjna)
+# numba - jądro oceny z numba.prange po populacji (brak numby -> ImportError)
+BACKENDS = ("auto", "numpy", "numba")
+
+def resolve_backend(backend: str, dense_tables: bool) -> str:
+    """Backend faktycznie używany przez kontekst: "numpy" albo "numba"."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Nieznany backend: {backend}")
+    if backend == "numba":
+        if not HAVE_NUMBA:
+            raise ImportError("backend='numba' wymaga pakietu numba (pip install wban_opt[fast])")
+        if not dense_tables:
+            raise ValueError("backend='numba' wymaga tabel (M, M) (pula <= POOL_TABLE_MAX_M)")
+        return "numba"
+    if backend == "auto" and HAVE_NUMBA and dense_tables:
+        return "numba"
+    return "numpy"
+
+if HAVE_NUMBA:
+    @numba.njit(parallel=True, cache=True)
+    def _energy_penalty_kernel(sn, ch, dist_pool, e_tx_pool, uplink, bits, e_elec, e_agg, beta, d_max, weight):
+        P, N = sn.shape
+        K = ch.shape[1]
+        E = np.empty(P)
+        pen = np.empty(P)
+        for p in numba.prange(P):
+            counts = np.zeros(K)
+            e_sn = 0.0
+            viol = 0.0
+            for i in range(N):
+                s = sn[p, i]
+                # Najbliższy CH, remis -> najniższy indeks puli (jak assign_sensors_to_ch_idx)
+                best, d_best = 0, dist_pool[s, ch[p, 0]]
+                for j in range(1, K):
+                    d = dist_pool[s, ch[p, j]]
+                    if d < d_best or (d == d_best and ch[p, j] < ch[p, best]):
+                        best, d_best = j, d
+                counts[best] += 1.0
+                e_sn += e_tx_pool[s, ch[p, best]]
+                if d_best > d_max:
+                    viol += d_best - d_max
+            e_ch = 0.0
+            for j in range(K):
+                k_in = bits * counts[j]
+                e_ch += k_in * e_elec + k_in * e_agg + k_in * beta * uplink[p, j]
+            E[p] = bits * e_sn + e_ch
+            pen[p] = viol * weight
+        return E, pen
+
+def energy_penalty_numba(sn_idx: np.ndarray, ch_idx: np.ndarray, ctx) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Przypisanie + energia + kara jak energy_and_penalty_from_indices, w jednym przebiegu jądra numby.
+    sn_idx: (P, N) lub (N,), ch_idx: (P, K) lub (K,). Koszty uplinku liczy kontekst (także routing="relay").
+    Sumy są sekwencyjne (NumPy sumuje parami), więc zgodność do zaokrągleń, przypisanie identyczne.
+    """
+    ep = ctx.energy_params
+    sn, ch = np.atleast_2d(sn_idx), np.atleast_2d(ch_idx)
+    uplink = np.ascontiguousarray(ctx.uplink_costs(ch), dtype=np.float64)
+    E, P = _energy_penalty_kernel(sn.astype(np.int64), ch.astype(np.int64), ctx.dist_pool, ctx.e_tx_pool, uplink,
+                                  float(ep.packet_bits), float(ep.E_elec), float(ep.E_agg), float(ep.beta_agg),
+                                  float(ctx.d_max_sn_ch), float(ctx.penalty_weight))
+    return (E, P) if np.ndim(sn_idx) == 2 else (E[0], P[0])
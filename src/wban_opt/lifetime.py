@@ -0,0 +1,167 @@
+import numpy as np
+from dataclasses import dataclass
+from .objective import ObjectiveContext, bottleneck_and_penalty_from_indices, _decode_and_repair
+from .energy_model import calc_E_rx, calc_E_da
+from .routing import bellman_ford, next_hops, hop_energy
+
+@dataclass(frozen=True)
+class LifetimeResult:
+    fnd: np.ndarray          # (B,) runda śmierci pierwszego węzła (First Node Dies)
+    hnd: np.ndarray          # (B,) runda, w której nie żyje połowa węzłów (Half Nodes Die)
+    death_round: np.ndarray  # (B, N+K) runda śmierci węzła, -1 = przeżył
+    residual: np.ndarray     # (B, N+K) energia pozostała [J]
+    censored: np.ndarray     # (B,) HND nie osiągnięte w max_rounds (wtedy hnd = max_rounds)
+
+def _round_energy(alive, head, pos, dist_nodes, etx_nodes, up_gw, own, ctx):
+    """
+    Energia na rundę każdego węzła przy danym zbiorze głów (CH) -> ((B, D), najbliższa głowa (B, D)).
+    Węzły wysyłające (żywe, nie-głowy, generujące dane) nadają do najbliższej żywej głowy
+    (remis -> niższy indeks puli pos, jak w assign_sensors_to_ch_idx).
+    """
+    ep = ctx.energy_params
+    B, D = alive.shape
+    heads = head & alive
+    d = np.where(heads[:, None, :], dist_nodes, np.inf)
+    tie = d == d.min(axis=2, keepdims=True)
+    nearest = np.argmin(np.where(tie, pos[:, None, :], np.iinfo(pos.dtype).max), axis=2)
+    sender = alive & ~head & own
+
+    rows = np.arange(B)[:, None]
+    e = np.where(sender, ep.packet_bits * etx_nodes[rows, np.arange(D), nearest], 0.0)
+
+    flat = (rows * D + nearest)[sender]
+    received = np.bincount(flat, minlength=B * D).reshape(B, D)
+    # Głowa agreguje odebrane pakiety i (jeśli sama jest sensorem) własny, bez odbioru
+    k_rx = ep.packet_bits * received
+    k_in = ep.packet_bits * (received + (own & heads))
+    e_head = calc_E_rx(k_rx, ep) + calc_E_da(k_in, ep) + _uplink_energy(heads, pos, etx_nodes, up_gw,
+                                                                        k_in * ep.beta_agg, ctx)
+    return np.where(heads, e + e_head, e), nearest
+
+def _uplink_energy(heads, pos, etx_nodes, up_gw, out, ctx):
+    """
+    Energia wysyłki out bitów (B, D) z głów do bramki: bezpośrednio do najtańszej bramki, a przy
+    routing="relay" najtańszą trasą przez żywe głowy, z przeskokami płaconymi przez węzły, które je
+    wykonują (jak ObjectiveContext.uplink_energy dla zbioru CH).
+    """
+    if ctx.routing == "direct":
+        return out * up_gw
+    D = up_gw.shape[1]
+    E_elec = ctx.energy_params.E_elec
+    W = np.where(heads[:, None, :], etx_nodes + E_elec, np.inf)
+    W[:, np.arange(D), np.arange(D)] = np.inf
+    nxt = next_hops(W, bellman_ford(W, up_gw), up_gw, pos)
+    return hop_energy(etx_nodes, up_gw, nxt, out, E_elec)
+
+def _elect(alive, head, nearest, res):
+    """Rotacja: w każdym klastrze głową zostaje żywy węzeł z największą energią resztkową (remis -> niższy indeks)."""
+    B, D = alive.shape
+    label = np.where(head, np.arange(D), nearest)
+    member = (label[:, None, :] == np.arange(D)[None, :, None]) & alive[:, None, :]  # (B, klaster, węzeł)
+    key = np.where(member, res[:, None, :], -np.inf)
+    best = np.argmax(key, axis=2)
+    valid = head & member.any(axis=2)
+    new_head = np.zeros((B, D), dtype=bool)
+    rows, clusters = np.nonzero(valid)
+    new_head[rows, best[rows, clusters]] = True
+    return new_head
+
+def simulate_lifetime(sn_idx: np.ndarray, ch_idx: np.ndarray, ctx: ObjectiveContext,
+                      max_rounds: int = 100_000, rotation: bool = False, rotate_every: int = 100) -> LifetimeResult:
+    """
+    Symulacja rundowa czasu życia sieci dla wsadu rozmieszczeń: sn_idx (B, N), ch_idx (B, K).
+    Każdy węzeł startuje z E_init; w rundzie sensory wysyłają pakiet do najbliższej żywej głowy,
+    głowa odbiera, agreguje i wysyła do najtańszej bramki. Martwa głowa odpada, a jej sensory
+    przechodzą do najbliższej pozostałej.
+
+    rotation=True: co rotate_every rund (i po każdej śmierci) rola głowy w klastrze przechodzi
+    na żywy węzeł z największą energią resztkową.
+
+    Między zdarzeniami (śmierć, rotacja) konsumpcja jest stała, więc symulacja przeskakuje
+    od razu do następnego zdarzenia: liczba kroków ~ max_rounds / rotate_every + liczba śmierci,
+    a nie max_rounds. Przy routing="relay" głowa wysyła najtańszą trasą przez pozostałe żywe głowy
+    (trasy przeliczane po każdym zdarzeniu), a głowy-pośrednicy płacą RX i TX przekazywanego ruchu.
+    """
+    sn_idx, ch_idx = np.atleast_2d(sn_idx), np.atleast_2d(ch_idx)
+    B, N = sn_idx.shape
+    pos = np.concatenate([sn_idx, ch_idx], axis=1)
+    D = pos.shape[1]
+
+    dist_nodes = ctx.dist_pool[pos[:, :, None], pos[:, None, :]]  # (B, D, D)
+    etx_nodes = ctx.e_tx_pool[pos[:, :, None], pos[:, None, :]]
+    up = ctx.e_tx_gw[pos]
+    own = np.zeros((B, D), dtype=bool)
+    own[:, :N] = True
+
+    res = np.full((B, D), float(ctx.energy_params.E_init))
+    alive = np.ones((B, D), dtype=bool)
+    head = ~own
+    t = np.zeros(B, dtype=np.int64)
+    fnd = np.full(B, -1, dtype=np.int64)
+    hnd = np.full(B, -1, dtype=np.int64)
+    death = np.full((B, D), -1, dtype=np.int64)
+    n_half = (D + 1) // 2
+    active = np.ones(B, dtype=bool)
+
+    e, nearest = _round_energy(alive, head, pos, dist_nodes, etx_nodes, up, own, ctx)
+    while active.any():
+        # Bez żywej głowy nikt nie dostarcza danych -> sieć martwa
+        down = active & ~(head & alive).any(axis=1)
+        if down.any():
+            death = np.where(down[:, None] & alive, t[:, None], death)
+            alive[down] = False
+            fnd[down & (fnd < 0)] = t[down & (fnd < 0)]
+            hnd[down] = t[down]
+            active &= ~down
+            if not active.any():
+                break
+
+        # Liczba pełnych rund, na które stać każdy węzeł przy obecnej konsumpcji
+        with np.errstate(divide='ignore', invalid='ignore'):
+            left = np.where(e > 0, np.floor(res / e), np.inf)
+        step = left.min(axis=1)
+        if rotation:
+            step = np.minimum(step, rotate_every - t % rotate_every)
+        step = np.minimum(step, max_rounds - t)
+        step = np.where(active, step, 0).astype(np.int64)
+
+        res -= step[:, None] * e
+        t += step
+        dying = active[:, None] & alive & (e > 0) & (res < e)
+        death = np.where(dying, t[:, None], death)
+        alive &= ~dying
+        np.maximum(res, 0.0, out=res)
+
+        n_dead = D - alive.sum(axis=1)
+        first = active & (fnd < 0) & (n_dead > 0)
+        fnd[first] = t[first]
+        half = active & (n_dead >= n_half)
+        hnd[half] = t[half]
+        active &= ~half & (t < max_rounds)
+
+        if rotation:
+            elect = active & ((t % rotate_every == 0) | dying.any(axis=1))
+            if elect.any():
+                head = np.where(elect[:, None], _elect(alive, head, nearest, res), head)
+        head &= alive
+        e, nearest = _round_energy(alive, head, pos, dist_nodes, etx_nodes, up, own, ctx)
+
+    censored = hnd < 0
+    fnd[fnd < 0] = max_rounds
+    hnd[censored] = max_rounds
+    return LifetimeResult(fnd=fnd, hnd=hnd, death_round=death, residual=res, censored=censored)
+
+def simulate_lifetime_from_x(X: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator = None,
+                             **kwargs) -> LifetimeResult:
+    """Jak simulate_lifetime, ale dla x (N+K,) lub X (P, N+K) - decode + repair jak w funkcji celu."""
+    clean = np.atleast_2d(_decode_and_repair(X, ctx, rng, batch=np.ndim(X) == 2))
+    return simulate_lifetime(clean[:, :ctx.N], clean[:, ctx.N:], ctx, **kwargs)
+
+def fnd_closed_form(sn_idx: np.ndarray, ch_idx: np.ndarray, ctx: ObjectiveContext,
+                    rotation: bool = False) -> np.ndarray:
+    """
+    FND w formie zamkniętej: E_init / energia na rundę węzła-wąskiego gardła.
+    Bez rotacji równe FND z simulate_lifetime; z rotacją - przybliżenie idealnego wyrównania w klastrze.
+    """
+    E_max, _ = bottleneck_and_penalty_from_indices(sn_idx, ch_idx, ctx, rotation=rotation)
+    return np.floor(ctx.energy_params.E_init / E_max).astype(np.int64)
@@ -0,0 +1,101 @@
+import numpy as np
+from .objective import ObjectiveContext
+from .incremental import IncrementalEvaluator, MoveSN, MoveCH, SwapRoles
+
+def indices_to_x(indices: np.ndarray, M: int) -> np.ndarray:
+    """Odwrotność decode_to_indices: środek przedziału każdego indeksu w [0, 1]."""
+    return (np.asarray(indices) + 0.5) / M
+
+def _ch_free(state: IncrementalEvaluator) -> np.ndarray:
+    """Wolne pozycje dla CH (przy ctx.feasibility tylko kandydaci bez zastępcy)."""
+    free = state.free_indices()
+    tables = state.ctx.feas_tables
+    return free if tables is None else np.intersect1d(free, tables.ch_candidates, assume_unique=True)
+
+def _local_search(state: IncrementalEvaluator, rng: np.random.Generator, n_evals: int, max_evals: int) -> int:
+    """
+    First-improvement po ruchach SN -> wolny punkt, CH -> wolny punkt oraz zamianie ról SN <-> CH.
+    Każda oceniona delta liczy się jako jedna ewaluacja. Zwraca zaktualizowany licznik.
+    """
+    N, K = len(state.sn), len(state.ch)
+    improved = True
+    while improved and n_evals < max_evals:
+        improved = False
+        # Próg względny, żeby szum zmiennoprzecinkowy nie dawał pozornych popraw
+        tol = 1e-12 * abs(state.fitness)
+
+        for i in rng.permutation(N):
+            free = state.free_indices()
+            if free.size == 0 or n_evals >= max_evals:
+                return n_evals
+            free = free[:max_evals - n_evals]
+            deltas = state.delta_sn_all(i, free)
+            n_evals += len(free)
+            k = int(np.argmin(deltas))
+            if deltas[k] < -tol:
+                state.apply_move(MoveSN(i, free[k]))
+                improved = True
+
+        for j in rng.permutation(K):
+            for q in rng.permutation(_ch_free(state)):
+                if n_evals >= max_evals:
+                    return n_evals
+                n_evals += 1
+                move = MoveCH(j, q)
+                if state.delta(move) < -tol:
+                    state.apply_move(move)
+                    improved = True
+                    break
+
+        for j in rng.permutation(K):
+            for i in rng.permutation(N):
+                if n_evals >= max_evals:
+                    return n_evals
+                n_evals += 1
+                move = SwapRoles(i, j)
+                if state.delta(move) < -tol:
+                    state.apply_move(move)
+                    improved = True
+                    break
+    return n_evals
+
+def solve_ls(ctx: ObjectiveContext, max_evals: int, seed: int = None, perturb_moves: int = 2):
+    """
+    Natywny solver kombinatoryczny (iterated local search) działający wprost na zbiorach indeksów,
+    bez kodowania ciągłego i repair. Ruchy oceniane przyrostowo (IncrementalEvaluator).
+    Zwraca (x, fitness) jak solve_ga / solve_pso; x dekoduje się dokładnie do znalezionych indeksów.
+    Delty są liczone dla sumy energii, więc wymaga ctx.objective == "energy".
+    """
+    if ctx.objective != "energy":
+        raise ValueError(f"solve_ls obsługuje tylko funkcję celu 'energy' (jest '{ctx.objective}')")
+    rng = np.random.default_rng(seed)
+    M = ctx.points_pool.shape[0]
+    N, D = ctx.N, ctx.get_D()
+
+    tables = ctx.feas_tables
+    idx = rng.choice(M, D, replace=False) if tables is None else tables.sample(ctx.K, rng)
+    state = IncrementalEvaluator(ctx, idx[:N], idx[N:])
+    n_evals = 1
+    best_sn, best_ch, best_fit = state.sn.copy(), state.ch.copy(), state.fitness
+
+    while n_evals < max_evals:
+        n_evals = _local_search(state, rng, n_evals, max_evals)
+        if state.fitness < best_fit:
+            best_sn, best_ch, best_fit = state.sn.copy(), state.ch.copy(), state.fitness
+
+        # Perturbacja najlepszego: kilka losowych przeniesień na wolne punkty
+        state = IncrementalEvaluator(ctx, best_sn, best_ch)
+        free = state.free_indices()
+        if free.size == 0:
+            break
+        for _ in range(perturb_moves):
+            pos = rng.integers(D)
+            free = state.free_indices() if pos < N else _ch_free(state)
+            if free.size == 0:
+                continue
+            q = rng.choice(free)
+            state.apply_move(MoveSN(pos, q) if pos < N else MoveCH(pos - N, q))
+        n_evals += 1
+
+    x = indices_to_x(np.concatenate([best_sn, best_ch]), M)
+    return x, best_fit
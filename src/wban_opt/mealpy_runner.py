@@ -1,47 +1,332 @@
+import time
 import numpy as np
+import mealpy
 from mealpy.evolutionary_based import GA
 from mealpy.swarm_based import PSO
 from mealpy import FloatVar  # <--- Kluczowy import dla Mealpy 3.x
+from mealpy.utils.agent import Agent
+from mealpy.utils.target import Target
 
-from .objective import ObjectiveContext, objective_from_x
+from .objective import ObjectiveContext, objective_from_x, objective_batch, _decode_and_repair
+from .cache import FitnessCache
+from .surrogate import SurrogateScreen, SURROGATE_KEYS
+from . import profiling
 
-def solve_ga(ctx: ObjectiveContext, epochs: int, pop_size: int, seed: int = None):
+
+class _BatchEvalMixin:
+    """
+    Ocenia całą populację jednym wywołaniem objective_batch zamiast agent po agencie.
+    Działa w trybie 'swarm' Mealpy (sekwencyjna ocena po wygenerowaniu pokolenia).
+    initial_solutions: opcjonalne (P0, D) pierwsze rozwiązania populacji startowej (warm start);
+    reszta losowana jak zwykle. Zamiast starting_solutions z Mealpy, które pomija generate_agent
+    (np. PSO nie dostaje wtedy local_target).
+    """
+    batch_obj_func = None
+    initial_solutions = None
+
+    def evaluate_batch(self, pop):
+        X = np.array([agent.solution for agent in pop])
+        fits = self.batch_obj_func(X)
+        for agent, fit in zip(pop, fits):
+            agent.target = Target(objectives=fit, weights=self.problem.obj_weights)
+        self.nfe_counter += len(pop)
+        return pop
+
+    def update_target_for_population(self, pop=None):
+        if self.mode != "swarm" or self.batch_obj_func is None:
+            return super().update_target_for_population(pop)
+        return self.evaluate_batch(pop)
+
+    def generate_population(self, pop_size: int = None):
+        if pop_size is None:
+            pop_size = self.pop_size
+        # Rozwiązania startowe tylko w pierwszej populacji (niektóre algorytmy losują populacje także w trakcie)
+        init = [] if self.initial_solutions is None else list(self.initial_solutions[:pop_size])
+        self.initial_solutions = None
+        rest = [None] * (pop_size - len(init))
+        if self.mode != "swarm" or self.batch_obj_func is None:
+            if not init:
+                return super().generate_population(pop_size)
+            return [self.generate_agent(np.array(sol, dtype=float)) for sol in init + rest]
+        pop = [self.generate_empty_agent(None if sol is None else np.array(sol, dtype=float)) for sol in init + rest]
+        return self.evaluate_batch(pop)
+
+
+# Kryteria stopu Mealpy (tag w Termination.message) -> stop_reason w wyniku
+_STOP_REASONS = {"(MG)": "epochs", "(FE)": "max_fe", "(TB)": "max_time", "(ES)": "no_improve"}
+# Klucze słownika stop (reszta jak w mealpy.utils.termination.Termination)
+STOP_KEYS = ("max_early_stop", "epsilon", "target_fitness", "max_fe", "max_time")
+
+
+class _EarlyStopMixin:
+    """
+    Dokłada do kryteriów Termination docelową wartość fitness (target_fitness)
+    i zapamiętuje, które kryterium zakończyło przebieg.
+    Wszystkie kryteria sprawdzane są na końcu epoki (max_fe może zostać przekroczone o < pop_size).
+    """
+    target_fitness = None
+    stop_reason = "epochs"
+
+    def check_termination(self, mode="start", termination=None, epoch=None):
+        finished = super().check_termination(mode, termination, epoch)
+        if mode == "start":
+            return finished
+        if finished:
+            tag = next((t for t in _STOP_REASONS if t in self.termination.message), None)
+            self.stop_reason = _STOP_REASONS.get(tag, "epochs")
+        elif self.target_fitness is not None and self.g_best.target.fitness <= self.target_fitness:
+            self.stop_reason = "target"
+            finished = True
+        return finished
+
+
+class BatchGA(_EarlyStopMixin, _BatchEvalMixin, GA.BaseGA):
+    pass
+
+
+class BatchPSO(_EarlyStopMixin, _BatchEvalMixin, PSO.OriginalPSO):
+    """
+    OriginalPSO z oceną całego roju naraz.
+    g_best nie zmienia się w trakcie epoki, więc wynik jest taki sam jak przy ocenie po kolei
+    (kolejność losowań generatora zostaje zachowana).
+    """
+
+    def generate_population(self, pop_size: int = None):
+        pop = super().generate_population(pop_size)
+        for agent in pop:
+            agent.local_target = agent.target.copy()
+        return pop
+
+    def evolve(self, epoch):
+        if self.mode != "swarm" or self.batch_obj_func is None:
+            return super().evolve(epoch)
+
+        pos_list = []
+        for idx in range(0, self.pop_size):
+            cognitive = self.c1 * self.generator.random(self.problem.n_dims) * (self.pop[idx].local_solution - self.pop[idx].solution)
+            social = self.c2 * self.generator.random(self.problem.n_dims) * (self.g_best.solution - self.pop[idx].solution)
+            self.pop[idx].velocity = self.w * self.pop[idx].velocity + cognitive + social
+            pos_new = self.pop[idx].solution + self.pop[idx].velocity
+            pos_list.append(self.correct_solution(pos_new))
+
+        # Agent() zamiast generate_empty_agent(): ten drugi losuje prędkość i przesunąłby generator
+        pop_new = self.evaluate_batch([Agent(solution=pos) for pos in pos_list])
+        for idx in range(0, self.pop_size):
+            pos_new, target = pop_new[idx].solution, pop_new[idx].target
+            if self.compare_target(target, self.pop[idx].target, self.problem.minmax):
+                self.pop[idx].update(solution=pos_new.copy(), target=target.copy())
+            if self.compare_target(target, self.pop[idx].local_target, self.problem.minmax):
+                self.pop[idx].update(local_solution=pos_new.copy(), local_target=target.copy())
+
+
+# Klasy z ręcznie wektoryzowaną epoką; pozostałe optymalizatory dostają tylko mixiny
+_BATCH_CLASSES = {GA.BaseGA: BatchGA, PSO.OriginalPSO: BatchPSO}
+
+def optimizer_class(name: str) -> type:
+    """
+    Klasa optymalizatora Mealpy po nazwie "MODUŁ.Klasa" (np. "DE.OriginalDE", "GWO.OriginalGWO")
+    z ocenianiem wsadowym populacji i kryteriami stopu.
+    Dla optymalizatorów, które w trybie 'swarm' oceniają agentów pojedynczo, wsad po prostu nie działa.
+    """
+    module_name, _, cls_name = name.partition(".")
+    base = getattr(getattr(mealpy, module_name, None), cls_name, None)
+    if not (isinstance(base, type) and issubclass(base, mealpy.Optimizer)):
+        raise ValueError(f"Nieznany optymalizator Mealpy: {name!r} (oczekiwano np. 'GA.BaseGA')")
+    cls = _BATCH_CLASSES.get(base)
+    if cls is None:
+        cls = type(f"Batch{cls_name}", (_EarlyStopMixin, _BatchEvalMixin, base), {})
+        _BATCH_CLASSES[base] = cls
+    return cls
+
+def _make_problem(ctx: ObjectiveContext, rng: np.random.Generator = None, cache: FitnessCache = None) -> dict:
     D = ctx.get_D()
-    
+
     # W Mealpy 3.x musimy zdefiniować bounds jako obiekt FloatVar
     bounds = FloatVar(lb=[0.0] * D, ub=[1.0] * D, name="wban_search_space")
-    
+
     # Definicja problemu dla Mealpy 3.x
     # Zmieniamy też klucz 'fit_func' na 'obj_func', co jest standardem w nowej wersji
-    problem_dict = {
-        "obj_func": lambda x: objective_from_x(x, ctx),
+    return {
+        "obj_func": lambda x: objective_from_x(x, ctx, rng, cache),
         "bounds": bounds,
         "minmax": "min",
         "log_to": None, # Wyłącz logowanie do pliku/konsoli
     }
 
-    # Model GA
-    model = GA.BaseGA(epoch=epochs, pop_size=pop_size)
-    
-    # Rozwiązanie
-    best_agent = model.solve(problem_dict, seed=seed)
-    
+def _termination(epochs: int, stop: dict) -> dict:
+    """Słownik Termination dla Mealpy; bez kryteriów stopu przebieg trwa `epochs` epok jak dotąd."""
+    unknown = set(stop) - set(STOP_KEYS)
+    if unknown:
+        raise ValueError(f"Nieznane kryteria stopu: {sorted(unknown)}")
+    term = {k: stop[k] for k in ("max_early_stop", "max_fe", "max_time", "epsilon") if stop.get(k) is not None}
+    term["max_epoch"] = epochs
+    return term
+
+def _elite(model, ctx: ObjectiveContext, n_elite: int, seed: int = None) -> np.ndarray:
+    """
+    Najlepsze rozwiązania jako indeksy puli (n <= n_elite, N+K), bez powtórzeń: g_best
+    (nie musi już być w populacji, np. w GA), potem końcowa populacja od najlepszego.
+    """
+    pop = [model.g_best] + sorted(model.pop, key=lambda agent: agent.target.fitness)
+    X = np.array([agent.solution for agent in pop])
+    idx = _decode_and_repair(X, ctx, np.random.default_rng(seed), batch=True)
+    _, first = np.unique(idx, axis=0, return_index=True)
+    return idx[np.sort(first)[:n_elite]]
+
+def _surrogate_screen(ctx: ObjectiveContext, surrogate: dict, true_fn, seed: int = None) -> SurrogateScreen:
+    unknown = set(surrogate) - set(SURROGATE_KEYS)
+    if unknown:
+        raise ValueError(f"Nieznane parametry surrogate: {sorted(unknown)}")
+    # Osobny generator: dekodowanie cech nie przesuwa generatora repair prawdziwej oceny
+    feat_rng = np.random.default_rng(seed)
+    return SurrogateScreen(true_fn, lambda X: _decode_and_repair(X, ctx, feat_rng, batch=True),
+                           ctx.points_pool, ctx.N, **surrogate)
+
+def _solve(model, ctx: ObjectiveContext, seed: int = None, batch: bool = True, cache: FitnessCache = None,
+           stop: dict = None, info: dict = None, init: np.ndarray = None, n_elite: int = 5,
+           surrogate: dict = None):
+    """
+    stop: opcjonalne kryteria wcześniejszego zakończenia (STOP_KEYS): max_early_stop (epoki bez poprawy
+    większej niż epsilon), target_fitness, max_fe (liczba ewaluacji), max_time (s, zegar ścienny).
+    info: jeśli podany, dostaje history (best fitness po każdej epoce, float64),
+    epochs_run, n_evals, stop_reason oraz elite (n_elite najlepszych rozmieszczeń jako indeksy puli).
+    init: opcjonalne (P0, D) rozwiązania startowe w [0, 1] (warm start), P0 <= pop_size.
+    surrogate: opcjonalne parametry preselekcji k-NN (SURROGATE_KEYS, patrz surrogate.SurrogateScreen);
+    wymaga batch=True. info dostaje wtedy n_true_evals, n_surrogate_skips i surrogate_trace
+    ((T, 2): prawdziwe oceny, best po każdym wsadzie); n_evals liczy także kandydatów tylko przewidzianych.
+    """
+    stop = stop or {}
+    model.initial_solutions = init
+    model.target_fitness = stop.get("target_fitness")
+    # Repair w funkcji celu losuje z generatora zasianego tym samym seedem co Mealpy,
+    # więc przebieg jest powtarzalny (także w innym procesie)
+    rng = np.random.default_rng(seed)
+    problem_dict = _make_problem(ctx, rng, cache)
+    # Przy aktywnym profilowaniu: czas całego solve; narzut Mealpy = solve - etapy funkcji celu
+    prof = profiling._ACTIVE
+    termination = _termination(model.epoch, stop)
+    t0 = time.perf_counter()
+    screen = None
+    if surrogate is not None:
+        if not batch:
+            raise ValueError("Tryb surrogate wymaga batch=True")
+        screen = _surrogate_screen(ctx, surrogate, lambda X: objective_batch(X, ctx, rng, cache), seed)
+    if batch:
+        # Całe pokolenie oceniane jednym wektorowym przebiegiem (opcjonalnie z preselekcją surrogate)
+        model.batch_obj_func = screen or (lambda X: objective_batch(X, ctx, rng, cache))
+        best_agent = model.solve(problem_dict, mode="swarm", termination=termination, seed=seed)
+    else:
+        best_agent = model.solve(problem_dict, termination=termination, seed=seed)
+    if prof is not None:
+        prof.solver_time += time.perf_counter() - t0
+
+    if info is not None:
+        history = np.array([agent.target.fitness for agent in model.history.list_global_best], dtype=np.float64)
+        info.update({"history": history, "epochs_run": len(history),
+                     "n_evals": int(model.nfe_counter), "stop_reason": model.stop_reason,
+                     "elite": _elite(model, ctx, n_elite, seed)})
+        if screen is not None:
+            info.update(screen.stats())
+            info["surrogate_trace"] = np.array(screen.trace, dtype=np.float64)
+
     return best_agent.solution, best_agent.target.fitness
 
-def solve_pso(ctx: ObjectiveContext, epochs: int, pop_size: int, seed: int = None):
-    D = ctx.get_D()
-    
-    bounds = FloatVar(lb=[0.0] * D, ub=[1.0] * D, name="wban_search_space")
-    
-    problem_dict = {
-        "obj_func": lambda x: objective_from_x(x, ctx),
-        "bounds": bounds,
-        "minmax": "min",
-        "log_to": None,
-    }
+def solve_mealpy(ctx: ObjectiveContext, optimizer: str, epochs: int, pop_size: int, seed: int = None,
+                 batch: bool = True, cache: FitnessCache = None, stop: dict = None, info: dict = None,
+                 params: dict = None, init: np.ndarray = None, surrogate: dict = None):
+    """Dowolny optymalizator Mealpy ("MODUŁ.Klasa") z hiperparametrami params; zwraca (x, fitness)."""
+    model = optimizer_class(optimizer)(epoch=epochs, pop_size=pop_size, **(params or {}))
+    return _solve(model, ctx, seed, batch, cache, stop, info, init, surrogate=surrogate)
+
+def solve_ga(ctx: ObjectiveContext, epochs: int, pop_size: int, seed: int = None, batch: bool = True,
+             cache: FitnessCache = None, stop: dict = None, info: dict = None, init: np.ndarray = None,
+             surrogate: dict = None):
+    return solve_mealpy(ctx, "GA.BaseGA", epochs, pop_size, seed, batch, cache, stop, info, init=init,
+                        surrogate=surrogate)
+
+def solve_pso(ctx: ObjectiveContext, epochs: int, pop_size: int, seed: int = None, batch: bool = True,
+              cache: FitnessCache = None, stop: dict = None, info: dict = None, init: np.ndarray = None,
+              surrogate: dict = None):
+    return solve_mealpy(ctx, "PSO.OriginalPSO", epochs, pop_size, seed, batch, cache, stop, info, init=init,
+                        surrogate=surrogate)
+
+
+class MealpyStepper:
+    """
+    Przebieg Mealpy wykonywany epoka po epoce (jak pętla Optimizer.solve), żeby kilka
+    optymalizatorów mogło dzielić czas (portfolio). Kolejne step() dają ten sam wynik
+    co solve() z tą samą liczbą epok.
+    """
+
+    def __init__(self, ctx: ObjectiveContext, optimizer: str, epochs: int, pop_size: int, seed: int = None,
+                 batch: bool = True, cache: FitnessCache = None, params: dict = None, init: np.ndarray = None):
+        self.model = optimizer_class(optimizer)(epoch=epochs, pop_size=pop_size, **(params or {}))
+        self.model.initial_solutions = init
+        self.batch = batch
+        rng = np.random.default_rng(seed)
+        mode = "single"
+        if batch:
+            self.model.batch_obj_func = lambda X: objective_batch(X, ctx, rng, cache)
+            mode = "swarm"
+        model = self.model
+        model.check_problem(_make_problem(ctx, rng, cache), seed)
+        model.check_mode_and_workers(mode, None)
+        model.check_termination("start", None, None)
+        model.initialize_variables()
+        model.before_initialization(None)
+        model.initialization()
+        model.after_initialization()
+        model.before_main_loop()
+        self.epoch = 0
+        self.history = []
+
+    @property
+    def done(self) -> bool:
+        return self.epoch >= self.model.epoch
+
+    @property
+    def best_fitness(self) -> float:
+        return self.model.g_best.target.fitness
+
+    def step(self):
+        """Jedna epoka; zwraca best fitness po niej."""
+        model = self.model
+        self.epoch += 1
+        t0 = time.perf_counter()
+        model.evolve(self.epoch)
+        pop_temp, model.g_best = model.update_global_best_agent(model.pop)
+        if model.sort_flag:
+            model.pop = pop_temp
+        model.track_optimize_step(model.pop, self.epoch, time.perf_counter() - t0)
+        self.history.append(self.best_fitness)
+        return self.best_fitness
+
+    def best(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """n najlepszych agentów populacji: (X (n, D), fitness (n,))."""
+        pop = self.model.get_sorted_population(self.model.pop, self.model.problem.minmax)[:n]
+        return np.array([agent.solution for agent in pop]), np.array([agent.target.fitness for agent in pop])
+
+    def replace_worst(self, X: np.ndarray):
+        """
+        Migranci: len(X) najgorszych agentów zastąpionych rozwiązaniami X (ocenianymi tutaj,
+        więc liczą się do ewaluacji tej populacji). g_best aktualizowany, historia epok bez zmian.
+        """
+        model = self.model
+        if self.batch:
+            agents = model.evaluate_batch([model.generate_empty_agent(np.array(x, dtype=float)) for x in X])
+        else:
+            agents = [model.generate_agent(np.array(x, dtype=float)) for x in X]
+        for agent in agents:
+            if hasattr(agent, "local_solution"):  # PSO: migrant startuje z własnym najlepszym położeniem
+                agent.local_target = agent.target.copy()
+        worst = np.argsort([agent.target.fitness for agent in model.pop], kind='stable')[::-1]
+        for pos, agent in zip(worst, agents):
+            model.pop[pos] = agent
+        if model.sort_flag:
+            model.pop = model.get_sorted_population(model.pop, model.problem.minmax)
+        best = min(agents, key=lambda agent: agent.target.fitness)
+        if best.target.fitness < model.g_best.target.fitness:
+            model.g_best = best.copy()
 
-    # Model PSO
-    model = PSO.OriginalPSO(epoch=epochs, pop_size=pop_size)
-    best_agent = model.solve(problem_dict, seed=seed)
-    
-    return best_agent.solution, best_agent.target.fitness
\ No newline at end of file
+    def result(self):
+        return self.model.g_best.solution, self.model.g_best.target.fitness
@@ -4,4 +4,24 @@ def feasible_rate(series: pd.Series) -> float:
     """Zwraca odsetek (0-1) wartości True w serii."""
     if len(series) == 0:
         return 0.0
-    return series.sum() / len(series)
\ No newline at end of file
+    return series.sum() / len(series)
+
+
+def feasible_rates(store_path: str, by: tuple = ("scenario", "gw", "algorithm")) -> pd.Series:
+    """
+    Odsetek rozwiązań feasible per grupa, liczony z magazynu wyników
+    (uwzględnia także rekordy z przerwanych przebiegów).
+    """
+    from .results_store import ResultsStore
+
+    # Porcjami: z magazynu czytane są tylko kolumny grupujące i feas
+    n_feas, n_all = None, None
+    with ResultsStore(store_path) as store:
+        for chunk in store.iter_df([*by, "feas"]):
+            grouped = chunk.groupby(list(by))["feas"]
+            part_feas, part_all = grouped.apply(feasible_rate) * grouped.size(), grouped.size()
+            n_feas = part_feas if n_feas is None else n_feas.add(part_feas, fill_value=0)
+            n_all = part_all if n_all is None else n_all.add(part_all, fill_value=0)
+    if n_all is None:
+        return pd.Series(dtype=float)
+    return (n_feas / n_all).rename("feas")
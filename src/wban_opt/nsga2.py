@@ -0,0 +1,78 @@
+import numpy as np
+from .objective import ObjectiveContext, objectives_from_indices, _decode_and_repair, MO_OBJECTIVES
+from .pareto import ParetoArchive, non_dominated_sort, crowding_distance
+
+def _evaluate(X: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator):
+    """X (P, D) -> (F (P, 3), CV (P,), indeksy puli po repair (P, D))."""
+    clean = _decode_and_repair(X, ctx, rng, batch=True)
+    F, CV = objectives_from_indices(clean[:, :ctx.N], clean[:, ctx.N:], ctx)
+    return F, CV, clean
+
+def _rank_and_crowding(F: np.ndarray, CV: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    rank = non_dominated_sort(F, CV)
+    crowd = np.zeros(len(F))
+    for r in np.unique(rank):
+        front = np.flatnonzero(rank == r)
+        crowd[front] = crowding_distance(F[front])
+    return rank, crowd
+
+def _tournament(rank, crowd, n, rng) -> np.ndarray:
+    """Turniej binarny: niższy front, przy remisie większa odległość zatłoczenia."""
+    a, b = rng.integers(len(rank), size=(2, n))
+    a_wins = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (crowd[a] >= crowd[b]))
+    return np.where(a_wins, a, b)
+
+def _sbx(P1, P2, rng, eta: float, p_c: float) -> tuple[np.ndarray, np.ndarray]:
+    """Simulated binary crossover w [0, 1]^D (wektorowo po całym pokoleniu)."""
+    u = rng.random(P1.shape)
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta + 1)), (1 / (2 * (1 - u))) ** (1 / (eta + 1)))
+    cross = rng.random(P1.shape[0]) < p_c
+    beta = np.where(cross[:, None] & (rng.random(P1.shape) < 0.5), beta, 1.0)
+    C1 = 0.5 * ((1 + beta) * P1 + (1 - beta) * P2)
+    C2 = 0.5 * ((1 - beta) * P1 + (1 + beta) * P2)
+    return np.clip(C1, 0.0, 1.0), np.clip(C2, 0.0, 1.0)
+
+def _poly_mutation(X, rng, eta: float, p_m: float) -> np.ndarray:
+    """Mutacja wielomianowa w [0, 1]^D."""
+    u = rng.random(X.shape)
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta + 1)))
+    mutate = rng.random(X.shape) < p_m
+    return np.clip(X + np.where(mutate, delta, 0.0), 0.0, 1.0)
+
+def solve_nsga2(ctx: ObjectiveContext, epochs: int, pop_size: int, seed: int = None,
+                archive: ParetoArchive = None, eta_c: float = 15.0, eta_m: float = 20.0,
+                p_c: float = 0.9) -> ParetoArchive:
+    """
+    NSGA-II na kodowaniu ciągłym [0, 1]^D (decode + repair jak w GA / PSO), cele wg MO_OBJECTIVES.
+    Każde ocenione pokolenie trafia do archiwum Pareto (items = indeksy puli SN + CH po repair).
+    Zwraca archiwum.
+    """
+    rng = np.random.default_rng(seed)
+    # Repair z osobnego generatora zasianego seedem, jak w mealpy_runner._solve
+    repair_rng = np.random.default_rng(seed)
+    D = ctx.get_D()
+    if archive is None:
+        archive = ParetoArchive(len(MO_OBJECTIVES))
+
+    X = rng.random((pop_size, D))
+    F, CV, clean = _evaluate(X, ctx, repair_rng)
+    archive.update(F, CV, clean)
+    rank, crowd = _rank_and_crowding(F, CV)
+
+    n_pairs = (pop_size + 1) // 2
+    for _ in range(epochs):
+        parents = _tournament(rank, crowd, 2 * n_pairs, rng)
+        C1, C2 = _sbx(X[parents[:n_pairs]], X[parents[n_pairs:]], rng, eta_c, p_c)
+        Y = _poly_mutation(np.concatenate([C1, C2])[:pop_size], rng, eta_m, 1.0 / D)
+        F_y, CV_y, clean_y = _evaluate(Y, ctx, repair_rng)
+        archive.update(F_y, CV_y, clean_y)
+
+        # Selekcja środowiskowa z rodziców i potomków: fronty, a w ostatnim - zatłoczenie
+        X_all = np.concatenate([X, Y])
+        F_all = np.concatenate([F, F_y])
+        CV_all = np.concatenate([CV, CV_y])
+        rank_all, crowd_all = _rank_and_crowding(F_all, CV_all)
+        order = np.lexsort((-crowd_all, rank_all))[:pop_size]
+        X, F, CV, rank, crowd = X_all[order], F_all[order], CV_all[order], rank_all[order], crowd_all[order]
+
+    return archive
@@ -1,82 +1,330 @@
+import time
 import numpy as np
-from dataclasses import dataclass
-from .geometry import points_to_numpy, pairwise_dist
-from .assignment import assign_sensors_to_ch
-from .energy_model import EnergyParams, calc_E_tx, calc_E_rx, calc_E_da
-from .penalties import penalty_range_sn_ch
-from .repair import decode_to_indices, repair_unique
+from dataclasses import dataclass, field
+from .geometry import pairwise_dist, PairwiseOnDemand, PoolIndex
+from .assignment import assign_sensors_to_ch_idx, KDTREE_MIN_K
+from .energy_model import EnergyParams, calc_E_tx_array, calc_E_rx, calc_E_da
+from .penalties import penalty_range_from_dists
+from .repair import decode_to_indices, repair_unique, repair_unique_batch, RepairWorkspace
+from .cache import FitnessCache
+from .routing import ROUTING_MODES, RouteCache, relay_costs, relay_energy
+from .feasibility import FeasibilityTables
+from .kernels import resolve_backend, energy_penalty_numba
+from . import profiling
+
+# Powyżej tego rozmiaru puli tabele (M, M) nie są materializowane, tylko liczone na żądanie
+POOL_TABLE_MAX_M = 4096
+
+# energy            - suma energii sieci na rundę
+# lifetime          - energia na rundę najbardziej obciążonego węzła (~ E_init / FND, bez rotacji CH)
+# lifetime_rotation - jw. przy idealnej rotacji CH w klastrze (energia klastra / liczba jego węzłów)
+OBJECTIVES = ("energy", "lifetime", "lifetime_rotation")
 
 @dataclass(frozen=True)
 class ObjectiveContext:
     points_pool: np.ndarray  # (M, 2)
     N: int
     K: int
-    gw_xy: np.ndarray        # (1, 2)
+    gw_xy: np.ndarray        # (G, 2) - jedna lub kilka bramek; CH wysyła do najtańszej
     energy_params: EnergyParams
     d_max_sn_ch: float
     penalty_weight: float
-    
+    repair_strategy: str = "hash"  # patrz repair.REPAIR_STRATEGIES; "random" -> funkcja celu zaszumiona
+    spatial_index: bool = True     # KD-tree nad pulą do przypisania SN -> CH, gdy K >= KDTREE_MIN_K
+    routing: str = "direct"        # patrz routing.ROUTING_MODES
+    objective: str = "energy"      # patrz OBJECTIVES
+    feasibility: bool = False      # wstępne tabele zasięgu (feasibility.py): zastępowalne pozycje CH + naprawa zasięgu SN
+    point_region: np.ndarray = None  # (M,) kody regionów punktów (PointPool.region); None -> jeden region
+    backend: str = "auto"          # patrz kernels.BACKENDS; wynik wyboru w kernel_backend
+
+    # Tabele liczone raz w __post_init__ (wszystkie pozycje pochodzą z points_pool)
+    dist_pool: np.ndarray = field(init=False, repr=False, compare=False)  # (M, M)
+    e_tx_pool: np.ndarray = field(init=False, repr=False, compare=False)  # (M, M) energia TX na bit
+    dist_gw: np.ndarray = field(init=False, repr=False, compare=False)    # (M, G)
+    gw_choice: np.ndarray = field(init=False, repr=False, compare=False)  # (M,) indeks najtańszej bramki
+    e_tx_gw: np.ndarray = field(init=False, repr=False, compare=False)    # (M,) energia TX na bit do niej
+    route_cache: RouteCache = field(init=False, repr=False, compare=False)  # tylko dla routing="relay"
+    repair_ws: RepairWorkspace = field(init=False, repr=False, compare=False)
+    pool_index: PoolIndex = field(init=False, repr=False, compare=False)  # None -> gęste przypisanie
+    feas_tables: FeasibilityTables = field(init=False, repr=False, compare=False)  # None przy feasibility=False
+    kernel_backend: str = field(init=False, compare=False)  # "numpy" / "numba"
+
+    def __post_init__(self):
+        if self.routing not in ROUTING_MODES:
+            raise ValueError(f"Nieznany tryb routingu: {self.routing}")
+        if self.objective not in OBJECTIVES:
+            raise ValueError(f"Nieznana funkcja celu: {self.objective}")
+        ep = self.energy_params
+        if self.points_pool.shape[0] <= POOL_TABLE_MAX_M:
+            dist_pool = pairwise_dist(self.points_pool, self.points_pool)
+            e_tx_pool = calc_E_tx_array(1, dist_pool, ep)
+        else:
+            dist_pool = PairwiseOnDemand(self.points_pool)
+            e_tx_pool = PairwiseOnDemand(self.points_pool, lambda d: calc_E_tx_array(1, d, ep))
+        dist_gw = pairwise_dist(self.points_pool, np.atleast_2d(self.gw_xy))
+        # Energia TX rośnie z odległością, więc najtańsza bramka to najbliższa
+        gw_choice = np.argmin(dist_gw, axis=1)
+        e_tx_gw = calc_E_tx_array(1, dist_gw[np.arange(len(gw_choice)), gw_choice], ep)
+
+        # frozen=True -> przypisanie przez object.__setattr__
+        object.__setattr__(self, "dist_pool", dist_pool)
+        object.__setattr__(self, "e_tx_pool", e_tx_pool)
+        object.__setattr__(self, "dist_gw", dist_gw)
+        object.__setattr__(self, "gw_choice", gw_choice)
+        object.__setattr__(self, "e_tx_gw", e_tx_gw)
+        object.__setattr__(self, "route_cache", RouteCache() if self.routing == "relay" else None)
+        object.__setattr__(self, "repair_ws", RepairWorkspace())
+        use_index = self.spatial_index and self.K >= KDTREE_MIN_K
+        object.__setattr__(self, "pool_index", PoolIndex(self.points_pool) if use_index else None)
+        feas = None
+        if self.feasibility:
+            # Przy routingu relay koszt uplinku zależy od pozostałych CH -> bez przycinania pozycji CH
+            feas = FeasibilityTables.build(self.points_pool, self.N, self.K, self.d_max_sn_ch,
+                                           e_tx_gw if self.routing == "direct" else None, self.point_region)
+        object.__setattr__(self, "feas_tables", feas)
+        object.__setattr__(self, "kernel_backend", resolve_backend(self.backend, isinstance(dist_pool, np.ndarray)))
+
     def get_D(self):
         return self.N + self.K
 
-def energy_and_penalty_from_x(x: np.ndarray, ctx: ObjectiveContext) -> tuple[float, float, bool]:
+    def uplink_costs(self, ch_idx: np.ndarray) -> np.ndarray:
+        """Energia na bit od CH do bramki (..., K): bezpośrednio albo najtańszą trasą przez inne CH."""
+        if self.routing == "direct":
+            return self.e_tx_gw[ch_idx]
+        return self.route_cache.costs(
+            ch_idx, lambda ch: relay_costs(ch, self.e_tx_pool, self.e_tx_gw, self.energy_params.E_elec))
+
+    def uplink_energy(self, ch_idx: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Energia wysyłki out bitów (..., K) z CH do bramki, per CH. Przy routing="relay" każdy przeskok
+        płaci węzeł, który go wykonuje (pośrednicy: RX + TX przekazywanego ruchu); suma po CH
+        jest ta sama co sum(out * uplink_costs).
+        """
+        if self.routing == "direct":
+            return out * self.e_tx_gw[ch_idx]
+        return relay_energy(ch_idx, out, self.e_tx_pool, self.e_tx_gw, self.energy_params.E_elec,
+                            self.uplink_costs(ch_idx))
+
+def _assign(sn_idx: np.ndarray, ch_idx: np.ndarray, ctx: ObjectiveContext) -> tuple[np.ndarray, np.ndarray]:
+    """Sloty CH (..., N) i indeksy puli przypisanych CH (..., N)."""
+    assignment = assign_sensors_to_ch_idx(sn_idx, ch_idx, ctx.dist_pool, ctx.pool_index)
+    return assignment, np.take_along_axis(ch_idx, assignment, axis=-1)
+
+def _ch_energy(assignment: np.ndarray, ch_idx: np.ndarray, ctx: ObjectiveContext,
+               per_node: bool = False) -> tuple[np.ndarray, np.ndarray]:
     """
-    Główna logika: x -> (Energy, Penalty, Feasible)
+    Energia CH na rundę (RX + Agg + TX do GW lub trasą przez inne CH) i liczności klastrów, obie (..., K).
+    CH bez sensorów daje k=0 -> zerowy wkład.
+    per_node=False: koszt całej trasy liczony u CH źródłowego (wystarcza do sumy energii);
+    per_node=True: przy routing="relay" każdy CH płaci przeskoki, które wykonuje (ctx.uplink_energy).
+    """
+    ep = ctx.energy_params
+    lead = assignment.shape[:-1]
+    flat_assign = assignment.reshape(-1, assignment.shape[-1])
+    n_rows = flat_assign.shape[0]
+    flat = (np.arange(n_rows)[:, None] * ctx.K + flat_assign).ravel()
+    counts = np.bincount(flat, minlength=n_rows * ctx.K).reshape(lead + (ctx.K,))
+
+    k_in = ep.packet_bits * counts
+    if per_node:
+        E_up = ctx.uplink_energy(ch_idx, k_in * ep.beta_agg)
+    else:
+        E_up = k_in * ep.beta_agg * ctx.uplink_costs(ch_idx)
+    return calc_E_rx(k_in, ep) + calc_E_da(k_in, ep) + E_up, counts
+
+def energy_and_penalty_from_indices(sn_idx: np.ndarray, ch_idx: np.ndarray,
+                                    ctx: ObjectiveContext) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Energia i kara dla gotowych (unikalnych) indeksów puli.
+    sn_idx: (..., N), ch_idx: (..., K) -> (Energy (...), Penalty (...))
+    Wszystkie odległości i energie na bit są odczytywane z tabel kontekstu.
+    """
+    ep = ctx.energy_params
+    prof = profiling._ACTIVE
+    # Jądro skompilowane liczy wszystkie etapy naraz, więc przy profilowaniu etapów zostaje NumPy
+    if ctx.kernel_backend == "numba" and prof is None and sn_idx.ndim <= 2:
+        return energy_penalty_numba(sn_idx, ch_idx, ctx)
+    if prof is not None:
+        t = time.perf_counter()
+
+    # 1. Assignment
+    assignment, assigned_ch = _assign(sn_idx, ch_idx, ctx)  # (..., N) sloty i indeksy puli
+    if prof is not None:
+        t = prof.lap("assignment", t)
+
+    # 2. Energy Calculation
+    # A. Sensors TX
+    E_sn_total = ep.packet_bits * np.sum(ctx.e_tx_pool[sn_idx, assigned_ch], axis=-1)
+
+    # B. CH Nodes
+    E_ch, _ = _ch_energy(assignment, ch_idx, ctx)
+    E_total = E_sn_total + np.sum(E_ch, axis=-1)
+    if prof is not None:
+        t = prof.lap("energy", t)
+
+    # 3. Penalties
+    dists_sn_ch = ctx.dist_pool[sn_idx, assigned_ch]
+    P = penalty_range_from_dists(dists_sn_ch, ctx.d_max_sn_ch, ctx.penalty_weight)
+    if prof is not None:
+        prof.lap("penalty", t)
+
+    return E_total, P
+
+def bottleneck_and_penalty_from_indices(sn_idx: np.ndarray, ch_idx: np.ndarray, ctx: ObjectiveContext,
+                                        rotation: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Energia na rundę węzła-wąskiego gardła i kara. Przy stałej konsumpcji pierwszy węzeł
+    umiera po E_init / wynik rundach (przybliżenie FND w formie zamkniętej, patrz lifetime).
+    rotation=True: idealna rotacja roli CH w klastrze -> energia klastra / liczba jego węzłów.
+    Przy routing="relay" CH-pośrednicy płacą za przekazywany ruch (ctx.uplink_energy).
+    """
+    ep = ctx.energy_params
+    prof = profiling._ACTIVE
+    if prof is not None:
+        t = time.perf_counter()
+
+    assignment, assigned_ch = _assign(sn_idx, ch_idx, ctx)
+    if prof is not None:
+        t = prof.lap("assignment", t)
+
+    E_sn = ep.packet_bits * ctx.e_tx_pool[sn_idx, assigned_ch]           # (..., N)
+    E_ch, counts = _ch_energy(assignment, ch_idx, ctx, per_node=True)   # (..., K)
+    if rotation:
+        members = assignment[..., :, None] == np.arange(ctx.K)          # (..., N, K)
+        E_cluster = E_ch + np.sum(np.where(members, E_sn[..., :, None], 0.0), axis=-2)
+        E_max = np.max(E_cluster / (counts + 1), axis=-1)
+    else:
+        E_max = np.maximum(np.max(E_sn, axis=-1), np.max(E_ch, axis=-1))
+    if prof is not None:
+        t = prof.lap("energy", t)
+
+    P = penalty_range_from_dists(ctx.dist_pool[sn_idx, assigned_ch], ctx.d_max_sn_ch, ctx.penalty_weight)
+    if prof is not None:
+        prof.lap("penalty", t)
+
+    return E_max, P
+
+# Kolumny objectives_*: suma energii rundy, energia najbardziej obciążonego węzła, -zapas zasięgu
+MO_OBJECTIVES = ("energy_total", "energy_max_node", "range_slack_neg")
+
+def objectives_from_indices(sn_idx: np.ndarray, ch_idx: np.ndarray,
+                            ctx: ObjectiveContext) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Wielokryterialna ocena (wszystkie do minimalizacji), bez składania w E + P.
+    sn_idx: (..., N), ch_idx: (..., K) -> (F (..., 3) wg MO_OBJECTIVES, naruszenie ograniczeń CV (...)).
+    range_slack_neg = max odległość SN -> CH - d_max (ujemne = zapas), CV = suma przekroczeń zasięgu [m].
     """
+    ep = ctx.energy_params
+    assignment, assigned_ch = _assign(sn_idx, ch_idx, ctx)
+    E_sn = ep.packet_bits * ctx.e_tx_pool[sn_idx, assigned_ch]
+    E_ch, _ = _ch_energy(assignment, ch_idx, ctx, per_node=True)
+    dists = ctx.dist_pool[sn_idx, assigned_ch]
+
+    F = np.stack([
+        np.sum(E_sn, axis=-1) + np.sum(E_ch, axis=-1),
+        np.maximum(np.max(E_sn, axis=-1), np.max(E_ch, axis=-1)),
+        np.max(dists, axis=-1) - ctx.d_max_sn_ch,
+    ], axis=-1)
+    CV = penalty_range_from_dists(dists, ctx.d_max_sn_ch, 1.0)
+    return F, CV
+
+def cost_and_penalty_from_indices(sn_idx: np.ndarray, ch_idx: np.ndarray,
+                                  ctx: ObjectiveContext) -> tuple[np.ndarray, np.ndarray]:
+    """(koszt, kara) wg ctx.objective - to minimalizują solvery."""
+    if ctx.objective == "energy":
+        return energy_and_penalty_from_indices(sn_idx, ch_idx, ctx)
+    return bottleneck_and_penalty_from_indices(sn_idx, ch_idx, ctx, rotation=ctx.objective == "lifetime_rotation")
+
+def _evaluate_clean(clean_idx: np.ndarray, ctx: ObjectiveContext, cache: FitnessCache = None,
+                    score_fn=energy_and_penalty_from_indices) -> tuple[np.ndarray, np.ndarray]:
+    """Split SN / CH naprawionych indeksów i ocena z tabel (opcjonalnie przez cache)."""
+    sn_idx, ch_idx = clean_idx[..., :ctx.N], clean_idx[..., ctx.N:]
+    if cache is None:
+        return score_fn(sn_idx, ch_idx, ctx)
+    prof = profiling._ACTIVE
+    if prof is None:
+        return cache.evaluate(sn_idx, ch_idx, lambda sn, ch: score_fn(sn, ch, ctx))
+
+    # Etap "cache" = narzut wyszukiwania, bez ocen chybionych (liczonych w swoich etapach)
+    t0, inner0 = time.perf_counter(), prof.stage_total()
+    result = cache.evaluate(sn_idx, ch_idx, lambda sn, ch: score_fn(sn, ch, ctx))
+    prof.add("cache", (time.perf_counter() - t0) - (prof.stage_total() - inner0))
+    return result
+
+def _decode_and_repair(x: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator, batch: bool) -> np.ndarray:
+    """Decode + repair z opcjonalnym pomiarem czasu obu etapów."""
     M = ctx.points_pool.shape[0]
-    
-    # 1. Decode & Repair
+    if ctx.feas_tables is not None:
+        repair = ctx.feas_tables.repair
+    else:
+        repair = repair_unique_batch if batch else repair_unique
+    prof = profiling._ACTIVE
+    if prof is None:
+        # Domyślna strategia "hash" jest deterministyczna: to samo x -> ta sama wartość funkcji celu
+        return repair(decode_to_indices(x, M), M, rng, ctx.repair_strategy, ctx.repair_ws)
+
+    t = time.perf_counter()
     raw_idx = decode_to_indices(x, M)
-    clean_idx = repair_unique(raw_idx, M) # Strategia losowa, ale wewnątrz funkcji celu determinizm wymagałby fixed seed
-                                          # W Mealpy dla stochastyczności OK, dla evaluacji końcowej ostrożnie.
-                                          # Tutaj zakładamy "miękkie" repair dla procesu ewolucji.
-    
-    # 2. Split SN / CH
-    sn_indices = clean_idx[:ctx.N]
-    ch_indices = clean_idx[ctx.N:]
-    
-    sn_xy = ctx.points_pool[sn_indices]
-    ch_xy = ctx.points_pool[ch_indices]
-    
-    # 3. Assignment
-    assignment = assign_sensors_to_ch(sn_xy, ch_xy)
-    
-    # 4. Energy Calculation
-    # A. Sensors TX
-    assigned_ch_xy = ch_xy[assignment]
-    dists_sn_ch = np.linalg.norm(sn_xy - assigned_ch_xy, axis=1)
-    
-    E_sn_total = 0.0
-    for d in dists_sn_ch:
-        E_sn_total += calc_E_tx(ctx.energy_params.packet_bits, d, ctx.energy_params)
-        
-    # B. CH Nodes (RX + Agg + TX to GW)
-    E_ch_total = 0.0
-    # Policz ile sensorów na każdy CH
-    counts = np.bincount(assignment, minlength=ctx.K)
-    
-    dists_ch_gw = np.linalg.norm(ch_xy - ctx.gw_xy, axis=1)
-    
-    for j in range(ctx.K):
-        m_j = counts[j] # liczba sensorów podpiętych
-        if m_j > 0:
-            # RX
-            E_ch_total += calc_E_rx(ctx.energy_params.packet_bits * m_j, ctx.energy_params)
-            # DA
-            E_ch_total += calc_E_da(ctx.energy_params.packet_bits * m_j, ctx.energy_params)
-            # TX -> GW
-            k_aggr = ctx.energy_params.packet_bits * m_j * ctx.energy_params.beta_agg
-            E_ch_total += calc_E_tx(k_aggr, dists_ch_gw[j], ctx.energy_params)
-            
-    E_total = E_sn_total + E_ch_total
-    
-    # 5. Penalties
-    P = penalty_range_sn_ch(sn_xy, ch_xy, assignment, ctx.d_max_sn_ch, ctx.penalty_weight)
-    
+    t = prof.lap("decode", t)
+    clean_idx = repair(raw_idx, M, rng, ctx.repair_strategy, ctx.repair_ws)
+    prof.lap("repair", t)
+    changed = np.any(clean_idx != raw_idx, axis=-1)
+    prof.n_evals += changed.size
+    prof.n_repaired += int(np.count_nonzero(changed))
+    return clean_idx
+
+def energy_and_penalty_from_x(x: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator = None,
+                              cache: FitnessCache = None) -> tuple[float, float, bool]:
+    """
+    Główna logika: x -> (Energy, Penalty, Feasible)
+    rng: generator dla repair "random" (None -> niezasiany, wynik niepowtarzalny).
+    cache: opcjonalny FitnessCache kluczowany rozmieszczeniem po repair.
+    """
+    # 1. Decode & Repair
+    clean_idx = _decode_and_repair(x, ctx, rng, batch=False)
+
+    # 2. Split SN / CH + ocena z tabel
+    E_total, P = _evaluate_clean(clean_idx, ctx, cache)
+    E_total, P = float(E_total), float(P)
+
+    is_feasible = bool(P == 0.0)
+
+    return E_total, P, is_feasible
+
+def objective_from_x(x: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator = None,
+                     cache: FitnessCache = None) -> float:
+    """Funkcja celu wg ctx.objective (koszt + kara)."""
+    clean_idx = _decode_and_repair(x, ctx, rng, batch=False)
+    C, P = _evaluate_clean(clean_idx, ctx, cache, cost_and_penalty_from_indices)
+    return float(C) + float(P)
+
+def energy_and_penalty_batch(X: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator = None,
+                             cache: FitnessCache = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wsadowa wersja energy_and_penalty_from_x dla całej populacji.
+    X: (P, N+K) -> (Energy (P,), Penalty (P,), Feasible (P,))
+    """
+    X = np.atleast_2d(X)
+
+    # 1. Decode & Repair
+    clean_idx = _decode_and_repair(X, ctx, rng, batch=True)
+
+    # 2. Split SN / CH + ocena z tabel
+    E_total, P = _evaluate_clean(clean_idx, ctx, cache)
+
     is_feasible = (P == 0.0)
-    
+
     return E_total, P, is_feasible
 
-def objective_from_x(x: np.ndarray, ctx: ObjectiveContext) -> float:
-    E, P, _ = energy_and_penalty_from_x(x, ctx)
-    return E + P
\ No newline at end of file
+def objective_batch(X: np.ndarray, ctx: ObjectiveContext, rng: np.random.Generator = None,
+                    cache: FitnessCache = None) -> np.ndarray:
+    """Wsadowa funkcja celu wg ctx.objective: X (P, N+K) -> (P,)."""
+    clean_idx = _decode_and_repair(np.atleast_2d(X), ctx, rng, batch=True)
+    C, P = _evaluate_clean(clean_idx, ctx, cache, cost_and_penalty_from_indices)
+    return C + P
+
+def objectives_batch(X: np.ndarray, ctx: ObjectiveContext,
+                     rng: np.random.Generator = None) -> tuple[np.ndarray, np.ndarray]:
+    """Wsadowa ocena wielokryterialna: X (P, N+K) -> (F (P, 3), CV (P,))."""
+    clean_idx = _decode_and_repair(np.atleast_2d(X), ctx, rng, batch=True)
+    return objectives_from_indices(clean_idx[:, :ctx.N], clean_idx[:, ctx.N:], ctx)
@@ -0,0 +1,131 @@
+import numpy as np
+
+# Porównania parami liczone blokami po ok. BLOCK elementów, żeby pamięć nie rosła jak O(n^2)
+BLOCK = 1 << 22
+
+def _chunk(n: int) -> int:
+    return max(16, BLOCK // max(n, 1))
+
+def dominates(Fa: np.ndarray, CVa: np.ndarray, Fb: np.ndarray, CVb: np.ndarray) -> np.ndarray:
+    """
+    Macierz (A, B): czy a dominuje b (minimalizacja, dominacja z ograniczeniami wg Deba):
+    mniejsze naruszenie CV wygrywa; przy równym CV decyduje zwykła dominacja Pareto.
+    """
+    better_cv = CVa[:, None] < CVb[None, :]
+    same_cv = CVa[:, None] == CVb[None, :]
+    le = np.all(Fa[:, None, :] <= Fb[None, :, :], axis=2)
+    lt = np.any(Fa[:, None, :] < Fb[None, :, :], axis=2)
+    return better_cv | (same_cv & le & lt)
+
+def _weakly_dominates(Fa, CVa, Fb, CVb) -> np.ndarray:
+    """Jak dominates, ale równe punkty też się liczą (do odrzucania duplikatów)."""
+    better_cv = CVa[:, None] < CVb[None, :]
+    same_cv = CVa[:, None] == CVb[None, :]
+    le = np.all(Fa[:, None, :] <= Fb[None, :, :], axis=2)
+    return better_cv | (same_cv & le)
+
+def dominated_by_any(F: np.ndarray, CV: np.ndarray, F_ref: np.ndarray, CV_ref: np.ndarray,
+                     weak: bool = False) -> np.ndarray:
+    """(n,) czy punkt jest dominowany przez któryś punkt referencyjny (liczone blokami)."""
+    rel = _weakly_dominates if weak else dominates
+    out = np.zeros(len(F), dtype=bool)
+    step = _chunk(len(F))
+    for start in range(0, len(F_ref), step):
+        sl = slice(start, start + step)
+        out |= rel(F_ref[sl], CV_ref[sl], F, CV).any(axis=0)
+    return out
+
+def non_dominated_sort(F: np.ndarray, CV: np.ndarray = None) -> np.ndarray:
+    """
+    Fast non-dominated sort (Deb i in.), wektorowo: zwraca numer frontu (0 = niezdominowane) dla każdego punktu.
+    Liczniki dominacji zdejmowane front po froncie zamiast pętli po parach.
+    Macierz dominacji (n, n) - do populacji; archiwum filtruje dominated_by_any blokami.
+    """
+    n = len(F)
+    if CV is None:
+        CV = np.zeros(n)
+    step = _chunk(n)
+    dom = np.concatenate([dominates(F[s:s + step], CV[s:s + step], F, CV)
+                          for s in range(0, n, step)]) if n else np.zeros((0, 0), dtype=bool)
+    n_dominators = dom.sum(axis=0)
+    rank = np.full(n, -1)
+    current = n_dominators == 0
+    r = 0
+    while current.any():
+        rank[current] = r
+        n_dominators = n_dominators - dom[current].sum(axis=0)
+        n_dominators[rank >= 0] = -1
+        current = n_dominators == 0
+        r += 1
+    return rank
+
+def crowding_distance(F: np.ndarray) -> np.ndarray:
+    """Odległość zatłoczenia NSGA-II w obrębie jednego frontu; skrajne punkty -> inf."""
+    n, m = F.shape
+    dist = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for k in range(m):
+        order = np.argsort(F[:, k], kind='stable')
+        f = F[order, k]
+        span = f[-1] - f[0]
+        dist[order[0]] = dist[order[-1]] = np.inf
+        if span > 0:
+            dist[order[1:-1]] += (f[2:] - f[:-2]) / span
+    return dist
+
+class ParetoArchive:
+    """
+    Archiwum niezdominowanych rozwiązań (dominacja z ograniczeniami).
+    items: dowolne wiersze towarzyszące punktom (np. indeksy puli rozmieszczenia).
+    max_size: opcjonalny limit; nadmiar usuwany wg odległości zatłoczenia (najgęstsze pierwsze).
+    """
+
+    def __init__(self, n_obj: int, max_size: int = None):
+        self.n_obj = n_obj
+        self.max_size = max_size
+        self.F = np.empty((0, n_obj))
+        self.CV = np.empty(0)
+        self.items = None
+
+    def __len__(self):
+        return len(self.F)
+
+    def update(self, F: np.ndarray, CV: np.ndarray, items: np.ndarray) -> int:
+        """Dodaje niezdominowane kandydaty, usuwa zdominowane wpisy. Zwraca liczbę dodanych."""
+        F, CV, items = np.atleast_2d(F), np.atleast_1d(CV), np.asarray(items)
+        # Duplikaty (ten sam punkt w przestrzeni celów) -> pierwszy
+        _, first = np.unique(np.column_stack([F, CV]), axis=0, return_index=True)
+        keep = np.sort(first)
+        F, CV, items = F[keep], CV[keep], items[keep]
+
+        cand = ~dominated_by_any(F, CV, F, CV)
+        if len(self.F):
+            cand &= ~dominated_by_any(F, CV, self.F, self.CV, weak=True)
+        F, CV, items = F[cand], CV[cand], items[cand]
+        if len(F) == 0:
+            return 0
+
+        if len(self.F):
+            stay = ~dominated_by_any(self.F, self.CV, F, CV)
+            self.F = np.concatenate([self.F[stay], F])
+            self.CV = np.concatenate([self.CV[stay], CV])
+            self.items = np.concatenate([self.items[stay], items])
+        else:
+            self.F, self.CV, self.items = F.copy(), CV.copy(), items.copy()
+
+        if self.max_size is not None and len(self.F) > self.max_size:
+            self._truncate()
+        return len(F)
+
+    def _truncate(self):
+        while len(self.F) > self.max_size:
+            # Usuwamy po kilka naraz (najbardziej zatłoczone), żeby nie liczyć crowding dla każdego punktu osobno
+            n_drop = max(1, (len(self.F) - self.max_size) // 2)
+            drop = np.argsort(crowding_distance(self.F), kind='stable')[:n_drop]
+            keep = np.setdiff1d(np.arange(len(self.F)), drop)
+            self.F, self.CV, self.items = self.F[keep], self.CV[keep], self.items[keep]
+
+    def best(self, k: int = 0) -> int:
+        """Indeks wpisu z najmniejszym CV, a przy remisie z najmniejszym k-tym celem."""
+        return int(np.lexsort((self.F[:, k], self.CV))[0])
@@ -18,4 +18,11 @@ def penalty_range_sn_ch(sn_xy: np.ndarray, ch_xy: np.ndarray,
     # Naruszenia
     violations = np.maximum(0.0, dists - d_max)
     
-    return np.sum(violations) * weight
\ No newline at end of file
+    return np.sum(violations) * weight
+
+def penalty_range_from_dists(dists_sn_ch: np.ndarray, d_max: float, weight: float) -> np.ndarray:
+    """
+    Jak penalty_range_sn_ch, ale z gotowych odległości sensor -> przypisany CH (..., N).
+    """
+    violations = np.maximum(0.0, dists_sn_ch - d_max)
+    return np.sum(violations, axis=-1) * weight
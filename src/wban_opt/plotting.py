@@ -1,16 +1,19 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from .config import Point
+from .point_pool import PointPool
+from .geometry import points_to_numpy
 
-def plot_placement(points: list[Point], sn_idx: np.ndarray, ch_idx: np.ndarray, 
+def plot_placement(points: list[Point] | PointPool, sn_idx: np.ndarray, ch_idx: np.ndarray,
                    gw_xy: tuple[float, float], outpath: str):
     """
     Rysuje mapę ciała z zaznaczonymi węzłami.
+    points: lista Point lub PointPool; gw_xy: pojedyncza bramka (x, y) lub tablica (G, 2).
     """
     plt.figure(figsize=(5, 8))
     
     # 1. Wszystkie punkty tła
-    all_xy = np.array([[p.x, p.y] for p in points])
+    all_xy = points_to_numpy(points)
     plt.scatter(all_xy[:, 0], all_xy[:, 1], c='lightgray', s=30, label='Candidates')
     
     # 2. Sensory
@@ -21,8 +24,9 @@ def plot_placement(points: list[Point], sn_idx: np.ndarray, ch_idx: np.ndarray,
     ch_xy = all_xy[ch_idx]
     plt.scatter(ch_xy[:, 0], ch_xy[:, 1], c='red', s=100, marker='^', label='CH')
     
-    # 4. Gateway
-    plt.scatter([gw_xy[0]], [gw_xy[1]], c='green', s=150, marker='s', label='GW')
+    # 4. Gateway(s)
+    gw = np.atleast_2d(gw_xy)
+    plt.scatter(gw[:, 0], gw[:, 1], c='green', s=150, marker='s', label='GW')
     
     # Ozdobniki
     plt.title("WBAN Placement")
@@ -33,4 +37,53 @@ def plot_placement(points: list[Point], sn_idx: np.ndarray, ch_idx: np.ndarray,
     plt.axis('equal')
     
     plt.savefig(outpath)
-    plt.close()
\ No newline at end of file
+    plt.close()
+
+def plot_convergence_bands(bands: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]], title: str, outpath: str):
+    """
+    Krzywe zbieżności z gotowych podsumowań (aggregate.summarize_histories):
+    algorytm -> (mediana, min, max) best fitness per epoka; pasmo min-max.
+    """
+    plt.figure(figsize=(7, 4))
+    for algo, (median, lo, hi) in bands.items():
+        epochs = np.arange(1, len(median) + 1)
+        plt.plot(epochs, median, label=algo.upper())
+        plt.fill_between(epochs, lo, hi, alpha=0.2)
+
+    plt.title(title)
+    plt.xlabel("Epoch")
+    plt.ylabel("Best fitness")
+    plt.yscale('log')
+    plt.legend(loc='upper right')
+    plt.grid(True, linestyle='--', alpha=0.5)
+
+    plt.savefig(outpath)
+    plt.close()
+
+def plot_energy_boxplot(stats: dict[str, list[dict]], labels: list[str], title: str, outpath: str):
+    """
+    Boxplot energii z gotowych statystyk (Axes.bxp, bez surowych wartości):
+    algorytm -> lista statystyk pudełek (RunningStats.box_stats) w kolejności labels, None = brak danych.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+    width = 0.8 / max(len(stats), 1)
+    handles = []
+    for a, (algo, boxes) in enumerate(stats.items()):
+        pos = [i - 0.4 + width * (a + 0.5) for i, b in enumerate(boxes) if b is not None]
+        boxes = [b for b in boxes if b is not None]
+        if not boxes:
+            continue
+        bp = ax.bxp(boxes, positions=pos, widths=width * 0.8, patch_artist=True, showfliers=False)
+        for patch in bp['boxes']:
+            patch.set_facecolor(f"C{a}")
+        handles.append((bp['boxes'][0], algo.upper()))
+
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    ax.set_title(title)
+    ax.set_ylabel("Energy [J]")
+    if handles:
+        ax.legend(*zip(*handles))
+
+    fig.savefig(outpath)
+    plt.close(fig)
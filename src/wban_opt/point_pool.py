@@ -0,0 +1,127 @@
+import json
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from pathlib import Path
+from .config import Point
+
+# Wersja formatu cache (zmiana formatu -> przebudowa)
+CACHE_VERSION = 1
+# Tablice zapisywane jako osobne .npy (każda mapowalna przez np.load(mmap_mode='r'))
+_ARRAYS = ("ids", "xy", "region", "names")
+
+def _write_meta(cache_dir: Path, meta: dict):
+    """meta.json przez plik tymczasowy i os.replace - czytelnik widzi tylko kompletny plik."""
+    tmp = cache_dir / f"meta.{os.getpid()}.tmp.json"
+    tmp.write_text(json.dumps(meta, indent=1))
+    os.replace(tmp, cache_dir / "meta.json")
+
+@dataclass(frozen=True)
+class PointPool:
+    """
+    Pula punktów kandydujących w układzie kolumnowym.
+    ids (M,) int64, xy (M, 2) float64, region (M,) int32 - kod regionu (indeks w regions),
+    names (M,) str. Tablice mogą być memmapami cache (tylko do odczytu).
+    """
+    ids: np.ndarray
+    xy: np.ndarray
+    region: np.ndarray
+    regions: tuple[str, ...]
+    names: np.ndarray
+
+    def __len__(self):
+        return len(self.ids)
+
+    def region_names(self) -> np.ndarray:
+        return np.asarray(self.regions)[self.region]
+
+    def to_points(self) -> list[Point]:
+        """Lista Point (dawny format load_points)."""
+        regions = self.region_names()
+        return [Point(id=int(i), name=str(n), x=float(x), y=float(y), region=str(r))
+                for i, n, (x, y), r in zip(self.ids, self.names, self.xy, regions)]
+
+    def save(self, cache_dir: str, meta: dict = None):
+        """Zapis do katalogu cache: tablice .npy + meta.json (zapisywany na końcu = znacznik kompletności)."""
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        meta_path = cache_dir / "meta.json"
+        meta_path.unlink(missing_ok=True)
+        for name in _ARRAYS:
+            tmp = cache_dir / f"{name}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(getattr(self, name)))
+            os.replace(tmp, cache_dir / f"{name}.npy")
+        _write_meta(cache_dir, {**(meta or {}), "version": CACHE_VERSION, "regions": list(self.regions)})
+
+    @classmethod
+    def open(cls, cache_dir: str, mmap: bool = True) -> "PointPool":
+        """Otwiera cache; przy mmap=True tablice są mapowane z pliku (bez kopiowania, współdzielone między procesami)."""
+        cache_dir = Path(cache_dir)
+        meta = json.loads((cache_dir / "meta.json").read_text())
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(cache_dir / f"{name}.npy", mmap_mode=mode) for name in _ARRAYS}
+        return cls(regions=tuple(meta["regions"]), **arrays)
+
+def read_points_csv(path: str) -> PointPool:
+    """Wektorowe wczytanie CSV (id, name, x, y, region) do PointPool."""
+    df = pd.read_csv(path, dtype={'id': np.int64, 'name': str, 'x': np.float64, 'y': np.float64, 'region': str})
+    # Walidacja kolumn
+    required = {'id', 'name', 'x', 'y', 'region'}
+    if not required.issubset(df.columns):
+        raise ValueError(f"CSV missing columns: {required - set(df.columns)}")
+
+    regions, region = np.unique(df['region'].to_numpy(dtype=str), return_inverse=True)
+    return PointPool(
+        ids=df['id'].to_numpy(dtype=np.int64),
+        xy=df[['x', 'y']].to_numpy(dtype=np.float64),
+        region=region.astype(np.int32),
+        regions=tuple(regions.tolist()),
+        names=df['name'].to_numpy(dtype=str),
+    )
+
+def cache_dir_for(path: str) -> Path:
+    """Katalog cache obok CSV: points_body.csv -> points_body.pool/."""
+    path = Path(path)
+    return path.with_name(path.stem + ".pool")
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _cache_valid(path: Path, cache_dir: Path) -> bool:
+    """Cache aktualny: zgodne mtime i rozmiar CSV, a jeśli mtime się zmienił - zgodny hash treści."""
+    try:
+        meta = json.loads((cache_dir / "meta.json").read_text())
+    except (OSError, ValueError):
+        return False
+    if meta.get("version") != CACHE_VERSION:
+        return False
+    st = path.stat()
+    if meta.get("mtime_ns") == st.st_mtime_ns and meta.get("size") == st.st_size:
+        return True
+    if meta.get("size") != st.st_size or meta.get("sha256") != _file_hash(path):
+        return False
+    # Ta sama treść (np. po checkout): odśwież tylko mtime, bez przebudowy
+    meta["mtime_ns"] = st.st_mtime_ns
+    _write_meta(cache_dir, meta)
+    return True
+
+def load_point_pool(path: str, cache: bool = True, mmap: bool = True) -> PointPool:
+    """
+    PointPool z CSV. Przy cache=True używa (lub buduje) cache .npy obok CSV, unieważnianego
+    przez mtime / hash pliku; wynik jest wtedy mapowany z cache (mmap=True).
+    """
+    path = Path(path)
+    if not cache:
+        return read_points_csv(path)
+    cache_dir = cache_dir_for(path)
+    if not _cache_valid(path, cache_dir):
+        st = path.stat()
+        read_points_csv(path).save(cache_dir, meta={"source": path.name, "mtime_ns": st.st_mtime_ns,
+                                                   "size": st.st_size, "sha256": _file_hash(path)})
+    return PointPool.open(cache_dir, mmap=mmap)
@@ -0,0 +1,55 @@
+import time
+import numpy as np
+from .objective import ObjectiveContext
+from .mealpy_runner import MealpyStepper
+
+def _shares(fitness: list[float]) -> np.ndarray:
+    """Udział w czasie rundy wg rankingu: najlepszy 1, drugi 1/2, trzeci 1/4, ... (znormalizowane)."""
+    rank = np.argsort(np.argsort(fitness, kind='stable'), kind='stable')
+    w = 0.5 ** rank
+    return w / w.sum()
+
+def solve_portfolio(ctx: ObjectiveContext, members: dict[str, dict], budget_s: float, epochs: int,
+                    pop_size: int, seed: int = None, rounds: int = 4, info: dict = None,
+                    init: np.ndarray = None):
+    """
+    Portfolio optymalizatorów Mealpy dzielących jeden budżet czasu (zegar ścienny).
+    members: nazwa -> {"optimizer": "MODUŁ.Klasa", "params": {...}}; każdy startuje z tym samym seedem.
+    Budżet dzielony na `rounds` rund; w rundzie członek z najlepszym dotąd fitness dostaje
+    największy udział czasu (wagi 1, 1/2, 1/4, ... wg rankingu), każdy aktywny co najmniej jedną epokę.
+    epochs: limit epok każdego członka (horyzont dla optymalizatorów zależnych od numeru epoki).
+    init: opcjonalna populacja startowa (warm start), wspólna dla wszystkich członków.
+    Zwraca (x, fitness) najlepszego członka; info dostaje portfolio_winner oraz pf_{nazwa}_{s,epochs,best}.
+    Wynik zależy od czasu wykonania, więc nie jest w pełni powtarzalny między maszynami.
+    """
+    t_start = time.perf_counter()
+    names = list(members)
+    runs, spent = {}, dict.fromkeys(names, 0.0)
+    for name in names:
+        t0 = time.perf_counter()
+        spec = members[name]
+        runs[name] = MealpyStepper(ctx, spec["optimizer"], epochs, pop_size, seed=seed,
+                                   params=spec.get("params"), init=init)
+        spent[name] += time.perf_counter() - t0
+
+    for r in range(rounds):
+        active = [n for n in names if not runs[n].done]
+        left = budget_s - (time.perf_counter() - t_start)
+        if not active or left <= 0:
+            break
+        slice_s = left / (rounds - r)
+        for name, share in zip(active, _shares([runs[n].best_fitness for n in active])):
+            run, t0 = runs[name], time.perf_counter()
+            while not run.done:
+                run.step()
+                if time.perf_counter() - t0 >= share * slice_s:
+                    break
+            spent[name] += time.perf_counter() - t0
+
+    winner = min(names, key=lambda n: runs[n].best_fitness)
+    if info is not None:
+        info["portfolio_winner"] = winner
+        for name in names:
+            info.update({f"pf_{name}_s": spent[name], f"pf_{name}_epochs": runs[name].epoch,
+                         f"pf_{name}_best": runs[name].best_fitness})
+    return runs[winner].result()
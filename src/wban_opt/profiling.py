@@ -0,0 +1,66 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Aktywny profiler albo None. Gorąca ścieżka sprawdza tylko `is not None`, więc wyłączone
+# profilowanie kosztuje jedno odczytanie zmiennej modułu na wywołanie funkcji celu.
+_ACTIVE = None
+
+# Etapy funkcji celu (w kolejności potoku)
+STAGES = ("decode", "repair", "cache", "assignment", "energy", "penalty")
+
+class StageProfiler:
+    """Skumulowany czas i liczba wywołań per etap + udział ewaluacji wymagających repair."""
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.n_evals = 0
+        self.n_repaired = 0
+        self.solver_time = 0.0
+
+    def add(self, stage: str, dt: float):
+        self.times[stage] += dt
+        self.calls[stage] += 1
+
+    def lap(self, stage: str, t0: float) -> float:
+        """Zapisuje czas od t0 jako etap `stage` i zwraca bieżący czas (początek kolejnego etapu)."""
+        t1 = time.perf_counter()
+        self.add(stage, t1 - t0)
+        return t1
+
+    def stage_total(self, stages=STAGES) -> float:
+        return sum(self.times[s] for s in stages)
+
+    def summary(self, prefix: str = "prof_") -> dict:
+        """Płaski słownik do dołączenia do rekordu wyniku."""
+        out = {}
+        for stage in STAGES:
+            out[f"{prefix}{stage}_s"] = self.times[stage]
+            out[f"{prefix}{stage}_calls"] = self.calls[stage]
+        out[f"{prefix}n_evals"] = self.n_evals
+        out[f"{prefix}repair_share"] = self.n_repaired / self.n_evals if self.n_evals else 0.0
+        if self.solver_time > 0.0:
+            # Wszystko poza funkcją celu: operatory Mealpy, selekcja, obiekty Agent/Target
+            out[f"{prefix}solver_s"] = self.solver_time
+            out[f"{prefix}mealpy_overhead_s"] = max(0.0, self.solver_time - self.stage_total())
+        return out
+
+def get_profiler():
+    return _ACTIVE
+
+@contextmanager
+def profile_stages(profiler: StageProfiler = None):
+    """
+    Włącza profilowanie etapów w obrębie bloku:
+        with profile_stages() as prof:
+            solve_ga(...)
+        prof.summary()
+    """
+    global _ACTIVE
+    prev = _ACTIVE
+    _ACTIVE = profiler if profiler is not None else StageProfiler()
+    try:
+        yield _ACTIVE
+    finally:
+        _ACTIVE = prev
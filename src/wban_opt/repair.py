@@ -1,5 +1,12 @@
 import numpy as np
 
+# random  - wolne indeksy w losowej kolejności (rng), jak dotąd
+# hash    - jak random, ale kolejność wynika z hasha zdekodowanego wiersza -> deterministyczne
+# nearest - duplikat zastępowany najbliższym (w sensie indeksu) wolnym indeksem -> deterministyczne
+REPAIR_STRATEGIES = ("random", "hash", "nearest")
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
 def decode_to_indices(x: np.ndarray, M: int) -> np.ndarray:
     """
     Mapuje ciągły wektor x z [0, 1] na indeksy całkowite [0, M-1].
@@ -9,11 +16,35 @@ def decode_to_indices(x: np.ndarray, M: int) -> np.ndarray:
     indices = np.floor(x_clipped * M).astype(int)
     return indices
 
-def repair_unique(indices: np.ndarray, M: int, rng: np.random.Generator = None) -> np.ndarray:
+class RepairWorkspace:
+    """
+    Bufory robocze dla repair_unique_batch, alokowane raz i powiększane tylko w razie potrzeby.
+    Jeden workspace na wątek (bufory są nadpisywane przy każdym wywołaniu).
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.M = 0
+        self.used = None  # (rows, M) bool
+        self.keys = None  # (rows, M) float64 / uint64 (widok tego samego bufora)
+
+    def get(self, rows: int, M: int) -> tuple[np.ndarray, np.ndarray]:
+        if rows > self.rows or M != self.M:
+            self.rows = max(rows, self.rows if M == self.M else 0)
+            self.M = M
+            self.used = np.empty((self.rows, M), dtype=bool)
+            self.keys = np.empty((self.rows, M), dtype=np.float64)
+        return self.used[:rows], self.keys[:rows]
+
+def repair_unique(indices: np.ndarray, M: int, rng: np.random.Generator = None,
+                  strategy: str = "random", workspace: RepairWorkspace = None) -> np.ndarray:
     """
     Zapewnia unikalność indeksów w wektorze.
-    Konflikty zastępuje losowymi wolnymi indeksami.
+    Konflikty zastępuje wolnymi indeksami wg strategii (patrz REPAIR_STRATEGIES).
     """
+    if strategy != "random":
+        return repair_unique_batch(indices[None, :], M, rng, strategy, workspace)[0]
+
     if rng is None:
         rng = np.random.default_rng()
 
@@ -22,7 +53,7 @@ def repair_unique(indices: np.ndarray, M: int, rng: np.random.Generator = None)
         raise ValueError(f"Nie można wybrać {D} unikalnych z puli {M}!")
 
     unique_vals, counts = np.unique(indices, return_counts=True)
-    
+
     # Jeśli mamy tyle unikalnych co długość wektora, jest OK
     if len(unique_vals) == D:
         return indices
@@ -36,7 +67,7 @@ def repair_unique(indices: np.ndarray, M: int, rng: np.random.Generator = None)
     # Naprawa
     result = indices.copy()
     seen = set()
-    
+
     replace_ptr = 0
     for i in range(D):
         val = result[i]
@@ -46,5 +77,103 @@ def repair_unique(indices: np.ndarray, M: int, rng: np.random.Generator = None)
             replace_ptr += 1
         else:
             seen.add(val)
-            
-    return result
\ No newline at end of file
+
+    return result
+
+def _row_hash_keys(sub: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Pseudolosowe klucze (R, M) wyznaczone z hasha wiersza indeksów (splitmix64)."""
+    with np.errstate(over='ignore'):
+        h = np.full(sub.shape[0], 0x9E3779B97F4A7C15, dtype=np.uint64)
+        for col in sub.T.astype(np.uint64):
+            h = (h ^ col) * np.uint64(0x100000001B3)
+        z = keys.view(np.uint64)
+        z[:] = h[:, None] + np.arange(keys.shape[1], dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(0xBF58476D1CE4E5B9)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        z &= _MASK64
+    return z
+
+def _fill_nearest(sub: np.ndarray, sub_dup: np.ndarray, used: np.ndarray):
+    """
+    Duplikaty (od lewej) zastępowane najbliższym wolnym indeksem; remis -> mniejszy indeks.
+    Pętla po kolumnach, wektorowo po wierszach.
+    """
+    M = used.shape[1]
+    ar = np.arange(M)
+    for j in np.flatnonzero(sub_dup.any(axis=0)):
+        rows = np.flatnonzero(sub_dup[:, j])
+        u = used[rows]
+        v = sub[rows, j]
+        sel = np.arange(rows.size)
+
+        # Najbliższy wolny >= v oraz <= v (M / -1 gdy brak)
+        nxt = np.minimum.accumulate(np.where(u, M, ar)[:, ::-1], axis=1)[:, ::-1][sel, v]
+        prv = np.maximum.accumulate(np.where(u, -1, ar), axis=1)[sel, v]
+        d_next = np.where(nxt < M, nxt - v, 2 * M)
+        d_prev = np.where(prv >= 0, v - prv, 2 * M)
+
+        choice = np.where(d_prev <= d_next, prv, nxt)
+        sub[rows, j] = choice
+        used[rows, choice] = True
+
+def repair_unique_batch(indices: np.ndarray, M: int, rng: np.random.Generator = None,
+                        strategy: str = "random", workspace: RepairWorkspace = None) -> np.ndarray:
+    """
+    Wsadowa wersja repair_unique dla macierzy indeksów (P, D).
+    W każdym wierszu pierwsze wystąpienie wartości zostaje, kolejne
+    zastępowane są wolnymi indeksami z danego wiersza wg strategii.
+    """
+    if strategy not in REPAIR_STRATEGIES:
+        raise ValueError(f"Nieznana strategia repair: {strategy}")
+
+    P, D = indices.shape
+    if D > M:
+        raise ValueError(f"Nie można wybrać {D} unikalnych z puli {M}!")
+
+    # Duplikaty: sortowanie stabilne zachowuje kolejność, więc pierwsze wystąpienie nie jest oznaczane
+    order = np.argsort(indices, axis=1, kind='stable')
+    sorted_vals = np.take_along_axis(indices, order, axis=1)
+    dup_sorted = np.zeros((P, D), dtype=bool)
+    dup_sorted[:, 1:] = sorted_vals[:, 1:] == sorted_vals[:, :-1]
+    dup = np.zeros((P, D), dtype=bool)
+    np.put_along_axis(dup, order, dup_sorted, axis=1)
+
+    result = indices.copy()
+    rows = np.flatnonzero(dup.any(axis=1))
+    if rows.size == 0:
+        return result
+
+    if workspace is None:
+        workspace = RepairWorkspace()
+    used, keys = workspace.get(rows.size, M)
+
+    sub = indices[rows]
+    used[:] = False
+    np.put_along_axis(used, sub, True, axis=1)
+    sub_dup = dup[rows]
+
+    if strategy == "nearest":
+        _fill_nearest(sub, sub_dup, used)
+    else:
+        # Wolne indeksy w kolejności kluczy (zajęte -> na koniec)
+        if strategy == "random":
+            if rng is None:
+                rng = np.random.default_rng()
+            rng.random(out=keys)
+            keys[used] = np.inf
+        else:
+            keys = _row_hash_keys(sub, keys)
+            keys[used] = _MASK64
+        free = np.argsort(keys, axis=1)
+
+        # k-ty duplikat w wierszu dostaje k-ty wolny indeks
+        rank = np.cumsum(sub_dup, axis=1) - 1
+        r, c = np.nonzero(sub_dup)
+        sub[r, c] = free[r, rank[r, c]]
+
+    result[rows] = sub
+
+    return result
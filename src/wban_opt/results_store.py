@@ -0,0 +1,209 @@
+import sqlite3
+import numbers
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from .objective import MO_OBJECTIVES
+
+# Klucz rekordu: jeden wiersz na (scenariusz, GW, run, algorytm)
+KEY_COLUMNS = ("scenario", "gw", "run", "algorithm")
+# Tablice w rekordach (np. historia zbieżności) zapisywane jako BLOB w tym formacie
+ARRAY_DTYPE = "<f8"
+
+def encode_array(arr: np.ndarray) -> bytes:
+    return np.ascontiguousarray(arr, dtype=ARRAY_DTYPE).tobytes()
+
+def decode_array(blob) -> np.ndarray:
+    """BLOB z kolumny tablicowej -> wektor float64 (None / NaN -> pusty)."""
+    if blob is None or (isinstance(blob, float) and np.isnan(blob)):
+        return np.empty(0)
+    return np.frombuffer(blob, dtype=ARRAY_DTYPE)
+
+class ResultsStore:
+    """
+    Trwały, przyrostowy magazyn wyników w SQLite.
+    Każdy ukończony rekord jest zapisywany (commit) od razu, więc przerwany przebieg
+    traci co najwyżej zadania w toku. Kolumny spoza klucza są dodawane przy pierwszym użyciu.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "scenario TEXT NOT NULL, gw TEXT NOT NULL, run INTEGER NOT NULL, algorithm TEXT NOT NULL, "
+            "PRIMARY KEY (scenario, gw, run, algorithm))"
+        )
+        # Archiwa Pareto: jeden wiersz na członka archiwum danego przebiegu
+        obj_sql = ", ".join(f"{name} REAL" for name in MO_OBJECTIVES)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pareto ("
+            "scenario TEXT NOT NULL, gw TEXT NOT NULL, run INTEGER NOT NULL, algorithm TEXT NOT NULL, "
+            f"member INTEGER NOT NULL, {obj_sql}, cv REAL, sn_idx TEXT, ch_idx TEXT, "
+            "PRIMARY KEY (scenario, gw, run, algorithm, member))"
+        )
+        self.conn.commit()
+        self._columns = self._read_columns()
+
+    def _read_columns(self) -> set[str]:
+        return {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+
+    def _ensure_columns(self, record: dict):
+        for col, val in record.items():
+            if col in self._columns:
+                continue
+            if isinstance(val, bytes):
+                sql_type = "BLOB"
+            elif isinstance(val, (bool, numbers.Integral)):
+                sql_type = "INTEGER"
+            elif isinstance(val, numbers.Real):
+                sql_type = "REAL"
+            else:
+                sql_type = "TEXT"
+            self.conn.execute(f'ALTER TABLE runs ADD COLUMN "{col}" {sql_type}')
+            self._columns.add(col)
+
+    def append(self, record: dict):
+        """Zapisuje rekord (nadpisuje istniejący o tym samym kluczu)."""
+        record = {k: (encode_array(v) if isinstance(v, np.ndarray) and v.ndim > 0
+                      else v.item() if hasattr(v, "item") else v) for k, v in record.items()}
+        self._ensure_columns(record)
+        cols = list(record)
+        placeholders = ", ".join("?" for _ in cols)
+        col_sql = ", ".join(f'"{c}"' for c in cols)
+        self.conn.execute(f"INSERT OR REPLACE INTO runs ({col_sql}) VALUES ({placeholders})",
+                          [record[c] for c in cols])
+        self.conn.commit()
+
+    def append_pareto(self, key: dict, F, CV, sn_idx, ch_idx):
+        """
+        Zapisuje archiwum Pareto przebiegu (zastępuje poprzednie dla tego klucza).
+        F: (A, len(MO_OBJECTIVES)), CV: (A,), sn_idx: (A, N), ch_idx: (A, K).
+        """
+        key_vals = [key[k] for k in KEY_COLUMNS]
+        where = " AND ".join(f"{k} = ?" for k in KEY_COLUMNS)
+        self.conn.execute(f"DELETE FROM pareto WHERE {where}", key_vals)
+        cols = list(KEY_COLUMNS) + ["member", *MO_OBJECTIVES, "cv", "sn_idx", "ch_idx"]
+        rows = [
+            (*key_vals, i, *map(float, f), float(cv), " ".join(map(str, sn)), " ".join(map(str, ch)))
+            for i, (f, cv, sn, ch) in enumerate(zip(F, CV, sn_idx, ch_idx))
+        ]
+        placeholders = ", ".join("?" for _ in cols)
+        self.conn.executemany(f"INSERT INTO pareto ({', '.join(cols)}) VALUES ({placeholders})", rows)
+        self.conn.commit()
+
+    def read_pareto(self) -> pd.DataFrame:
+        """Wszystkie zapisane archiwa Pareto (indeksy rozmieszczenia jako tekst "i j k ...")."""
+        return pd.read_sql_query(
+            "SELECT * FROM pareto ORDER BY scenario, gw, run, algorithm, member", self.conn)
+
+    def iter_histories(self, algorithm: str = None):
+        """Historie zbieżności po jednej: ((scenario, gw, run, algorithm), wektor best fitness per epoka)."""
+        if "history" not in self._columns:
+            return
+        sql = f"SELECT {', '.join(KEY_COLUMNS)}, history FROM runs WHERE history IS NOT NULL"
+        params = ()
+        if algorithm is not None:
+            sql += " AND algorithm = ?"
+            params = (algorithm,)
+        for row in self.conn.execute(sql, params):
+            yield tuple(row[:-1]), decode_array(row[-1])
+
+    def read_histories(self, algorithm: str = None) -> dict:
+        """Historie zbieżności {(scenario, gw, run, algorithm): wektor best fitness per epoka}."""
+        return dict(self.iter_histories(algorithm))
+
+    def history_lengths(self) -> dict:
+        """Najdłuższa historia (liczba epok) per (scenario, gw, algorithm), bez wczytywania historii."""
+        if "history" not in self._columns:
+            return {}
+        itemsize = np.dtype(ARRAY_DTYPE).itemsize
+        rows = self.conn.execute("SELECT scenario, gw, algorithm, MAX(length(history)) FROM runs "
+                                 "WHERE history IS NOT NULL GROUP BY scenario, gw, algorithm")
+        return {tuple(row[:-1]): row[-1] // itemsize for row in rows}
+
+    def read_elites(self, scenarios: list[str], run: int, algorithm: str = None) -> list[tuple[int, np.ndarray]]:
+        """
+        Elitarne rozmieszczenia (kolumna elite) z danego runu wskazanych scenariuszy, od najlepszego
+        fitness: lista (N, indeksy (E, N+K)). algorithm: tylko elity tego algorytmu (None -> wszystkich).
+        """
+        if "elite" not in self._columns or not scenarios:
+            return []
+        marks = ", ".join("?" for _ in scenarios)
+        where, params = f"scenario IN ({marks}) AND run = ?", [*scenarios, run]
+        if algorithm is not None:
+            where += " AND algorithm = ?"
+            params.append(algorithm)
+        rows = self.conn.execute(
+            f"SELECT N, K, elite FROM runs WHERE {where} AND elite IS NOT NULL ORDER BY fitness_mealpy", params)
+        return [(N, decode_array(blob).reshape(-1, N + K).astype(np.int64)) for N, K, blob in rows]
+
+    def completed_keys(self) -> set[tuple]:
+        key_sql = ", ".join(KEY_COLUMNS)
+        return set(self.conn.execute(f"SELECT {key_sql} FROM runs"))
+
+    def read_df(self, blobs: bool = True) -> pd.DataFrame:
+        """
+        Wszystkie rekordy (także z przerwanych przebiegów) w formacie długim.
+        blobs=False pomija kolumny tablicowe (historie, elity) - zwykle największą część magazynu.
+        """
+        cols = "*" if blobs else ", ".join(f'"{c}"' for c in self._scalar_columns())
+        df = pd.read_sql_query(f"SELECT {cols} FROM runs ORDER BY scenario, gw, run, algorithm", self.conn)
+        if "feas" in df.columns:
+            df["feas"] = df["feas"].astype(bool)
+        return df
+
+    def iter_df(self, columns: list[str], chunksize: int = 10_000):
+        """
+        Rekordy w porcjach po chunksize wierszy (DataFrame z kolumnami columns; brakujące -> NaN),
+        żeby agregacja nie trzymała całego magazynu w pamięci.
+        """
+        present = [c for c in columns if c in self._columns]
+        if not present:
+            return
+        col_sql = ", ".join(f'"{c}"' for c in present)
+        for chunk in pd.read_sql_query(f"SELECT {col_sql} FROM runs", self.conn, chunksize=chunksize):
+            if "feas" in chunk.columns:
+                chunk["feas"] = chunk["feas"].astype(bool)
+            yield chunk.reindex(columns=columns)
+
+    def _scalar_columns(self) -> list[str]:
+        return [row[1] for row in self.conn.execute("PRAGMA table_info(runs)") if row[2] != "BLOB"]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def to_wide(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Skleja rekordy per algorytm w wiersze w stylu runs.csv
+    (jeden wiersz na scenariusz/GW/run, kolumny {algo}_E, {algo}_P, {algo}_feas, ...).
+    """
+    rows = {}
+    for rec in df.to_dict("records"):
+        key = (rec["scenario"], rec["gw"], rec["run"])
+        row = rows.setdefault(key, {
+            "scenario": rec["scenario"],
+            "gw": rec["gw"],
+            "run": rec["run"],
+            "seed": rec["seed"],
+            "N": rec["N"], "K": rec["K"], "M": rec["M"],
+        })
+        algo = rec["algorithm"]
+        row[f"{algo}_E"] = rec["E"]
+        row[f"{algo}_P"] = rec["P"]
+        row[f"{algo}_feas"] = rec["feas"]
+        if algo != "base":
+            row[f"{algo}_fitness_mealpy"] = rec["fitness_mealpy"]
+        # Czas życia (jeśli liczony)
+        for col in ("fnd", "hnd"):
+            if pd.notna(rec.get(col)):
+                row[f"{algo}_{col}"] = rec[col]
+    return pd.DataFrame(list(rows.values()))
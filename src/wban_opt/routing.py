@@ -0,0 +1,142 @@
+import numpy as np
+from collections import OrderedDict
+
+# direct - każdy CH wysyła prosto do najtańszej bramki
+# relay  - CH może przekazywać dane przez inne CH (najtańsza ścieżka do którejkolwiek bramki)
+ROUTING_MODES = ("direct", "relay")
+
+def bellman_ford(W: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """
+    Najtańszy koszt dotarcia do bramki (R, K): W (R, K, K) koszty krawędzi węzeł -> węzeł
+    (inf = brak krawędzi), cost (R, K) koszt bezpośrednio do bramki.
+    """
+    # Najkrótsza ścieżka ma co najwyżej K-1 przeskoków między węzłami
+    for _ in range(W.shape[-1] - 1):
+        new = np.minimum(cost, np.min(W + cost[:, None, :], axis=2))
+        if np.array_equal(new, cost):
+            break
+        cost = new
+    return cost
+
+def _relay_weights(ch: np.ndarray, e_tx_pool, E_elec: float) -> tuple[np.ndarray, np.ndarray]:
+    """TX między CH (R, K, K) i koszty krawędzi a -> b = TX(a, b) + RX w b (przekątna inf)."""
+    K = ch.shape[1]
+    e_tx = e_tx_pool[ch[:, :, None], ch[:, None, :]]
+    W = e_tx + E_elec
+    diag = np.arange(K)
+    W[:, diag, diag] = np.inf
+    return e_tx, W
+
+def relay_costs(ch_idx: np.ndarray, e_tx_pool, e_tx_gw: np.ndarray, E_elec: float) -> np.ndarray:
+    """
+    Najtańszy koszt (na bit) dostarczenia danych z każdego CH do bramki przy przekazywaniu CH -> CH.
+    Krawędź a -> b kosztuje TX(a, b) + RX w b (E_elec), krawędź a -> GW kosztuje e_tx_gw[a].
+    Bellman-Ford wektorowo po wierszach: ch_idx (..., K) -> koszty (..., K).
+    """
+    lead, K = ch_idx.shape[:-1], ch_idx.shape[-1]
+    ch = ch_idx.reshape(-1, K)
+    _, W = _relay_weights(ch, e_tx_pool, E_elec)
+    return bellman_ford(W, e_tx_gw[ch].astype(float)).reshape(lead + (K,))
+
+def next_hops(W: np.ndarray, cost: np.ndarray, direct: np.ndarray, key: np.ndarray) -> np.ndarray:
+    """
+    Następny przeskok najtańszej trasy (R, K): kolumna W, do której węzeł przekazuje dane, albo -1
+    (prosto do bramki). cost z bellman_ford(W, direct); key (R, K) - unikalne klucze węzłów (indeksy puli).
+    Remis -> bramka, potem najniższy key, więc drzewo tras nie zależy od kolejności węzłów.
+    """
+    via = W + cost[:, None, :]
+    order = np.argsort(key, axis=1)
+    pick = np.argmin(np.take_along_axis(via, order[:, None, :], axis=2), axis=2)
+    nxt = np.take_along_axis(order, pick, axis=1)
+    via_best = np.take_along_axis(via, nxt[..., None], axis=2)[..., 0]
+    return np.where(direct <= via_best, -1, nxt)
+
+def hop_energy(e_tx: np.ndarray, direct: np.ndarray, nxt: np.ndarray, out: np.ndarray, E_elec: float) -> np.ndarray:
+    """
+    Energia przekazywania (R, K) rozliczona na węzły, które wykonują każdy przeskok drzewa tras nxt:
+    węzeł odbiera ruch poprzedników (E_elec na bit) i nadaje go razem z własnym out do następnika
+    (e_tx) albo do bramki (direct). Suma po węzłach = sum(out * koszt trasy).
+    """
+    K = nxt.shape[1]
+    parent = (nxt[:, :, None] == np.arange(K)).astype(float)  # (R, K, K) węzeł -> następnik
+    total = out
+    # Głębokość drzewa <= K-1 przeskoków
+    for _ in range(K):
+        new = out + np.einsum('rjk,rj->rk', parent, total)
+        if np.array_equal(new, total):
+            break
+        total = new
+    tx = np.where(nxt < 0, direct, np.take_along_axis(e_tx, np.maximum(nxt, 0)[..., None], axis=2)[..., 0])
+    return total * tx + (total - out) * E_elec
+
+def relay_energy(ch_idx: np.ndarray, out: np.ndarray, e_tx_pool, e_tx_gw: np.ndarray, E_elec: float,
+                 cost: np.ndarray = None) -> np.ndarray:
+    """
+    Energia wysyłki out bitów (..., K) z każdego CH do bramki przy przekazywaniu CH -> CH,
+    rozliczona na CH: pośrednicy płacą RX i TX ruchu, który przekazują (patrz hop_energy).
+    cost: gotowe relay_costs dla ch_idx (None -> liczone).
+    """
+    lead, K = ch_idx.shape[:-1], ch_idx.shape[-1]
+    ch = ch_idx.reshape(-1, K)
+    e_tx, W = _relay_weights(ch, e_tx_pool, E_elec)
+    direct = e_tx_gw[ch].astype(float)
+    cost = bellman_ford(W, direct) if cost is None else cost.reshape(-1, K)
+    nxt = next_hops(W, cost, direct, ch)
+    return hop_energy(e_tx, direct, nxt, np.broadcast_to(out, ch_idx.shape).reshape(-1, K), E_elec).reshape(lead + (K,))
+
+class RouteCache:
+    """
+    LRU cache kosztów tras per zbiór CH.
+    Koszt trasy zależy tylko od zbioru CH (nie od sensorów ani kolejności CH),
+    więc kluczem są posortowane indeksy CH.
+    """
+
+    def __init__(self, maxsize: int = 50_000):
+        if maxsize <= 0:
+            raise ValueError("maxsize musi być > 0")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def costs(self, ch_idx: np.ndarray, compute_fn) -> np.ndarray:
+        """
+        Koszty (..., K) dla ch_idx (..., K) w kolejności wejścia.
+        Chybienia liczone jednym wywołaniem compute_fn(ch_sorted) na posortowanych wierszach.
+        """
+        K = ch_idx.shape[-1]
+        ch = ch_idx.reshape(-1, K)
+        order = np.argsort(ch, axis=1)
+        canon = np.take_along_axis(ch, order, axis=1)
+
+        out_sorted = np.empty(canon.shape)
+        pending = {}  # klucz -> wiersze
+        for i, row in enumerate(canon):
+            key = row.tobytes()
+            val = self._data.get(key)
+            if val is not None:
+                self._data.move_to_end(key)
+                out_sorted[i] = val
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+                self.misses += 1
+
+        if pending:
+            first = [rows[0] for rows in pending.values()]
+            new = compute_fn(canon[first])
+            for (key, rows), c in zip(pending.items(), new):
+                out_sorted[rows] = c
+                self._data[key] = c
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+        out = np.empty_like(out_sorted)
+        np.put_along_axis(out, order, out_sorted, axis=1)
+        return out.reshape(ch_idx.shape)
@@ -0,0 +1,125 @@
+import time
+import tracemalloc
+import numpy as np
+
+from .energy_model import EnergyParams
+from .objective import energy_and_penalty_from_x
+from .mealpy_runner import solve_ga, solve_pso
+from .local_search import solve_ls
+from .bench import make_bench_context
+
+# Domyślne siatki logarytmiczne (rozmiar puli, liczba sensorów, liczba CH)
+DEFAULT_M = (25, 100, 400, 1600)
+DEFAULT_N = (8, 32, 128)
+DEFAULT_K = (1, 4, 16)
+# Mierzone wielkości, dla których liczone są wykładniki skalowania
+SCALING_METRICS = ("s_per_eval", "peak_mem_bytes", "ctx_mem_bytes", "gap")
+
+def log_grid(lo: float, hi: float, n: int) -> tuple[int, ...]:
+    """n wartości całkowitych rozłożonych logarytmicznie w [lo, hi] (bez powtórzeń)."""
+    return tuple(dict.fromkeys(int(round(v)) for v in np.geomspace(lo, hi, n)))
+
+def scaling_scenarios(M_values=DEFAULT_M, N_values=DEFAULT_N, K_values=DEFAULT_K) -> list[dict]:
+    """
+    Scenariusze syntetyczne (format wpisów scenarios.yaml) z iloczynu siatek M x N x K,
+    tylko wykonalne (N + K <= M, K <= N).
+    """
+    return [{"name": f"X_M{M}_N{N}_K{K}", "N": N, "K": K, "M": M}
+            for M in M_values for N in N_values for K in K_values if N + K <= M and K <= N]
+
+def _run_ga(ctx, max_evals, pop_size, seed, info):
+    return solve_ga(ctx, epochs=max(1, max_evals // pop_size - 1), pop_size=pop_size, seed=seed, info=info)
+
+def _run_pso(ctx, max_evals, pop_size, seed, info):
+    return solve_pso(ctx, epochs=max(1, max_evals // pop_size - 1), pop_size=pop_size, seed=seed, info=info)
+
+def _run_ls(ctx, max_evals, pop_size, seed, info):
+    info["n_evals"] = max_evals
+    return solve_ls(ctx, max_evals=max_evals, seed=seed)
+
+def _build_and_run_memory(build, run) -> tuple[int, int]:
+    """
+    Szczytowa alokacja (bajty, tracemalloc) po budowie kontekstu i po całym przebiegu run(build())
+    w jednym pomiarze, więc drugi szczyt nigdy nie jest mniejszy od pierwszego.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        ctx = build()
+        _, ctx_peak = tracemalloc.get_traced_memory()
+        run(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ctx_peak, peak
+
+# Solvery mierzone przy stałym budżecie ewaluacji: fn(ctx, max_evals, pop_size, seed, info) -> (x, fitness)
+SCALING_SOLVERS = {"ga": _run_ga, "pso": _run_pso, "ls": _run_ls}
+
+def run_scaling(energy_params: EnergyParams, scenarios: list[dict], width_m: float = 0.6, height_m: float = 1.8,
+                algorithms=tuple(SCALING_SOLVERS), max_evals: int = 3000, pop_size: int = 30,
+                seeds=(0, 1, 2), log=print) -> list[dict]:
+    """
+    Każdy algorytm na każdym scenariuszu przy tym samym budżecie ewaluacji, na siatce body_map (grid_pool).
+    Rekord: czas na ewaluację, szczytowa pamięć budowy kontekstu i przebiegu razem (tracemalloc, osobny
+    przebieg dla pierwszego seeda; ctx_mem_bytes - sama budowa kontekstu)
+    i gap = E / najlepsza znana energia scenariusza (feasible, po wszystkich algorytmach i seedach) - 1
+    (NaN dla rozwiązań niewykonalnych).
+    """
+    records = []
+    for scen in scenarios:
+        M, N, K = scen["M"], scen["N"], scen["K"]
+        build = lambda: make_bench_context(M, N, K, energy_params, width_m, height_m)
+        ctx = build()
+        log(f"[scaling] M={M} N={N} K={K}")
+        batch = []
+        for algo in algorithms:
+            solver = SCALING_SOLVERS[algo]
+            # Tablice (M, M) kontekstu to główny koszt pamięci O(M^2) - mierzone razem z przebiegiem
+            ctx_mem, mem = _build_and_run_memory(build, lambda c: solver(c, max_evals, pop_size, seeds[0], {}))
+            for seed in seeds:
+                info = {}
+                t0 = time.perf_counter()
+                x, fitness = solver(ctx, max_evals, pop_size, seed, info)
+                wall = time.perf_counter() - t0
+                E, P, feas = energy_and_penalty_from_x(x, ctx)
+                batch.append({
+                    "scenario": scen["name"], "algorithm": algo, "seed": seed, "M": M, "N": N, "K": K,
+                    "n_evals": int(info["n_evals"]), "wall_s": wall, "s_per_eval": wall / info["n_evals"],
+                    "peak_mem_bytes": mem, "ctx_mem_bytes": ctx_mem, "fitness": float(fitness), "E": E, "feas": feas,
+                })
+        # Gap energii tylko dla rozwiązań feasible (fitness niewykonalnych to głównie kara)
+        best = min((r["E"] for r in batch if r["feas"]), default=np.nan)
+        for r in batch:
+            r["gap"] = r["E"] / best - 1.0 if r["feas"] else np.nan
+        records += batch
+    return records
+
+def scaling_exponents(records: list[dict], metric: str, dims=("M", "N", "K")) -> dict[str, dict]:
+    """
+    Empiryczne wykładniki: regresja log(metric) = c + sum_d b_d * log(d) po rekordach algorytmu
+    (mediana po seedach, bez NaN). Wymiary stałe w danych są pomijane. Wartości <= 0 (np. gap najlepszego
+    wyniku) nie mają logarytmu i są pomijane. Zwraca {algorytm: {wymiar: b, ..., "r2": R^2, "n": liczba punktów}}.
+    """
+    out = {}
+    for algo in dict.fromkeys(r["algorithm"] for r in records):
+        groups = {}
+        for r in records:
+            if r["algorithm"] == algo:
+                groups.setdefault(tuple(r[d] for d in dims), []).append(r[metric])
+        med = {k: np.nanmedian(v) if not np.all(np.isnan(v)) else np.nan for k, v in groups.items()}
+        keep = [k for k, m in med.items() if m > 0]
+        sizes = np.array(keep, dtype=float).reshape(-1, len(dims))
+        y = np.log([med[k] for k in keep])
+        varying = [i for i in range(len(dims)) if len(np.unique(sizes[:, i])) > 1]
+        res = {dims[i]: np.nan for i in range(len(dims))}
+        res.update({"r2": np.nan, "n": len(y)})
+        if len(y) > len(varying):
+            A = np.column_stack([np.ones(len(y))] + [np.log(sizes[:, i]) for i in varying])
+            coef, *_ = np.linalg.lstsq(A, y, rcond=None)
+            resid = y - A @ coef
+            ss_tot = np.sum((y - y.mean()) ** 2)
+            res.update({dims[i]: float(b) for i, b in zip(varying, coef[1:])})
+            res["r2"] = float(1.0 - np.sum(resid ** 2) / ss_tot) if ss_tot > 0 else np.nan
+        out[algo] = res
+    return out
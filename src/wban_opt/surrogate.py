@@ -0,0 +1,105 @@
+import numpy as np
+from scipy.spatial.distance import cdist
+
+# Klucze słownika surrogate (solve_mealpy / common.optimization.surrogate)
+SURROGATE_KEYS = ("k", "ratio", "warmup", "max_archive")
+
+class KNNSurrogate:
+    """
+    Model zastępczy k-NN nad cechami rozmieszczenia (indeksy puli po repair):
+    współrzędne CH posortowane leksykograficznie (kolejność genów bez znaczenia) oraz środek
+    i rozrzut współrzędnych SN - razem 2K + 4 liczb w metrach.
+    Predykcja: średnia log(fitness) k najbliższych (euklidesowo) ważona odwrotnością odległości
+    (odległość 0 -> wartość z archiwum). Dopasowanie przyrostowe: add() dokłada wiersze archiwum,
+    powyżej max_archive usuwane są najstarsze.
+    """
+
+    def __init__(self, points: np.ndarray, N: int, k: int = 10, max_archive: int = 5000):
+        self.points = points
+        self.N = N
+        self.k = k
+        self.max_archive = max_archive
+        self._feats = None
+        self._y = np.empty(0)
+
+    def __len__(self):
+        return len(self._y)
+
+    def features(self, idx: np.ndarray) -> np.ndarray:
+        """(P, N+K) indeksy -> (P, 2K + 4) cechy."""
+        ch = self.points[idx[:, self.N:]]
+        order = np.lexsort((ch[..., 1], ch[..., 0]), axis=-1)
+        ch = np.take_along_axis(ch, order[..., None], axis=1).reshape(len(idx), -1)
+        sn = self.points[idx[:, :self.N]]
+        return np.concatenate([ch, sn.mean(axis=1), sn.std(axis=1)], axis=1)
+
+    def add(self, idx: np.ndarray, fitness: np.ndarray):
+        feats = self.features(idx)
+        self._feats = feats if self._feats is None else np.concatenate([self._feats, feats])[-self.max_archive:]
+        y = np.log(np.maximum(np.asarray(fitness, dtype=float), 1e-300))
+        self._y = np.concatenate([self._y, y])[-self.max_archive:]
+
+    def predict(self, idx: np.ndarray) -> np.ndarray:
+        """Przewidywany fitness (P,) dla indeksów (P, N+K); archiwum nie może być puste."""
+        dist = cdist(self.features(idx), self._feats)
+        k = min(self.k, len(self._y))
+        near = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        w = 1.0 / np.maximum(np.take_along_axis(dist, near, axis=1), 1e-12)
+        return np.exp(np.sum(w * self._y[near], axis=1) / np.sum(w, axis=1))
+
+class SurrogateScreen:
+    """
+    Funkcja wsadowa X (P, D) -> fitness (P,) z preselekcją modelem zastępczym.
+    Prawdziwie oceniana jest część ratio kandydatów z najlepszą predykcją (co najmniej jeden),
+    pozostali dostają predykcję, ale nie lepszą niż najlepszy dotąd prawdziwy wynik,
+    więc g_best zawsze pochodzi z prawdziwej oceny. Dopóki archiwum ma mniej niż warmup
+    rozwiązań (domyślnie jedna populacja), oceniane jest wszystko.
+    true_fn: X -> fitness (np. objective_batch), decode_fn: X -> indeksy puli po repair.
+    Liczniki: n_true (prawdziwe oceny), n_skipped (tylko predykcja), trace [(n_true, best)] po każdym wsadzie.
+    """
+
+    def __init__(self, true_fn, decode_fn, points: np.ndarray, N: int, k: int = 10, ratio: float = 0.5,
+                 warmup: int = None, max_archive: int = 5000):
+        if not 0.0 < ratio <= 1.0:
+            raise ValueError(f"ratio musi być w (0, 1], jest {ratio}")
+        self.true_fn = true_fn
+        self.decode_fn = decode_fn
+        self.model = KNNSurrogate(points, N, k, max_archive)
+        self.ratio = ratio
+        self.warmup = warmup
+        self.n_true = 0
+        self.n_skipped = 0
+        self.best = np.inf
+        self.trace = []
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        X = np.atleast_2d(X)
+        P = len(X)
+        idx = self.decode_fn(X)
+        warmup = P if self.warmup is None else self.warmup
+        if len(self.model) < warmup:
+            chosen = np.arange(P)
+        else:
+            pred = self.model.predict(idx)
+            n_true = max(1, int(np.ceil(self.ratio * P)))
+            chosen = np.sort(np.argsort(pred, kind='stable')[:n_true])
+
+        fits = np.empty(P)
+        fits[chosen] = self.true_fn(X[chosen])
+        self.best = min(self.best, float(fits[chosen].min()))
+        if len(chosen) < P:
+            rest = np.setdiff1d(np.arange(P), chosen)
+            fits[rest] = np.maximum(pred[rest], np.nextafter(self.best, np.inf))
+        self.model.add(idx[chosen], fits[chosen])
+
+        self.n_true += len(chosen)
+        self.n_skipped += P - len(chosen)
+        self.trace.append((self.n_true, self.best))
+        return fits
+
+    def stats(self) -> dict:
+        return {"n_true_evals": self.n_true, "n_surrogate_skips": self.n_skipped}
+
+def evals_to_reach(trace: list[tuple[int, float]], target: float) -> int:
+    """Liczba prawdziwych ocen, po której best <= target (None, jeśli nie osiągnięto)."""
+    return next((n for n, best in trace if best <= target), None)
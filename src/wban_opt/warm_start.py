@@ -0,0 +1,51 @@
+import numpy as np
+from .local_search import indices_to_x
+
+def transfer_placement(sn_src: np.ndarray, ch_src: np.ndarray, N: int, K: int, M: int,
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Przenosi rozmieszczenie między scenariuszami na tej samej puli punktów (pula scenariusza
+    to pierwsze M punktów points_pool, więc indeks oznacza ten sam punkt ciała).
+    Zostają CH i sensory mieszczące się w nowej puli (nadmiar obcinany), brakujące miejsca
+    uzupełniane losowo wolnymi punktami. Zwraca indeksy (N+K,) bez powtórzeń.
+    """
+    ch = [int(c) for c in ch_src if c < M][:K]
+    sn = [int(s) for s in sn_src if s < M and s not in ch][:N]
+    n_sn, n_ch = N - len(sn), K - len(ch)
+    fill = rng.permutation(np.setdiff1d(np.arange(M), ch + sn))[:n_sn + n_ch].tolist()
+    return np.array(sn + fill[:n_sn] + ch + fill[n_sn:])
+
+def initial_population(sources: list[tuple[int, np.ndarray]], N: int, K: int, M: int, n_max: int,
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Populacja startowa z elit pokrewnych scenariuszy.
+    sources: lista (N_src, elite (E, N_src+K_src)) w kolejności ważności.
+    Zwraca X (P0, N+K) w [0, 1], P0 <= n_max, bez powtórzonych rozmieszczeń.
+    """
+    rows, seen = [], set()
+    for N_src, elite in sources:
+        for row in np.atleast_2d(elite):
+            idx = transfer_placement(row[:N_src], row[N_src:], N, K, M, rng)
+            key = idx.tobytes()
+            if key not in seen and len(rows) < n_max:
+                seen.add(key)
+                rows.append(idx)
+    if not rows:
+        return np.empty((0, N + K))
+    return indices_to_x(np.array(rows), M)
+
+def scenario_waves(scenarios: list[dict]) -> list[list[str]]:
+    """
+    Kolejność uruchamiania scenariuszy: każdy w fali po wszystkich scenariuszach z warm_start_from
+    (odwołania do nieznanych scenariuszy są pomijane). Cykl -> ValueError.
+    """
+    deps = {s['name']: [d for d in s.get('warm_start_from') or []] for s in scenarios}
+    deps = {name: [d for d in ds if d in deps and d != name] for name, ds in deps.items()}
+    waves, placed = [], set()
+    while len(placed) < len(deps):
+        wave = [name for name, ds in deps.items() if name not in placed and set(ds) <= placed]
+        if not wave:
+            raise ValueError(f"Cykl w warm_start_from: {sorted(set(deps) - placed)}")
+        waves.append(wave)
+        placed.update(wave)
+    return waves
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from dataclasses import replace
+from functools import partial
+from wban_opt.objective import ObjectiveContext
+from wban_opt.energy_model import EnergyParams
+from wban_opt.geometry import grid_pool
+
+# Parametry energii wspólne dla testów (jak w scenarios.yaml)
+ENERGY = EnergyParams(50e-9, 10e-12, 1.3e-15, 5e-9, 4000, 1.0)
+
+@pytest.fixture
+def make_ctx():
+    """
+    Fabryka ObjectiveContext na mapie 0.6 x 1.8 m z bramką w środku.
+    pool: "grid" (grid_pool), "random" (punkty z default_rng(seed)) albo gotowa tablica (M, 2);
+    n_regions: losowe kody regionów z tego samego generatora (po punktach). energy: nadpisane pola ENERGY; ep: całe EnergyParams.
+    Pozostałe argumenty trafiają do ObjectiveContext.
+    """
+    def make(M=30, N=8, K=1, pool="grid", seed=0, d_max=0.7, gw=((0.3, 0.9),), ep=ENERGY,
+             energy: dict = None, n_regions: int = None, **kw):
+        rng = np.random.default_rng(seed)
+        if isinstance(pool, np.ndarray):
+            points, M = pool, len(pool)
+        else:
+            points = grid_pool(M, 0.6, 1.8) if pool == "grid" else rng.random((M, 2)) * [0.6, 1.8]
+        if n_regions is not None:
+            kw["point_region"] = rng.integers(0, n_regions, M)
+        return ObjectiveContext(points_pool=points, N=N, K=K, gw_xy=np.array(gw),
+                                energy_params=replace(ep, **(energy or {})), d_max_sn_ch=d_max,
+                                penalty_weight=1e6, **kw)
+    return make
+
+@pytest.fixture
+def relay_line_ctx(make_ctx):
+    """
+    Dwa klastry na linii do bramki (0, 1.2): SN 0, 1 przy CH 4, SN 2, 3 przy CH 5 w połowie drogi.
+    Tani odbiór i drogi TX (~ d^2) -> przy routing="relay" CH 4 wysyła przez CH 5,
+    który staje się najbardziej obciążonym węzłem. Rozmieszczenie: sn = [0, 1, 2, 3], ch = [4, 5].
+    """
+    pool = np.array([[0.0, 0.0], [0.05, 0.0], [0.0, 0.6], [0.05, 0.6], [0.02, 0.02], [0.02, 0.62]])
+    return partial(make_ctx, pool=pool, N=4, K=2, gw=((0.0, 1.2),), d_max=0.4,
+                   energy={"E_elec": 1e-12, "E_fs": 1e-9, "E_mp": 1e-13})
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from wban_opt.aggregate import P2Quantile, RunningStats, summarize_runs, summary_frame, summarize_histories
+from wban_opt.results_store import ResultsStore
+from wban_opt.plotting import plot_energy_boxplot, plot_convergence_bands
+
+def test_p2_quantiles_track_exact_ones():
+    x = np.random.default_rng(0).lognormal(size=20_000)
+    sketch = P2Quantile([0.25, 0.5, 0.75])
+    for v in x:
+        sketch.update(v)
+    assert np.allclose(sketch.value(), np.quantile(x, [0.25, 0.5, 0.75]), rtol=0.02)
+
+    # Do 5 obserwacji - dokładnie; strumienie wektorowe (jeden kwantyl per kolumna)
+    X = np.random.default_rng(1).random((4, 3))
+    sketch = P2Quantile(0.5, (3,))
+    for row in X:
+        sketch.update(row)
+    assert np.allclose(sketch.value(), np.median(X, axis=0))
+
+def test_running_stats_merge_chunks():
+    x = np.random.default_rng(2).normal(5.0, 2.0, 1000)
+    stats = RunningStats()
+    for part in np.array_split(x, 7):
+        stats.update(part)
+    assert stats.n == 1000 and stats.mean == pytest.approx(x.mean()) and stats.std == pytest.approx(x.std(ddof=1))
+    assert (stats.min, stats.max) == (x.min(), x.max())
+    box = stats.box_stats("S1")
+    assert box["q1"] < box["med"] < box["q3"]
+
+def _fill(store, rng):
+    for run in range(12):
+        for algo in ("ga", "pso"):
+            feas = bool(rng.random() < 0.7)
+            store.append({"scenario": "S1", "gw": "GW1", "run": run, "algorithm": algo, "seed": run,
+                          "N": 8, "K": 1, "M": 20, "E": float(rng.random()), "P": 0.0 if feas else 1.0, "feas": feas,
+                          "fitness_mealpy": 0.0, "history": np.sort(rng.random(3 + run % 4))[::-1]})
+
+def test_summaries_match_in_memory_groupby(tmp_path):
+    with ResultsStore(tmp_path / "runs.sqlite") as store:
+        _fill(store, np.random.default_rng(3))
+        summaries = summarize_runs(store, chunksize=5)
+        convergence = summarize_histories(store)
+        df = store.read_df()
+        histories = store.read_histories()
+
+    frame = summary_frame(summaries).set_index(["scenario", "gw", "algorithm"])
+    for (s, gw, algo), g in df.groupby(["scenario", "gw", "algorithm"]):
+        row = frame.loc[(s, gw, algo)]
+        assert row["n_runs"] == len(g)
+        assert row["feasible_rate"] == pytest.approx(g["feas"].mean())
+        assert row["E_mean"] == pytest.approx(g.loc[g["feas"], "E"].mean())
+
+        c = convergence[(s, gw, algo)]
+        runs = [h for (s2, gw2, _, a), h in histories.items() if (s2, gw2, a) == (s, gw, algo)]
+        n = max(len(h) for h in runs)
+        curves = np.array([np.pad(h, (0, n - len(h)), mode='edge') for h in runs])
+        assert c.n_runs == len(runs)
+        assert np.array_equal(c.lo, curves.min(axis=0)) and np.array_equal(c.hi, curves.max(axis=0))
+
+def test_plots_render_from_summaries(tmp_path):
+    with ResultsStore(tmp_path / "runs.sqlite") as store:
+        _fill(store, np.random.default_rng(4))
+        summaries = summarize_runs(store)
+        convergence = summarize_histories(store)
+    stats = {algo: [summaries[("S1", "GW1", algo)].energy.box_stats("S1")] for algo in ("ga", "pso")}
+    plot_energy_boxplot(stats, ["S1"], "Energy", tmp_path / "box.png")
+    bands = {algo: (c.median.value(), c.lo, c.hi) for (_, _, algo), c in convergence.items()}
+    plot_convergence_bands(bands, "Convergence", tmp_path / "conv.png")
+    assert (tmp_path / "box.png").exists() and (tmp_path / "conv.png").exists()
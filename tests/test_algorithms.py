@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from wban_opt.algorithms import algorithm_specs, run_algorithm, supports_objective, DEFAULT_ALGORITHMS
+from wban_opt.mealpy_runner import solve_ga
+
+OPT = {"epochs": 5, "pop_size": 10, "cache_size": 0}
+
+def test_default_specs_match_previous_algorithm_list():
+    specs = algorithm_specs({})
+    assert list(specs) == [a["name"] for a in DEFAULT_ALGORITHMS]
+    assert specs["ga"]["solver"] == "mealpy"
+    assert not supports_objective(specs["ls"], "lifetime") and supports_objective(specs["ga"], "lifetime")
+
+def test_invalid_specs_rejected(make_ctx):
+    with pytest.raises(ValueError):
+        algorithm_specs({"algorithms": [{"name": "x", "solver": "nope"}]})
+    with pytest.raises(ValueError):
+        algorithm_specs({"algorithms": [{"name": "ga"}, {"name": "ga", "optimizer": "GA.BaseGA"}]})
+    spec = algorithm_specs({"algorithms": [{"optimizer": "Foo.Bar"}]})["bar"]
+    with pytest.raises(ValueError):
+        run_algorithm(spec, make_ctx(), OPT, 0, {})
+
+def test_registry_runs_mealpy_and_native_solvers(make_ctx):
+    ctx = make_ctx()
+    specs = algorithm_specs({"algorithms": [
+        {"name": "ga", "optimizer": "GA.BaseGA"},
+        {"optimizer": "DE.OriginalDE", "params": {"wf": 0.7}},
+        {"name": "ls"},
+    ]})
+    assert list(specs) == ["ga", "originalde", "ls"]
+    extra = {}
+    x, fit = run_algorithm(specs["ga"], ctx, OPT, 7, extra)
+    assert fit == solve_ga(ctx, epochs=5, pop_size=10, seed=7)[1]
+    assert extra["epochs_run"] == 5 and len(extra["history"]) == 5
+    for name in ("originalde", "ls"):
+        x, fit = run_algorithm(specs[name], ctx, OPT, 7, {})
+        assert x.shape == (ctx.get_D(),) and np.isfinite(fit)
+
+def test_portfolio_shares_budget_and_returns_winner(make_ctx):
+    spec = algorithm_specs({"algorithms": [{"name": "portfolio", "budget_s": 0.3, "rounds": 3, "members": [
+        {"name": "ga", "optimizer": "GA.BaseGA"}, {"name": "pso", "optimizer": "PSO.OriginalPSO"}]}]})["portfolio"]
+    extra = {}
+    x, fit = run_algorithm(spec, make_ctx(), {"epochs": 10_000, "pop_size": 10}, 1, extra)
+    assert extra["portfolio_winner"] in ("ga", "pso")
+    assert fit == min(extra["pf_ga_best"], extra["pf_pso_best"])
+    assert extra["pf_ga_epochs"] >= 3 and extra["pf_pso_epochs"] >= 3
+    assert extra["pf_ga_s"] + extra["pf_pso_s"] < 1.0
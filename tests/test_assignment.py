@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from wban_opt.geometry import grid_pool, pairwise_dist, PoolIndex, PairwiseOnDemand
+from wban_opt.assignment import assign_sensors_to_ch, assign_sensors_to_ch_idx
+
+@pytest.mark.parametrize("K", [64, 150, 700])
+def test_kdtree_assignment_matches_dense(K):
+    # Siatka -> dużo remisów odległości; wynik ma być identyczny z argmin po pełnej macierzy
+    # z CH posortowanymi po indeksie puli (remis -> najniższy indeks puli)
+    rng = np.random.default_rng(0)
+    pts = grid_pool(2000, 0.6, 1.8)
+    dist = pairwise_dist(pts, pts)
+    X = np.array([rng.permutation(2000)[:600 + K] for _ in range(3)])
+    sn, ch = X[:, :600], X[:, 600:]
+    order = np.argsort(ch, axis=1)
+    ch_sorted = np.take_along_axis(ch, order, axis=1)
+
+    ref_sorted = np.argmin(dist[sn[..., :, None], ch_sorted[..., None, :]], axis=-1)
+    ref = np.take_along_axis(order, ref_sorted, axis=1)
+    assert np.array_equal(assign_sensors_to_ch_idx(sn, ch, dist, PoolIndex(pts)), ref)
+    assert np.array_equal(assign_sensors_to_ch_idx(sn, ch, PairwiseOnDemand(pts), PoolIndex(pts)), ref)
+    for r in range(3):
+        assert np.array_equal(assign_sensors_to_ch(pts[sn[r]], pts[ch_sorted[r]]), ref_sorted[r])
+
+def test_tie_break_ignores_ch_order():
+    # Sensor 0 w połowie drogi między CH 2 i 4: wygrywa niższy indeks puli niezależnie od slotu
+    pts = np.array([[0.0, 0.0], [0.5, 0.0], [-1.0, 0.0], [3.0, 0.0], [1.0, 0.0]])
+    dist = pairwise_dist(pts, pts)
+    sn = np.array([0, 1, 3])
+    for ch in (np.array([2, 4]), np.array([4, 2])):
+        assigned = ch[assign_sensors_to_ch_idx(sn, ch, dist)]
+        assert np.array_equal(assigned, [2, 4, 4])
+
+def test_small_k_stays_dense():
+    pts = grid_pool(20, 0.6, 1.8)
+    dist = pairwise_dist(pts, pts)
+    sn, ch = np.arange(8), np.array([10, 15])
+    out = assign_sensors_to_ch_idx(sn, ch, dist, PoolIndex(pts))
+    assert np.array_equal(out, assign_sensors_to_ch(pts[sn], pts[ch]))
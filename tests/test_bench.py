@@ -0,0 +1,25 @@
+import json
+from wban_opt.bench import run_suite, write_report, compare_reports
+from wban_opt.energy_model import EnergyParams
+
+def test_bench_suite_writes_report(tmp_path):
+    ep = EnergyParams(50e-9, 10e-12, 0.0013e-12, 5e-9, 4000, 1.0)
+    records = run_suite(ep, pool_sizes=(20,), nk=((8, 1),), epochs=2, pop_size=10,
+                        min_time=0.001, log=lambda *_: None)
+
+    cases = {r["case"] for r in records}
+    assert {"energy_and_penalty_from_x", "energy_and_penalty_batch", "repair_unique",
+            "assign_sensors_to_ch", "solve_ga", "solve_pso", "warm_start_cold", "warm_start_warm",
+            "surrogate_plain_ga", "surrogate_screened_pso"} <= cases
+    assert all(r["evals_per_sec"] > 0 and r["peak_mem_bytes"] >= 0 for r in records)
+    # Pełne przebiegi solverów zawsze coś alokują - zero oznaczałoby brak pomiaru
+    assert all(r["peak_mem_bytes"] > 0 for r in records if r["case"].startswith(("warm_start_", "surrogate_")))
+
+    path = write_report(records, tmp_path / "bench.json")
+    report = json.loads(path.read_text())
+    assert len(report["records"]) == len(records)
+
+    # Sztuczne spowolnienie -> wykryta regresja
+    slower = {"records": [dict(r, evals_per_sec=r["evals_per_sec"] / 2) for r in records]}
+    assert len(compare_reports(report, slower)) == len(records)
+    assert compare_reports(report, report) == []
@@ -0,0 +1,51 @@
+import numpy as np
+from wban_opt.cache import FitnessCache
+from wban_opt.objective import energy_and_penalty_batch
+
+def test_cache_canonical_key_and_stats(make_ctx):
+    ctx = make_ctx(M=20, N=4, K=2, pool="random", d_max=0.4)
+    cache = FitnessCache(maxsize=10)
+    # Ten sam zbiór SN i CH w innej kolejności -> jeden klucz
+    X = np.array([[1, 2, 3, 4, 10, 11],
+                  [4, 3, 2, 1, 11, 10],
+                  [5, 6, 7, 8, 12, 13]]) / 20 + 0.01
+
+    E_ref, P_ref, _ = energy_and_penalty_batch(X, ctx)
+    E, P, _ = energy_and_penalty_batch(X, ctx, cache=cache)
+    assert np.allclose(E, E_ref, rtol=1e-12)
+    assert np.allclose(P, P_ref, rtol=1e-12)
+    assert E[0] == E[1]
+    assert cache.stats()["cache_misses"] == 2
+    assert cache.stats()["cache_hits"] == 1
+
+    energy_and_penalty_batch(X, ctx, cache=cache)
+    assert cache.hits == 4
+    assert len(cache) == 2
+
+def test_cache_lru_eviction():
+    cache = FitnessCache(maxsize=2)
+    fn = lambda sn, ch: (sn.sum(axis=1).astype(float), np.zeros(len(sn)))
+    for i in range(3):
+        cache.evaluate(np.array([i]), np.array([10]), fn)
+    assert len(cache) == 2
+    cache.evaluate(np.array([0]), np.array([10]), fn)
+    assert cache.misses == 4
+
+def test_cache_matches_uncached_with_distance_ties(make_ctx):
+    # Siatka -> dużo remisów odległości SN -> CH; chybienie cache musi dać dokładnie wynik bez cache
+    ctx = make_ctx(M=50, N=20, K=4, pool="grid")
+    rng = np.random.default_rng(3)
+    idx = np.array([rng.permutation(50)[:24] for _ in range(500)])
+    X = (idx + 0.5) / 50
+    E_ref, P_ref, _ = energy_and_penalty_batch(X, ctx)
+    cache = FitnessCache()
+    E, P, _ = energy_and_penalty_batch(X, ctx, cache=cache)
+    assert cache.hits == 0
+    assert np.array_equal(E, E_ref) and np.array_equal(P, P_ref)
+
+    # Te same rozmieszczenia z odwróconą kolejnością CH -> trafienia, to samo przypisanie
+    X_perm = np.concatenate([X[:, :20], X[:, :19:-1]], axis=1)
+    E_perm, P_perm, _ = energy_and_penalty_batch(X_perm, ctx)
+    E_hit, P_hit, _ = energy_and_penalty_batch(X_perm, ctx, cache=cache)
+    assert cache.hits == 500
+    assert np.array_equal(P_hit, P_perm) and np.allclose(E_hit, E_perm, rtol=1e-12, atol=0)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from functools import partial
+from wban_opt.objective import energy_and_penalty_batch, energy_and_penalty_from_indices
+from wban_opt.geometry import pairwise_dist
+from wban_opt.feasibility import range_neighbors, dominating_ch, FeasibilityTables
+from wban_opt.local_search import solve_ls
+
+@pytest.fixture
+def make_ctx(make_ctx):
+    """Pula losowa 60 punktów w 4 regionach, zasięg 0.35 m."""
+    return partial(make_ctx, M=60, N=12, K=3, pool="random", d_max=0.35, n_regions=4)
+
+def test_neighbors_and_dominance_match_brute_force(make_ctx):
+    ctx = make_ctx()
+    near = pairwise_dist(ctx.points_pool, ctx.points_pool) <= ctx.d_max_sn_ch
+    assert np.array_equal(range_neighbors(ctx.points_pool, ctx.d_max_sn_ch).toarray(), near)
+
+    dist = pairwise_dist(ctx.points_pool, ctx.points_pool)
+    ch_map = dominating_ch(range_neighbors(ctx.points_pool, ctx.d_max_sn_ch), ctx.e_tx_gw, ctx.points_pool)
+    assert np.any(ch_map != np.arange(len(ch_map)))
+    for a, b in enumerate(ch_map):
+        # Zastępca: w zasięgu, żaden inny sąsiad a nie jest od niego dalej, uplink nie droższy; sam bez zastępcy
+        others = near[a] & (np.arange(len(ch_map)) != a)
+        assert near[a, b] and np.all(dist[b, others] <= dist[a, others] + 1e-12)
+        assert ctx.e_tx_gw[b] <= ctx.e_tx_gw[a] and ch_map[b] == b
+
+def test_default_context_has_no_tables(make_ctx):
+    assert make_ctx().feas_tables is None
+
+def test_repair_gives_unique_feasible_placements(make_ctx):
+    ctx = make_ctx(feasibility=True)
+    tables = ctx.feas_tables
+    X = np.random.default_rng(1).random((100, ctx.get_D()))
+    E, P, feas = energy_and_penalty_batch(X, ctx)
+    assert feas.mean() > energy_and_penalty_batch(X, make_ctx())[2].mean()
+
+    idx = tables.repair(np.floor(X * 60).astype(int), 60)
+    assert all(len(np.unique(row)) == ctx.get_D() for row in idx)
+    # Rzut CH bez kolizji -> kandydaci; geny kolidujące zostają na swoich pozycjach
+    assert np.isin(idx[:, ctx.N:], tables.ch_candidates).mean() > 0.9
+    E2, P2 = energy_and_penalty_from_indices(idx[:, :ctx.N], idx[:, ctx.N:], ctx)
+    assert np.allclose(E2, E) and np.array_equal(P2, P)
+    # Repair jest deterministyczny (strategia "hash")
+    assert np.array_equal(tables.repair(np.floor(X * 60).astype(int), 60), idx)
+
+def test_range_repair_prefers_same_region():
+    # CH w środku, dwa wolne punkty w zasięgu: bliższy z innego regionu, dalszy z regionu sensora
+    points = np.array([[0.0, 0.0], [0.1, 0.0], [-0.2, 0.0], [1.0, 0.0]])
+    region = np.array([0, 1, 0, 0])
+    tables = FeasibilityTables.build(points, N=1, K=1, d_max=0.3, uplink_cost=np.zeros(4), region=region)
+    fixed = tables.repair_range(np.array([[3, 0]]))
+    assert fixed.tolist() == [[2, 0]]
+
+def test_sampling_and_local_search_stay_feasible(make_ctx):
+    ctx = make_ctx(feasibility=True)
+    idx = ctx.feas_tables.sample(ctx.K, np.random.default_rng(2))
+    assert len(np.unique(idx)) == ctx.get_D()
+    assert np.isin(idx[ctx.N:], ctx.feas_tables.ch_candidates).all()
+    _, P = energy_and_penalty_from_indices(idx[:ctx.N], idx[ctx.N:], ctx)
+    assert P == 0.0
+
+    x, fit = solve_ls(ctx, max_evals=300, seed=0)
+    E, P, feas = energy_and_penalty_batch(x, ctx)
+    assert feas[0] and np.isclose(E[0], fit)
+
+def test_no_pruning_for_relay_routing(make_ctx):
+    tables = make_ctx(feasibility=True, routing="relay").feas_tables
+    assert np.array_equal(tables.ch_map, np.arange(60)) and len(tables.ch_candidates) == 60
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from wban_opt.islands import solve_islands, topology_targets, topology_sources, island_seeds
+from wban_opt.algorithms import algorithm_specs, run_algorithm
+
+def test_topologies():
+    assert topology_targets("ring", 3) == [[1], [2], [0]]
+    assert topology_sources(topology_targets("star", 3)) == [[1, 2], [0], [0]]
+    assert all(len(t) == 3 for t in topology_targets("full", 4))
+    assert topology_targets("ring", 1) == [[]]
+    with pytest.raises(ValueError):
+        topology_targets("torus", 4)
+    assert island_seeds(7, 3) == island_seeds(7, 3) and len(set(island_seeds(7, 3))) == 3
+
+@pytest.mark.parametrize("optimizer", ["GA.BaseGA", "PSO.OriginalPSO"])
+@pytest.mark.parametrize("topology", ["ring", "star"])
+def test_processes_match_sequential_run(optimizer, topology, make_ctx):
+    ctx = make_ctx(N=12, K=2, d_max=0.4)
+    runs = []
+    for processes in (True, False):
+        info = {}
+        x, fitness = solve_islands(ctx, optimizer, epochs=8, pop_size=10, seed=5, n_islands=3,
+                                   topology=topology, interval=2, info=info, processes=processes)
+        runs.append((x, fitness, info))
+    (x, fitness, info), (x0, fitness0, info0) = runs
+    assert np.array_equal(x, x0) and fitness == fitness0
+    assert np.array_equal(info["history"], info0["history"]) and info["n_evals"] == info0["n_evals"]
+    assert info["history"][-1] == fitness and np.all(np.diff(info["history"]) <= 0)
+
+def test_migration_changes_search_and_counts_evals(make_ctx):
+    ctx = make_ctx(N=12, K=2, d_max=0.4)
+    infos = {}
+    for topology in ("none", "full"):
+        infos[topology] = {}
+        solve_islands(ctx, "GA.BaseGA", epochs=6, pop_size=10, seed=1, n_islands=3, topology=topology,
+                      interval=2, n_migrants=2, info=infos[topology], processes=False)
+    # Migracje w epokach 2 i 4: każda wyspa ocenia 2 x 2 migrantów
+    assert infos["full"]["n_evals"] - infos["none"]["n_evals"] == 2 * 3 * 2 * 2
+    with pytest.raises(ValueError):
+        solve_islands(ctx, "GA.BaseGA", epochs=2, pop_size=4, n_islands=3, topology="full", n_migrants=2)
+
+def test_registered_with_warm_start(make_ctx):
+    spec = algorithm_specs({"algorithms": [{"name": "islands_ga", "solver": "islands", "optimizer": "GA.BaseGA",
+                                            "n_islands": 2, "interval": 2, "processes": False}]})["islands_ga"]
+    ctx = make_ctx(N=12, K=2, d_max=0.4)
+    init = np.random.default_rng(0).random((4, ctx.get_D()))
+    extra = {}
+    x, fitness = run_algorithm(spec, ctx, {"epochs": 4, "pop_size": 10}, 3, extra, init=init)
+    assert extra["n_islands"] == 2 and extra["epochs_run"] == 4 and len(x) == ctx.get_D()
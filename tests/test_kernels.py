@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from functools import partial
+from wban_opt.objective import energy_and_penalty_batch, energy_and_penalty_from_x
+from wban_opt.kernels import resolve_backend, HAVE_NUMBA
+
+@pytest.fixture
+def make_ctx(make_ctx):
+    """Pula losowa 80 punktów, dwie bramki, zasięg 0.3 m."""
+    return partial(make_ctx, M=80, N=30, K=5, pool="random", d_max=0.3, gw=((0.3, 0.9), (0.3, 0.1)))
+
+def test_backend_resolution(make_ctx):
+    assert resolve_backend("numpy", True) == "numpy"
+    assert resolve_backend("auto", False) == "numpy"
+    assert resolve_backend("auto", True) == ("numba" if HAVE_NUMBA else "numpy")
+    with pytest.raises(ValueError):
+        resolve_backend("cuda", True)
+    if not HAVE_NUMBA:
+        with pytest.raises(ImportError):
+            make_ctx(backend="numba")
+
+@pytest.mark.parametrize("routing", ["direct", "relay"])
+@pytest.mark.parametrize("K", [1, 5, 12])
+def test_numba_matches_numpy(routing, K, make_ctx):
+    pytest.importorskip("numba")
+    ref, fast = make_ctx(K=K, routing=routing, backend="numpy"), make_ctx(K=K, routing=routing, backend="numba")
+    assert fast.kernel_backend == "numba"
+    X = np.random.default_rng(K).random((64, ref.get_D()))
+
+    E_ref, P_ref, F_ref = energy_and_penalty_batch(X, ref)
+    E, P, F = energy_and_penalty_batch(X, fast)
+    assert np.allclose(E, E_ref, rtol=1e-12, atol=0) and np.allclose(P, P_ref, rtol=1e-12, atol=0)
+    assert np.array_equal(F, F_ref)
+    # Pojedyncze rozmieszczenie (ścieżka skalarna)
+    (e, p, f), (e_ref, p_ref, f_ref) = energy_and_penalty_from_x(X[0], fast), energy_and_penalty_from_x(X[0], ref)
+    assert e == pytest.approx(e_ref, rel=1e-12) and p == pytest.approx(p_ref, rel=1e-12) and f == f_ref
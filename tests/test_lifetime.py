@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from wban_opt.objective import energy_and_penalty_from_indices, objective_batch
+from wban_opt.lifetime import simulate_lifetime, simulate_lifetime_from_x, fnd_closed_form
+
+def _placements(ctx, B=8, seed=0):
+    rng = np.random.default_rng(seed)
+    M = ctx.points_pool.shape[0]
+    X = np.array([rng.permutation(M)[:ctx.get_D()] for _ in range(B)])
+    return X[:, :ctx.N], X[:, ctx.N:]
+
+@pytest.mark.parametrize("routing", ["direct", "relay"])
+def test_fnd_matches_closed_form_without_rotation(routing, make_ctx):
+    # Tani odbiór -> przekazywanie przez CH bywa tańsze niż bezpośredni uplink
+    ctx = make_ctx(M=50, N=12, K=4, energy={"E_elec": 1e-14}, routing=routing)
+    sn, ch = _placements(ctx)
+    if routing == "relay":
+        assert np.any(ctx.uplink_costs(ch) < ctx.e_tx_gw[ch])
+    res = simulate_lifetime(sn, ch, ctx)
+    assert np.array_equal(res.fnd, fnd_closed_form(sn, ch, ctx))
+    assert np.all(res.hnd >= res.fnd)
+    # Do pierwszej śmierci każda runda zużywa tyle, ile liczy funkcja celu "energy"
+    t = int(res.fnd.min())
+    short = simulate_lifetime(sn, ch, ctx, max_rounds=t)
+    E, _ = energy_and_penalty_from_indices(sn, ch, ctx)
+    used = ctx.energy_params.E_init * ctx.get_D() - short.residual.sum(axis=1)
+    assert np.allclose(used, t * E, rtol=1e-9)
+
+def test_relay_head_pays_for_forwarded_traffic(relay_line_ctx):
+    sn, ch = np.array([[0, 1, 2, 3]]), np.array([[4, 5]])
+    direct = simulate_lifetime(sn, ch, relay_line_ctx(routing="direct"))
+    ctx = relay_line_ctx(routing="relay")
+    res = simulate_lifetime(sn, ch, ctx)
+    # Bez przekazywania pierwszy umiera daleki CH, z przekazywaniem - pośrednik (węzeł 5)
+    assert direct.death_round[0, 4] == direct.fnd[0] < direct.death_round[0, 5]
+    assert res.death_round[0, 5] == res.fnd[0] < res.death_round[0, 4]
+    assert np.array_equal(res.fnd, fnd_closed_form(sn, ch, ctx))
+
+def test_rotation_extends_half_node_death(make_ctx):
+    ctx = make_ctx(M=50, N=12, K=3)
+    sn, ch = _placements(ctx)
+    plain = simulate_lifetime(sn, ch, ctx)
+    rotated = simulate_lifetime(sn, ch, ctx, rotation=True, rotate_every=10)
+    assert np.all(rotated.hnd >= plain.hnd)
+    assert np.all(rotated.death_round[rotated.death_round >= 0] <= rotated.hnd.max())
+
+def test_long_horizon_is_censored_and_fast(make_ctx):
+    ctx = make_ctx(M=50, N=12, K=3, energy={"E_init": 500.0})
+    sn, ch = _placements(ctx, B=30)
+    res = simulate_lifetime(sn, ch, ctx, max_rounds=100_000, rotation=True, rotate_every=100)
+    assert np.all(res.censored) and np.all(res.hnd == 100_000)
+    assert np.all(res.residual > 0)
+
+def test_lifetime_objective_and_from_x(make_ctx):
+    ctx = make_ctx(M=50, N=12, K=3, objective="lifetime")
+    X = np.random.default_rng(1).random((5, ctx.get_D()))
+    fit = objective_batch(X, ctx)
+    res = simulate_lifetime_from_x(X, ctx)
+    # Bez kary: fitness = energia rundy wąskiego gardła ~ E_init / FND
+    feasible = fit < 1.0
+    assert np.all(np.floor(ctx.energy_params.E_init / fit[feasible]) == res.fnd[feasible])
@@ -0,0 +1,49 @@
+import numpy as np
+from wban_opt.objective import energy_and_penalty_from_indices, energy_and_penalty_from_x
+from wban_opt.incremental import IncrementalEvaluator, MoveSN, MoveCH, SwapRoles
+from wban_opt.local_search import solve_ls
+
+def _full(ctx, state):
+    E, P = energy_and_penalty_from_indices(state.sn, state.ch, ctx)
+    return E + P
+
+def test_incremental_deltas_match_full_evaluation(make_ctx):
+    ctx = make_ctx(M=15, N=6, K=2, pool="random", d_max=0.4)
+    rng = np.random.default_rng(1)
+    idx = rng.permutation(15)[:8]
+    state = IncrementalEvaluator(ctx, idx[:6], idx[6:])
+    assert np.isclose(state.fitness, _full(ctx, state), rtol=1e-12)
+
+    for _ in range(60):
+        free = state.free_indices()
+        before = state.fitness
+        kind = rng.integers(3)
+        if kind == 0:
+            move = MoveSN(rng.integers(6), rng.choice(free))
+        elif kind == 1:
+            move = MoveCH(rng.integers(2), rng.choice(free))
+        else:
+            move = SwapRoles(rng.integers(6), rng.integers(2))
+        delta = state.delta(move)
+        assert state.fitness == before  # delta() nie zmienia stanu
+        assert state.apply_move(move) == delta
+
+        full = _full(ctx, state)
+        assert np.isclose(state.fitness, full, rtol=1e-12)
+        assert np.isclose(before + delta, full, rtol=1e-12, atol=1e-15)
+        assert np.array_equal(state.counts, np.bincount(state.assign, minlength=2))
+        assert state.occupied.sum() == 8
+
+    # Stan przyrostowy zgadza się z pełnym przeliczeniem
+    assign, dist = state.assign.copy(), state.dist.copy()
+    state.resync()
+    assert np.array_equal(assign, state.assign)
+    assert np.array_equal(dist, state.dist)
+
+def test_solve_ls_returns_decodable_solution(make_ctx):
+    ctx = make_ctx(M=15, N=6, K=2, pool="random", d_max=0.4)
+    x, fit = solve_ls(ctx, max_evals=300, seed=3)
+    E, P, _ = energy_and_penalty_from_x(x, ctx)
+    assert np.isclose(E + P, fit, rtol=1e-12)
+    # Ten sam seed -> ten sam wynik
+    assert solve_ls(ctx, max_evals=300, seed=3)[1] == fit
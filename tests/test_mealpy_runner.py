@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from wban_opt.mealpy_runner import solve_ga, solve_pso, solve_mealpy, MealpyStepper
+
+@pytest.mark.parametrize("solver", [solve_ga, solve_pso])
+def test_history_and_no_stop_matches_plain_run(solver, make_ctx):
+    ctx = make_ctx()
+    info = {}
+    x, fit = solver(ctx, epochs=6, pop_size=10, seed=1, info=info)
+    x0, fit0 = solver(ctx, epochs=6, pop_size=10, seed=1)
+    assert np.array_equal(x, x0) and fit == fit0
+    h = info["history"]
+    assert h.dtype == np.float64 and len(h) == info["epochs_run"] == 6
+    assert np.all(np.diff(h) <= 0) and h[-1] == fit
+    assert info["stop_reason"] == "epochs" and info["n_evals"] == 10 * 7
+
+@pytest.mark.parametrize("stop, reason", [
+    ({"max_early_stop": 3}, "no_improve"),
+    ({"target_fitness": 1.0}, "target"),
+    ({"max_fe": 50}, "max_fe"),
+])
+def test_early_stopping_criteria(stop, reason, make_ctx):
+    info = {}
+    solve_ga(make_ctx(), epochs=500, pop_size=10, seed=2, stop=stop, info=info)
+    assert info["stop_reason"] == reason
+    assert info["epochs_run"] < 500
+    if reason == "max_fe":
+        assert 50 <= info["n_evals"] < 50 + 10
+    if reason == "no_improve":
+        assert np.all(info["history"][-4:] == info["history"][-1])
+
+def test_unknown_stop_key_rejected(make_ctx):
+    with pytest.raises(ValueError):
+        solve_pso(make_ctx(), epochs=2, pop_size=5, seed=0, stop={"patience": 3})
+
+@pytest.mark.parametrize("optimizer", ["GA.BaseGA", "PSO.OriginalPSO", "DE.OriginalDE"])
+def test_stepper_matches_solve(optimizer, make_ctx):
+    ctx = make_ctx()
+    run = MealpyStepper(ctx, optimizer, epochs=5, pop_size=10, seed=4)
+    while not run.done:
+        run.step()
+    x, fit = run.result()
+    x0, fit0 = solve_mealpy(ctx, optimizer, epochs=5, pop_size=10, seed=4)
+    assert np.array_equal(x, x0) and fit == fit0
+    assert run.history[-1] == fit
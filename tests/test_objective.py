@@ -28,4 +28,82 @@ def test_objective_calculation():
     
     assert P == 0.0
     assert feas is True
-    assert E > 0.0
\ No newline at end of file
+    assert E > 0.0
+
+
+def test_objective_batch_matches_scalar():
+    from wban_opt.objective import energy_and_penalty_batch
+
+    rng = np.random.default_rng(0)
+    points = rng.random((20, 2)) * [0.6, 1.8]
+    gw = np.array([[0.3, 0.9]])
+    ep = EnergyParams(50e-9, 10e-12, 0.0013e-12, 5e-9, 4000, 1.0)
+    ctx = ObjectiveContext(
+        points_pool=points,
+        N=5, K=2, gw_xy=gw,
+        energy_params=ep,
+        d_max_sn_ch=0.4,
+        penalty_weight=1e6
+    )
+
+    # Wiersze bez kolizji -> repair nie losuje, wyniki muszą się zgadzać
+    X = np.array([(rng.permutation(20)[:7] + 0.5) / 20 for _ in range(8)])
+    E_b, P_b, F_b = energy_and_penalty_batch(X, ctx)
+
+    for i, x in enumerate(X):
+        E, P, feas = energy_and_penalty_from_x(x, ctx)
+        assert np.isclose(E_b[i], E, rtol=1e-12)
+        assert np.isclose(P_b[i], P, rtol=1e-12)
+        assert F_b[i] == feas
+
+def test_indices_match_coordinate_reference(make_ctx):
+    from wban_opt.objective import energy_and_penalty_from_indices
+    from wban_opt.assignment import assign_sensors_to_ch
+    from wban_opt.penalties import penalty_range_sn_ch
+    from wban_opt.energy_model import calc_E_tx, calc_E_rx, calc_E_da
+
+    ctx = make_ctx(M=20, N=5, K=2, pool="random", d_max=0.4)
+    ep = ctx.energy_params
+    idx = np.random.default_rng(1).permutation(20)[:7]
+    sn_idx, ch_idx = idx[:5], idx[5:]
+
+    # Referencja: współrzędne + skalarne funkcje energii
+    sn_xy, ch_xy = ctx.points_pool[sn_idx], ctx.points_pool[ch_idx]
+    assignment = assign_sensors_to_ch(sn_xy, ch_xy)
+    E_ref = sum(calc_E_tx(ep.packet_bits, d, ep)
+                for d in np.linalg.norm(sn_xy - ch_xy[assignment], axis=1))
+    counts = np.bincount(assignment, minlength=ctx.K)
+    for j in range(ctx.K):
+        k = ep.packet_bits * counts[j]
+        d_gw = np.linalg.norm(ch_xy[j] - ctx.gw_xy[0])
+        E_ref += calc_E_rx(k, ep) + calc_E_da(k, ep) + calc_E_tx(k * ep.beta_agg, d_gw, ep)
+    P_ref = penalty_range_sn_ch(sn_xy, ch_xy, assignment, ctx.d_max_sn_ch, ctx.penalty_weight)
+
+    E, P = energy_and_penalty_from_indices(sn_idx, ch_idx, ctx)
+    assert np.isclose(E, E_ref, rtol=1e-12)
+    assert np.isclose(P, P_ref, rtol=1e-12)
+
+def test_on_demand_tables_match_precomputed(monkeypatch, make_ctx):
+    import wban_opt.objective as objective
+
+    X = np.random.default_rng(2).random((6, 7))
+    ctx = make_ctx(M=20, N=5, K=2, pool="random", d_max=0.4)
+    E_t, P_t, _ = objective.energy_and_penalty_batch(X, ctx, rng=np.random.default_rng(3))
+
+    monkeypatch.setattr(objective, "POOL_TABLE_MAX_M", 0)
+    ctx_lazy = make_ctx(M=20, N=5, K=2, pool="random", d_max=0.4)
+    assert not isinstance(ctx_lazy.dist_pool, np.ndarray)
+    E_l, P_l, _ = objective.energy_and_penalty_batch(X, ctx_lazy, rng=np.random.default_rng(3))
+
+    assert np.allclose(E_t, E_l, rtol=1e-12)
+    assert np.allclose(P_t, P_l, rtol=1e-12)
+
+def test_objective_is_deterministic(make_ctx):
+    from wban_opt.objective import objective_from_x, objective_batch
+
+    ctx = make_ctx(M=10, N=6, K=2, pool="random", d_max=0.4)
+    X = np.random.default_rng(4).random((5, 8))
+    f1 = [objective_from_x(x, ctx) for x in X]
+    f2 = [objective_from_x(x, ctx) for x in X]
+    assert f1 == f2
+    assert np.allclose(objective_batch(X, ctx), f1, rtol=1e-12)
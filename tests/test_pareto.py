@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from wban_opt.objective import (objectives_from_indices, energy_and_penalty_from_indices,
+                                 bottleneck_and_penalty_from_indices, MO_OBJECTIVES)
+from wban_opt.pareto import non_dominated_sort, ParetoArchive, dominates
+from wban_opt.nsga2 import solve_nsga2
+from wban_opt.results_store import ResultsStore
+
+def _brute_rank(F, CV):
+    rank = np.full(len(F), -1)
+    left = set(range(len(F)))
+    r = 0
+    while left:
+        idx = sorted(left)
+        front = [i for i in idx
+                 if not any(dominates(F[[j]], CV[[j]], F[[i]], CV[[i]])[0, 0] for j in idx)]
+        rank[front] = r
+        left -= set(front)
+        r += 1
+    return rank
+
+def test_non_dominated_sort_matches_brute_force():
+    rng = np.random.default_rng(0)
+    # Wartości całkowite -> sporo remisów w celach i CV
+    F = rng.integers(0, 5, size=(60, 3)).astype(float)
+    CV = rng.integers(0, 3, size=60) * (rng.random(60) < 0.3)
+    assert np.array_equal(non_dominated_sort(F, CV.astype(float)), _brute_rank(F, CV.astype(float)))
+
+def test_archive_keeps_only_non_dominated():
+    rng = np.random.default_rng(1)
+    archive = ParetoArchive(2)
+    for _ in range(5):
+        F = rng.random((30, 2))
+        archive.update(F, np.zeros(30), np.arange(30)[:, None])
+    # Ten sam punkt drugi raz nie wchodzi
+    assert archive.update(archive.F[:1], archive.CV[:1], archive.items[:1]) == 0
+    assert not dominates(archive.F, archive.CV, archive.F, archive.CV).any()
+
+    archive.max_size = 5
+    archive.update(np.array([[-1.0, 2.0]]), np.zeros(1), np.array([[99]]))
+    assert len(archive) <= 5
+
+def test_energy_max_node_counts_relay_load(relay_line_ctx):
+    ctx = relay_line_ctx(routing="relay")
+    ep = ctx.energy_params
+    sn, ch = np.array([0, 1, 2, 3]), np.array([4, 5])
+    F, _ = objectives_from_indices(sn, ch, ctx)
+    E, _ = energy_and_penalty_from_indices(sn, ch, ctx)
+    # CH 5 (pośrednik): własny klaster + odbiór i nadanie zagregowanego ruchu CH 4
+    k = 2 * ep.packet_bits
+    relay = k * (ep.E_elec + ep.E_agg) + ep.beta_agg * k * (ep.E_elec + 2 * ctx.e_tx_gw[5])
+    source = k * (ep.E_elec + ep.E_agg) + ep.beta_agg * k * ctx.e_tx_pool[4, 5]
+    assert relay > source
+    assert F[1] == pytest.approx(relay, rel=1e-12) and F[0] == pytest.approx(E, rel=1e-12)
+    assert bottleneck_and_penalty_from_indices(sn, ch, ctx)[0] == pytest.approx(relay, rel=1e-12)
+
+def test_nsga2_archive_matches_objectives(tmp_path, make_ctx):
+    ctx = make_ctx(M=40, N=10, K=2, d_max=0.5)
+    archive = solve_nsga2(ctx, epochs=5, pop_size=20, seed=3)
+    assert len(archive) > 0
+    sn, ch = archive.items[:, :ctx.N], archive.items[:, ctx.N:]
+    F, CV = objectives_from_indices(sn, ch, ctx)
+    assert np.allclose(F, archive.F) and np.allclose(CV, archive.CV)
+    # Pierwszy cel to ta sama energia co w trybie jednokryterialnym
+    E, _ = energy_and_penalty_from_indices(sn, ch, ctx)
+    assert np.allclose(F[:, 0], E)
+
+    # Ten sam seed -> to samo archiwum
+    again = solve_nsga2(ctx, epochs=5, pop_size=20, seed=3)
+    assert np.array_equal(again.F, archive.F)
+
+    key = {"scenario": "S1", "gw": "GW1", "run": 0, "algorithm": "nsga2"}
+    with ResultsStore(tmp_path / "runs.sqlite") as store:
+        store.append_pareto(key, archive.F, archive.CV, sn, ch)
+        store.append_pareto(key, archive.F, archive.CV, sn, ch)  # zapis ponowny zastępuje
+        df = store.read_pareto()
+    assert len(df) == len(archive)
+    assert np.allclose(df[list(MO_OBJECTIVES)].to_numpy(), archive.F)
+    assert df.loc[0, "sn_idx"] == " ".join(map(str, sn[0]))
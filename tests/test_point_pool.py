@@ -0,0 +1,46 @@
+import os
+import numpy as np
+from wban_opt.config import load_points
+from wban_opt.geometry import points_to_numpy
+from wban_opt.point_pool import PointPool, read_points_csv, load_point_pool, cache_dir_for
+
+def _write_csv(path, M=200, seed=0):
+    rng = np.random.default_rng(seed)
+    regions = np.array(["torso", "arm_l", "leg_r"])[rng.integers(3, size=M)]
+    xy = rng.random((M, 2))
+    with open(path, 'w') as f:
+        f.write("id,name,x,y,region\n")
+        for i in range(M):
+            f.write(f"{i},P_{i},{xy[i, 0]:.6f},{xy[i, 1]:.6f},{regions[i]}\n")
+
+def test_pool_matches_point_list(tmp_path):
+    path = tmp_path / "points.csv"
+    _write_csv(path)
+    points = load_points(path)
+    pool = read_points_csv(path)
+    assert len(pool) == len(points)
+    assert np.array_equal(pool.xy, points_to_numpy(points))
+    assert pool.to_points() == points
+    assert list(pool.region_names()) == [p.region for p in points]
+
+def test_cache_reused_and_invalidated(tmp_path):
+    path = tmp_path / "points.csv"
+    _write_csv(path)
+    pool = load_point_pool(path)
+    assert isinstance(pool.xy, np.memmap) and not pool.xy.flags.writeable
+    assert np.array_equal(pool.xy, read_points_csv(path).xy)
+
+    cache = cache_dir_for(path)
+    built = (cache / "xy.npy").stat().st_mtime_ns
+    # Ta sama treść, nowy mtime -> bez przebudowy
+    os.utime(path, ns=(built + 10**9, built + 10**9))
+    load_point_pool(path)
+    assert (cache / "xy.npy").stat().st_mtime_ns == built
+
+    # Zmieniona treść -> przebudowa
+    _write_csv(path, M=150, seed=1)
+    pool = load_point_pool(path)
+    assert len(pool) == 150
+    assert np.array_equal(pool.xy, read_points_csv(path).xy)
+    # Otwarcie samego cache (jak w procesie roboczym)
+    assert np.array_equal(PointPool.open(cache).ids, np.arange(150))
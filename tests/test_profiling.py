@@ -0,0 +1,35 @@
+import numpy as np
+from wban_opt import profiling
+from wban_opt.profiling import profile_stages, STAGES
+from wban_opt.objective import energy_and_penalty_batch, energy_and_penalty_from_x
+from wban_opt.mealpy_runner import solve_pso
+
+def test_profile_stages_counts_and_repair_share(make_ctx):
+    ctx = make_ctx(M=20, N=4, K=2, pool="random", d_max=0.4)
+    # Wiersz 0 bez duplikatów, wiersz 1 z duplikatem
+    X = np.array([[1, 2, 3, 4, 10, 11],
+                  [1, 1, 3, 4, 10, 11]]) / 20 + 0.01
+    E_ref, P_ref, _ = energy_and_penalty_batch(X, ctx)
+
+    with profile_stages() as prof:
+        E, P, _ = energy_and_penalty_batch(X, ctx)
+        energy_and_penalty_from_x(X[0], ctx)
+    assert profiling.get_profiler() is None
+    assert np.array_equal(E, E_ref) and np.array_equal(P, P_ref)
+
+    s = prof.summary()
+    for stage in ("decode", "repair", "assignment", "energy", "penalty"):
+        assert s[f"prof_{stage}_calls"] == 2
+    assert s["prof_cache_calls"] == 0
+    assert s["prof_n_evals"] == 3
+    assert np.isclose(s["prof_repair_share"], 1 / 3)
+    assert "prof_mealpy_overhead_s" not in s
+
+def test_profile_solver_overhead(make_ctx):
+    ctx = make_ctx(M=20, N=4, K=2, pool="random", d_max=0.4)
+    with profile_stages() as prof:
+        solve_pso(ctx, epochs=2, pop_size=5, seed=0)
+    s = prof.summary()
+    assert s["prof_n_evals"] == 15
+    assert s["prof_solver_s"] >= prof.stage_total(STAGES)
+    assert s["prof_mealpy_overhead_s"] >= 0.0
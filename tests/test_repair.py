@@ -30,4 +30,45 @@ def test_repair_unique_conflict():
     assert np.all(res < M)
     # 0 i 1 muszą zostać (ewentualnie przesunięte), jeden 0 musi zniknąć
     assert np.sum(res == 0) == 1
-    assert np.sum(res == 1) == 1
\ No newline at end of file
+    assert np.sum(res == 1) == 1
+
+
+def test_repair_unique_batch():
+    from wban_opt.repair import repair_unique_batch
+
+    M = 6
+    idx = np.array([[0, 0, 1, 1],
+                    [2, 3, 4, 5],
+                    [5, 5, 5, 5]])
+    res = repair_unique_batch(idx, M, rng=np.random.default_rng(1))
+
+    for row_in, row_out in zip(idx, res):
+        assert len(np.unique(row_out)) == len(row_out)
+        assert np.all(row_out < M)
+        # Pierwsze wystąpienie wartości zostaje na miejscu
+        assert row_out[0] == row_in[0]
+    assert np.array_equal(res[1], idx[1])
+
+@pytest.mark.parametrize("strategy", ["hash", "nearest"])
+def test_repair_deterministic_strategies(strategy):
+    from wban_opt.repair import repair_unique_batch, RepairWorkspace
+
+    M = 12
+    idx = np.random.default_rng(0).integers(0, M, size=(20, 8))
+    ws = RepairWorkspace()
+    res1 = repair_unique_batch(idx, M, strategy=strategy, workspace=ws)
+    res2 = repair_unique_batch(idx, M, strategy=strategy)
+
+    assert np.array_equal(res1, res2)
+    for row_in, row_out in zip(idx, res1):
+        assert len(np.unique(row_out)) == len(row_out)
+        # Wersja skalarna daje to samo co wsadowa
+        assert np.array_equal(repair_unique(row_in, M, strategy=strategy), row_out)
+
+def test_repair_nearest_picks_closest_free():
+    M = 10
+    idx = np.array([4, 4, 5, 4])
+    res = repair_unique(idx, M, strategy="nearest")
+    # 4 i 5 zajęte -> drugi duplikat 4 idzie na 3 (odległość 1),
+    # trzeci ma remis 2/6 (odległość 2) -> mniejszy indeks
+    assert list(res) == [4, 3, 5, 2]
@@ -0,0 +1,45 @@
+import numpy as np
+from wban_opt.results_store import ResultsStore, to_wide, decode_array
+from wban_opt.metrics import feasible_rates
+
+def _rec(run, algo, E, feas):
+    return {"scenario": "S1", "gw": "GW1", "run": run, "algorithm": algo,
+            "seed": 42 + run, "N": 8, "K": 1, "M": 20,
+            "E": E, "P": 0.0 if feas else 1.0, "feas": feas, "fitness_mealpy": np.float64(E)}
+
+def test_store_append_and_resume(tmp_path):
+    path = tmp_path / "runs.sqlite"
+    with ResultsStore(path) as store:
+        store.append(_rec(0, "ga", 0.5, True))
+        store.append(_rec(0, "pso", 0.6, np.bool_(False)))
+
+    # Ponowne otwarcie (restart) widzi zapisane klucze
+    with ResultsStore(path) as store:
+        assert store.completed_keys() == {("S1", "GW1", 0, "ga"), ("S1", "GW1", 0, "pso")}
+        store.append(_rec(1, "ga", 0.4, True))
+        df = store.read_df()
+
+    assert len(df) == 3
+    assert df["feas"].dtype == bool
+
+    wide = to_wide(df)
+    assert list(wide["run"]) == [0, 1]
+    assert wide.loc[0, "pso_feas"] == False
+    # Run 1 jest częściowy (brak PSO)
+    assert np.isnan(wide.loc[1, "pso_E"])
+
+    rates = feasible_rates(str(path))
+    assert rates[("S1", "GW1", "ga")] == 1.0
+    assert rates[("S1", "GW1", "pso")] == 0.0
+
+def test_store_history_blob_roundtrip(tmp_path):
+    h = np.array([3.0, 2.5, 2.5, 1e-3])
+    with ResultsStore(tmp_path / "runs.sqlite") as store:
+        store.append({**_rec(0, "ga", 0.5, True), "history": h})
+        store.append(_rec(0, "base", 0.9, True))
+        hist = store.read_histories()
+        df = store.read_df()
+    assert list(hist) == [("S1", "GW1", 0, "ga")]
+    assert np.array_equal(hist[("S1", "GW1", 0, "ga")], h)
+    assert len(decode_array(df.loc[df["algorithm"] == "base", "history"].iloc[0])) == 0
+    assert len(to_wide(df)) == 1
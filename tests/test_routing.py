@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from functools import partial
+from wban_opt.objective import energy_and_penalty_from_indices
+from wban_opt.energy_model import EnergyParams, calc_E_tx
+from wban_opt.incremental import IncrementalEvaluator, MoveSN, MoveCH, SwapRoles
+from wban_opt.routing import relay_costs, RouteCache
+
+# Mały E_elec i duży E_fs -> przekazywanie przez CH się opłaca (koszt ~ d^2)
+EP_RELAY = EnergyParams(1e-12, 1e-9, 1e-13, 5e-9, 4000, 1.0)
+
+@pytest.fixture
+def make_ctx(make_ctx):
+    """Pula losowa 30 punktów, parametry energii sprzyjające przekazywaniu (EP_RELAY)."""
+    return partial(make_ctx, K=5, pool="random", d_max=0.4, ep=EP_RELAY)
+
+def test_multi_gateway_uses_cheapest_gateway(make_ctx):
+    gws = ((0.0, 0.0), (0.6, 1.8))
+    ctx = make_ctx(gw=gws)
+    ep = ctx.energy_params
+    for j in range(ctx.points_pool.shape[0]):
+        ref = min(calc_E_tx(1, np.linalg.norm(ctx.points_pool[j] - np.array(g)), ep) for g in gws)
+        assert np.isclose(ctx.e_tx_gw[j], ref, rtol=1e-12)
+
+    # Dwie bramki nigdy nie są droższe niż każda z osobna
+    idx = np.random.default_rng(1).permutation(30)[:13]
+    E_both, _ = energy_and_penalty_from_indices(idx[:8], idx[8:], ctx)
+    for g in gws:
+        E_one, _ = energy_and_penalty_from_indices(idx[:8], idx[8:], make_ctx(gw=(g,)))
+        assert E_both <= E_one
+
+def test_relay_costs_match_floyd_warshall(make_ctx):
+    ctx = make_ctx()
+    ch = np.random.default_rng(2).permutation(30)[:6]
+    # Referencja: Floyd-Warshall na grafie CH + węzeł bramki
+    K = len(ch)
+    W = np.full((K + 1, K + 1), np.inf)
+    W[:K, :K] = ctx.e_tx_pool[ch[:, None], ch[None, :]] + ctx.energy_params.E_elec
+    W[:K, K] = ctx.e_tx_gw[ch]
+    np.fill_diagonal(W, 0.0)
+    for m in range(K + 1):
+        W = np.minimum(W, W[:, m:m + 1] + W[m:m + 1, :])
+
+    cost = relay_costs(ch, ctx.e_tx_pool, ctx.e_tx_gw, ctx.energy_params.E_elec)
+    assert np.allclose(cost, W[:K, K], rtol=1e-12)
+    assert np.all(cost <= ctx.e_tx_gw[ch])
+    assert np.any(cost < ctx.e_tx_gw[ch])
+
+def test_route_cache_is_order_invariant(make_ctx):
+    ctx = make_ctx(routing="relay")
+    ch = np.array([[3, 7, 11, 20, 25], [25, 20, 11, 7, 3]])
+    costs = ctx.uplink_costs(ch)
+    assert np.allclose(costs[0], costs[1][::-1])
+    assert ctx.route_cache.misses == 1 and ctx.route_cache.hits == 1
+
+    cache = RouteCache(maxsize=1)
+    fn = lambda c: c.astype(float)
+    cache.costs(np.array([1, 2]), fn)
+    cache.costs(np.array([3, 4]), fn)
+    assert len(cache) == 1
+
+def test_incremental_matches_full_evaluation_with_relay(make_ctx):
+    ctx = make_ctx(gw=((0.0, 0.0), (0.6, 1.8)), routing="relay")
+    rng = np.random.default_rng(3)
+    idx = rng.permutation(30)[:13]
+    state = IncrementalEvaluator(ctx, idx[:8], idx[8:])
+    for _ in range(60):
+        free = state.free_indices()
+        kind = rng.integers(3)
+        if kind == 0:
+            move = MoveSN(rng.integers(8), rng.choice(free))
+        elif kind == 1:
+            move = MoveCH(rng.integers(5), rng.choice(free))
+        else:
+            move = SwapRoles(rng.integers(8), rng.integers(5))
+        state.apply_move(move)
+        E, P = energy_and_penalty_from_indices(state.sn, state.ch, ctx)
+        assert np.isclose(state.fitness, E + P, rtol=1e-9)
+
+def test_relay_energy_charges_each_hop(make_ctx, relay_line_ctx):
+    ctx = make_ctx(routing="relay")
+    ep = ctx.energy_params
+    ch = np.random.default_rng(4).permutation(30)[:6]
+    out = np.arange(1.0, 7.0)
+    E = ctx.uplink_energy(ch, out)
+    # Przeskoki rozliczone na węzły, ale suma jak przy koszcie całej trasy u źródła
+    assert np.isclose(E.sum(), np.sum(out * ctx.uplink_costs(ch)), rtol=1e-12)
+    assert not np.allclose(E, out * ctx.uplink_costs(ch), rtol=1e-6, atol=0)
+    # Kolejność CH nie zmienia rozliczenia
+    perm = np.random.default_rng(5).permutation(6)
+    assert np.allclose(ctx.uplink_energy(ch[perm], out[perm]), E[perm], rtol=1e-12)
+
+    # Łańcuch CH 4 -> CH 5 -> GW: pośrednik odbiera i nadaje także ruch CH 4
+    line = relay_line_ctx(routing="relay")
+    E = line.uplink_energy(np.array([4, 5]), np.array([1.0, 1.0]))
+    assert np.allclose(E, [line.e_tx_pool[4, 5], ep.E_elec + 2 * line.e_tx_gw[5]], rtol=1e-12)
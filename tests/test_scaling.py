@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from wban_opt.scaling import log_grid, scaling_scenarios, run_scaling, scaling_exponents
+from wban_opt.energy_model import EnergyParams
+
+def test_log_grid_and_scenarios():
+    assert log_grid(10, 1000, 3) == (10, 100, 1000)
+    scen = scaling_scenarios((20, 200), (8, 64), (1, 8))
+    assert all(s["N"] + s["K"] <= s["M"] and s["K"] <= s["N"] for s in scen)
+    # N=64 nie mieści się w M=20
+    assert {(s["M"], s["N"]) for s in scen} == {(20, 8), (200, 8), (200, 64)}
+
+def test_exponents_recover_power_law():
+    rng = np.random.default_rng(0)
+    records = [{"algorithm": "ga", "M": M, "N": N, "K": K, "t": 3e-6 * M ** 0.5 * N * K ** 2 * rng.uniform(0.99, 1.01)}
+               for M in (25, 100, 400) for N in (8, 32) for K in (1, 4)]
+    e = scaling_exponents(records, "t")["ga"]
+    assert e["M"] == pytest.approx(0.5, abs=0.02) and e["N"] == pytest.approx(1.0, abs=0.02)
+    assert e["K"] == pytest.approx(2.0, abs=0.02) and e["r2"] > 0.99
+
+def test_run_scaling_fixed_budget():
+    ep = EnergyParams(50e-9, 10e-12, 1.3e-15, 5e-9, 4000, 1.0)
+    records = run_scaling(ep, scaling_scenarios((20, 40), (8,), (1, 2)), max_evals=100, pop_size=10,
+                          seeds=(0, 1), log=lambda *_: None)
+    assert len(records) == 4 * 3 * 2
+    assert all(r["n_evals"] <= 110 and r["s_per_eval"] > 0 for r in records)
+    # Pamięć przebiegu obejmuje budowę kontekstu (tablice (M, M))
+    assert all(r["peak_mem_bytes"] >= r["ctx_mem_bytes"] > 20 * 20 * 8 for r in records)
+    assert all(r["gap"] >= 0 if r["feas"] else np.isnan(r["gap"]) for r in records)
+    assert np.nanmin([r["gap"] for r in records if r["scenario"] == "X_M20_N8_K1"]) == 0.0
+    assert set(scaling_exponents(records, "s_per_eval")) == {"ga", "pso", "ls"}
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from wban_opt.objective import objective_batch
+from wban_opt.mealpy_runner import solve_ga, solve_pso
+from wban_opt.surrogate import KNNSurrogate, SurrogateScreen, evals_to_reach
+
+def test_knn_returns_archived_fitness():
+    points = np.random.default_rng(1).random((20, 2))
+    idx = np.array([np.random.default_rng(s).permutation(20)[:6] for s in range(8)])
+    model = KNNSurrogate(points, N=4, k=3)
+    y = np.arange(1.0, 9.0)
+    model.add(idx, y)
+    assert np.allclose(model.predict(idx), y)
+    # Kolejność CH bez znaczenia
+    assert np.allclose(model.predict(idx[:, [0, 1, 2, 3, 5, 4]]), y)
+
+def test_screen_counts_and_trace():
+    rng = np.random.default_rng(2)
+    points = rng.random((20, 2))
+    true_fn = lambda X: X.sum(axis=1)
+    decode = lambda X: np.argsort(X, axis=1)[:, :5]
+    screen = SurrogateScreen(true_fn, decode, points, N=3, ratio=0.25)
+    for _ in range(4):
+        X = rng.random((8, 20))
+        fits = screen(X)
+        # Przewidziani nigdy nie są lepsi od najlepszego prawdziwego wyniku
+        assert fits.min() >= screen.best and np.any(fits == true_fn(X))
+    assert screen.n_true == 8 + 3 * 2 and screen.n_true + screen.n_skipped == 32
+    assert evals_to_reach(screen.trace, screen.best) <= screen.n_true
+    assert evals_to_reach(screen.trace, -1.0) is None
+    with pytest.raises(ValueError):
+        SurrogateScreen(true_fn, decode, points, N=3, ratio=0.0)
+
+@pytest.mark.parametrize("solver", [solve_ga, solve_pso])
+def test_surrogate_best_is_truly_evaluated(solver, make_ctx):
+    ctx = make_ctx(N=12, K=2, pool="random", d_max=0.4)
+    info = {}
+    x, fitness = solver(ctx, epochs=6, pop_size=10, seed=0, info=info, surrogate={"k": 5, "ratio": 0.5})
+    assert fitness == pytest.approx(objective_batch(x[None, :], ctx, np.random.default_rng(0))[0])
+    assert info["n_true_evals"] + info["n_surrogate_skips"] == info["n_evals"]
+    assert info["surrogate_trace"][-1, 1] == pytest.approx(fitness)
+
+def test_surrogate_rejects_bad_options(make_ctx):
+    ctx = make_ctx(N=12, K=2, pool="random", d_max=0.4)
+    with pytest.raises(ValueError):
+        solve_ga(ctx, epochs=2, pop_size=10, seed=0, surrogate={"kk": 5})
+    with pytest.raises(ValueError):
+        solve_ga(ctx, epochs=2, pop_size=10, seed=0, batch=False, surrogate={})
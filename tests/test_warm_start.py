@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from wban_opt.objective import energy_and_penalty_from_indices
+from wban_opt.mealpy_runner import solve_ga, solve_pso
+from wban_opt.results_store import ResultsStore
+from wban_opt.warm_start import transfer_placement, initial_population, scenario_waves
+
+def test_transfer_placement_keeps_shared_pool_indices():
+    rng = np.random.default_rng(0)
+    sn, ch = np.array([0, 5, 7, 22]), np.array([3, 21])
+    # Ta sama wielkość -> bez zmian
+    assert np.array_equal(transfer_placement(sn, ch, 4, 2, 24, rng), [0, 5, 7, 22, 3, 21])
+    # Większy scenariusz: stare indeksy zostają, reszta dolosowana
+    idx = transfer_placement(sn, ch, 6, 3, 50, rng)
+    assert len(set(idx)) == 9 and idx.max() < 50
+    assert list(idx[:4]) == [0, 5, 7, 22] and list(idx[6:8]) == [3, 21]
+    # Mniejsza pula: punkty spoza niej wypadają
+    idx = transfer_placement(sn, ch, 4, 2, 20, rng)
+    assert idx.max() < 20 and len(set(idx)) == 6 and 3 in idx[4:]
+
+def test_initial_population_dedupes_and_caps():
+    elite = np.array([[0, 1, 2, 3, 4], [0, 1, 2, 3, 4], [5, 6, 7, 8, 9]])
+    X = initial_population([(3, elite)], 3, 2, 10, 5, np.random.default_rng(0))
+    assert X.shape == (2, 5) and np.all((X > 0) & (X < 1))
+    assert len(initial_population([(3, elite)], 3, 2, 10, 1, np.random.default_rng(0))) == 1
+
+def test_scenario_waves():
+    scen = [{"name": "S4", "warm_start_from": ["S3"]}, {"name": "S3"},
+            {"name": "S2b", "warm_start_from": ["S2a", "missing"]}, {"name": "S2a"}]
+    assert scenario_waves(scen) == [["S3", "S2a"], ["S4", "S2b"]]
+    with pytest.raises(ValueError):
+        scenario_waves([{"name": "A", "warm_start_from": ["B"]}, {"name": "B", "warm_start_from": ["A"]}])
+
+@pytest.mark.parametrize("solver", [solve_ga, solve_pso])
+def test_solver_starts_from_initial_population(solver, make_ctx):
+    ctx = make_ctx(K=2)
+    info = {}
+    _, fit_src = solver(ctx, epochs=10, pop_size=10, seed=0, info=info)
+    elite = info["elite"]
+    E, P = energy_and_penalty_from_indices(elite[0, :ctx.N], elite[0, ctx.N:], ctx)
+    assert E + P == pytest.approx(fit_src, rel=1e-12)
+
+    init = initial_population([(ctx.N, elite)], ctx.N, ctx.K, 30, 5, np.random.default_rng(0))
+    info = {}
+    _, fit = solver(ctx, epochs=1, pop_size=10, seed=1, info=info, init=init)
+    assert fit <= fit_src + 1e-15
+
+def test_store_elites_roundtrip(tmp_path):
+    elite = np.array([[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]])
+    rec = {"scenario": "S1", "gw": "GW1", "run": 0, "algorithm": "ga", "N": 3, "K": 2, "M": 10,
+           "fitness_mealpy": 1.0, "elite": elite}
+    with ResultsStore(tmp_path / "runs.sqlite") as store:
+        assert store.read_elites(["S1"], 0) == []
+        store.append(rec)
+        store.append({**rec, "algorithm": "pso", "fitness_mealpy": 0.5, "elite": elite[::-1]})
+        got = store.read_elites(["S1", "S9"], 0)
+        assert store.read_elites(["S1"], 1) == []
+        only_ga = store.read_elites(["S1"], 0, "ga")
+    assert [n for n, _ in got] == [3, 3]
+    assert np.array_equal(got[0][1], elite[::-1]) and np.array_equal(got[1][1], elite)
+    assert len(only_ga) == 1 and np.array_equal(only_ga[0][1], elite)